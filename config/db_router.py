@@ -0,0 +1,49 @@
+"""
+Маршрутизация чтения на реплику PostgreSQL.
+
+Реплика используется только внутри replica_reads(): чтения, для которых
+допустимо отставание репликации (GET-запросы к API). Всё остальное, включая
+чтения внутри изменяющих запросов, идёт на основную базу. replica_reads(False)
+возвращает чтения на основную базу внутри такого блока — например, для
+ответов, которые попадут в кэш.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+REPLICA = "replica"
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if (
+            _replica_reads.get()
+            and settings.DB_REPLICA_READS
+            and REPLICA in connections
+        ):
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплика — копия основной базы, связи между ними допустимы
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA
@@ -0,0 +1,156 @@
+import zlib
+
+import brotli
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+# Сжимаются только ответы API и выгрузки. HTML (админка, browsable API)
+# не сжимается: в нём CSRF-токен соседствует с отражёнными параметрами
+# запроса, и по размеру сжатого ответа его можно подобрать (BREACH)
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+)
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise, который не переводит цепочку middleware в синхронный режим
+    под ASGI: иначе Django выполнял бы асинхронные представления в потоке.
+    Поиск файла — словарь в памяти (или stat при autorefresh), ответ отдаётся
+    FileResponse, поэтому вызов из цикла событий не блокирует его надолго.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
+
+
+def choose_encoding(accept_encoding):
+    """Brotli или gzip по заголовку Accept-Encoding (с учётом q=0)."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip().lower()] = weight
+    for coding in ("br", "gzip"):
+        if weights.get(coding, weights.get("*", 0)) > 0:
+            return coding
+    return None
+
+
+def make_compressor(encoding):
+    """(compress(chunk), finish()) для потокового сжатия."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(
+        settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+    )
+    return compressor.compress, compressor.flush
+
+
+def _compressed(chunks, compress, finish):
+    for chunk in chunks:
+        data = compress(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+async def _acompressed(chunks, compress, finish):
+    async for chunk in chunks:
+        data = compress(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+class CompressionMiddleware:
+    """
+    Сжимает ответы API (COMPRESSIBLE_TYPES) brotli или gzip — что
+    поддерживает клиент.
+    Ответы меньше COMPRESSION_MIN_SIZE байт отдаются как есть: заголовки
+    и время на сжатие не окупаются. Потоковые ответы (выгрузки) сжимаются
+    по мере отдачи. Статику WhiteNoise отдаёт уже сжатой, её не трогаем.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.compress(request, await self.get_response(request))
+
+    @staticmethod
+    def compress(request, response):
+        if response.has_header("Content-Encoding") or not response.get(
+            "Content-Type", ""
+        ).startswith(COMPRESSIBLE_TYPES):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if (
+            not response.streaming
+            and len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+        encoding = choose_encoding(request.headers.get("Accept-Encoding", ""))
+        if encoding is None:
+            return response
+
+        compress, finish = make_compressor(encoding)
+        if response.streaming:
+            wrap = _acompressed if response.is_async else _compressed
+            response.streaming_content = wrap(
+                response.streaming_content, compress, finish
+            )
+            del response["Content-Length"]
+        else:
+            content = compress(response.content) + finish()
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response["Content-Length"] = str(len(content))
+
+        # Сжатый ответ не совпадает побайтно с исходным: ETag становится слабым
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = f"W/{etag}"
+        response["Content-Encoding"] = encoding
+        return response
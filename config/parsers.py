@@ -0,0 +1,25 @@
+import codecs
+import io
+
+import orjson
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSONParser на orjson. Тела не в UTF-8 и те, что orjson не разбирает
+    (ошибки, целые больше 64 бит), разбирает стандартный JSONParser — с
+    теми же результатом и текстом ошибки.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        body = stream.read()
+        if codecs.lookup(encoding).name == "utf-8":
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+        return super().parse(io.BytesIO(body), media_type, parser_context)
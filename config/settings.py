@@ -1,11 +1,12 @@
 from datetime import timedelta
 from pathlib import Path
 
-from decouple import config
+from decouple import Csv, config
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-DEBUG = config("DEBUG", default=True, cast=bool)
+# По умолчанию боевой режим: в DEBUG Django хранит все SQL-запросы в памяти
+DEBUG = config("DEBUG", default=False, cast=bool)
 SECRET_KEY = config("SECRET_KEY", default="unsafe-secret-key")
 ALLOWED_HOSTS = config("ALLOWED_HOSTS", default="127.0.0.1,localhost,app").split(",")
 
@@ -16,17 +17,22 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "django_filters",
     "corsheaders",
     "drf_spectacular",
     "network",  # приложение
     "users",
+    "monitoring",
 ]
 
 MIDDLEWARE = [
+    "monitoring.middleware.RequestInstrumentationMiddleware",
+    "config.middleware.CompressionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "config.middleware.AsyncWhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -63,9 +69,41 @@ DATABASES = {
         "PASSWORD": config("POSTGRES_PASSWORD"),
         "HOST": config("DB_HOST", default="database"),
         "PORT": config("DB_PORT", default="5432"),
+        # Проверка соединения перед повторным использованием в новом запросе
+        "CONN_HEALTH_CHECKS": config("DB_CONN_HEALTH_CHECKS", default=True, cast=bool),
     }
 }
 
+# Пул соединений psycopg 3 (Django 5.1+) или постоянные соединения: пул
+# несовместим с CONN_MAX_AGE, поэтому при DB_POOL=True он равен 0.
+# Каждый воркер gunicorn держит свой пул: всего до WEB_CONCURRENCY × max_size.
+if config("DB_POOL", default=False, cast=bool):
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": config("DB_POOL_MIN_SIZE", default=2, cast=int),
+            "max_size": config("DB_POOL_MAX_SIZE", default=10, cast=int),
+            "timeout": config("DB_POOL_TIMEOUT", default=10, cast=int),
+        }
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = config(
+        "DB_CONN_MAX_AGE", default=60, cast=int
+    )
+
+# Реплика для GET-запросов к API (config.db_router). В тестах — зеркало
+# основной базы.
+DB_REPLICA_HOST = config("DB_REPLICA_HOST", default="")
+if DB_REPLICA_HOST:
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": DB_REPLICA_HOST,
+        "PORT": config("DB_REPLICA_PORT", default=DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+DB_REPLICA_READS = config("DB_REPLICA_READS", default=True, cast=bool)
+DATABASE_ROUTERS = ["config.db_router.ReplicaRouter"]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"
@@ -91,15 +129,94 @@ else:
     STATIC_ROOT = BASE_DIR / "staticfiles"
     MEDIA_ROOT = BASE_DIR / "media"
 
+# Статику отдаёт WhiteNoise из процесса приложения: файлы сжимаются
+# (gzip/brotli) на этапе collectstatic, а не на каждый запрос
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedStaticFilesStorage"},
+}
+
+# Права на модели (админка) — по роли пользователя, см. users.roles
+AUTHENTICATION_BACKENDS = ["users.backends.RoleModelBackend"]
+
 REST_FRAMEWORK = {
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.JWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    # JSON через orjson; вывод совпадает со стандартным JSONRenderer
+    "DEFAULT_RENDERER_CLASSES": [
+        "config.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "config.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+
+# Кэш: Redis из docker-compose, если задан REDIS_URL, иначе память процесса.
+# Память процесса у каждого воркера gunicorn своя: сброс версии в одном
+# воркере не виден остальным, и они отдавали бы устаревшие ответы. Поэтому
+# без Redis кэш ответов по умолчанию выключен.
+REDIS_URL = config("REDIS_URL", default="")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+# Время жизни закэшированных ответов API в секундах (0 — кэш отключён)
+API_CACHE_TIMEOUT = config(
+    "API_CACHE_TIMEOUT", default=300 if REDIS_URL else 0, cast=int
+)
+
+# Пагинация списков API
+API_PAGE_SIZE = config("API_PAGE_SIZE", default=50, cast=int)
+API_MAX_PAGE_SIZE = config("API_MAX_PAGE_SIZE", default=500, cast=int)
+
+# Поиск: сколько совпадений ранжировать и сколько результатов отдавать
+SEARCH_MAX_CANDIDATES = config("SEARCH_MAX_CANDIDATES", default=500, cast=int)
+SEARCH_MAX_RESULTS = config("SEARCH_MAX_RESULTS", default=100, cast=int)
+
+# Размер пакета строк серверного курсора при потоковой выгрузке
+EXPORT_CHUNK_SIZE = config("EXPORT_CHUNK_SIZE", default=2000, cast=int)
+
+# Максимальный размер пакета для /api/network/network/bulk/
+BULK_UPSERT_MAX_ITEMS = config("BULK_UPSERT_MAX_ITEMS", default=5000, cast=int)
+
+# Сжатие ответов (brotli или gzip): минимальный размер в байтах и уровни
+COMPRESSION_MIN_SIZE = config("COMPRESSION_MIN_SIZE", default=1024, cast=int)
+COMPRESSION_BROTLI_QUALITY = config("COMPRESSION_BROTLI_QUALITY", default=4, cast=int)
+COMPRESSION_GZIP_LEVEL = config("COMPRESSION_GZIP_LEVEL", default=6, cast=int)
+
+# Замеры запросов: заголовок Server-Timing и журнал медленных запросов
+# Server-Timing раскрывает время БД и число SQL-запросов — по умолчанию
+# только при DEBUG
+SERVER_TIMING_HEADER = config("SERVER_TIMING_HEADER", default=DEBUG, cast=bool)
+SLOW_REQUEST_MS = config("SLOW_REQUEST_MS", default=500, cast=int)
+SLOW_REQUEST_QUERIES = config("SLOW_REQUEST_QUERIES", default=30, cast=int)
+
+# Токен для /metrics (Authorization: Bearer <токен>). Без токена метрики
+# отдаются только при DEBUG или на запросы с адресов из INTERNAL_IPS
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+INTERNAL_IPS = config("INTERNAL_IPS", default="", cast=Csv())
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "monitoring": {"handlers": ["console"], "level": "INFO"},
+    },
 }
 
 SIMPLE_JWT = {
@@ -111,6 +228,19 @@ SIMPLE_JWT = {
     ),
 }
 
+# Кэш пользователя JWT-аутентификации, секунды: общий (Redis) и в памяти
+# процесса. Изменения пользователя в других процессах видны не позже
+# AUTH_USER_LOCAL_CACHE_TIMEOUT — только если кэш общий. Без Redis кэш
+# (память процесса) у каждого воркера свой, сброс в одном воркере не виден
+# остальным, поэтому по умолчанию кэш выключен. 0 — пользователь читается
+# из БД на каждый запрос.
+AUTH_USER_CACHE_TIMEOUT = config(
+    "AUTH_USER_CACHE_TIMEOUT", default=300 if REDIS_URL else 0, cast=int
+)
+AUTH_USER_LOCAL_CACHE_TIMEOUT = config(
+    "AUTH_USER_LOCAL_CACHE_TIMEOUT", default=5, cast=int
+)
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Electronics Network API",
     "DESCRIPTION": "API для управления торговой сетью электроники.",
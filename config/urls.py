@@ -1,9 +1,13 @@
 from django.contrib import admin
 from django.urls import include, path
-from drf_spectacular.views import (SpectacularAPIView, SpectacularRedocView,
-                                   SpectacularSwaggerView)
-from rest_framework_simplejwt.views import (TokenObtainPairView,
-                                            TokenRefreshView)
+from drf_spectacular.views import (
+    SpectacularAPIView,
+    SpectacularRedocView,
+    SpectacularSwaggerView,
+)
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+
+from monitoring.views import metrics
 
 urlpatterns = [
     path("admin/", admin.site.urls),  # Админка
@@ -29,4 +33,5 @@ urlpatterns = [
     ),  # Альтернативная документация
     path("api/network/", include("network.urls")),  # Эндпоинты приложения network
     path("api/", include("users.urls")),
+    path("metrics", metrics, name="metrics"),  # Метрики Prometheus
 ]
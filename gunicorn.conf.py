@@ -0,0 +1,54 @@
+"""
+Боевой профиль gunicorn. Файл подхватывается автоматически при запуске
+`gunicorn config.wsgi` из корня проекта; параметры задаются через .env.
+"""
+
+import multiprocessing
+import os
+import shutil
+
+import decouple
+
+bind = decouple.config("GUNICORN_BIND", default="0.0.0.0:8000")
+
+# sync/gthread — WSGI (config.wsgi), uvicorn_worker.UvicornWorker — ASGI
+# (config.asgi). Число воркеров по умолчанию — 2 × CPU + 1.
+worker_class = decouple.config("GUNICORN_WORKER_CLASS", default="gthread")
+workers = decouple.config(
+    "WEB_CONCURRENCY", default=multiprocessing.cpu_count() * 2 + 1, cast=int
+)
+threads = decouple.config("GUNICORN_THREADS", default=2, cast=int)
+
+# Приложение импортируется один раз в мастере, воркеры получают его через
+# fork: быстрый старт и общие страницы памяти.
+preload_app = decouple.config("GUNICORN_PRELOAD", default=True, cast=bool)
+
+# Балансировщик держит соединения открытыми; keepalive должен быть больше
+# его idle timeout, иначе соединения рвутся на стороне приложения.
+keepalive = decouple.config("GUNICORN_KEEPALIVE", default=75, cast=int)
+timeout = decouple.config("GUNICORN_TIMEOUT", default=60, cast=int)
+graceful_timeout = decouple.config("GUNICORN_GRACEFUL_TIMEOUT", default=30, cast=int)
+
+# Периодический перезапуск воркеров ограничивает рост памяти
+max_requests = decouple.config("GUNICORN_MAX_REQUESTS", default=10000, cast=int)
+max_requests_jitter = decouple.config(
+    "GUNICORN_MAX_REQUESTS_JITTER", default=1000, cast=int
+)
+
+accesslog = decouple.config("GUNICORN_ACCESS_LOG", default="-") or None
+errorlog = "-"
+
+
+def on_starting(server):
+    """Метрики прошлых запусков не должны попасть в сумму /metrics."""
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
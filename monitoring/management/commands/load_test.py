@@ -0,0 +1,152 @@
+import http.client
+import json
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = [
+    "/api/network/network/",
+    "/api/network/product/",
+    "/static/admin/css/base.css",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Нагрузочный тест запущенного сервера: заданное число параллельных "
+        "клиентов с keep-alive соединениями в течение --duration секунд. "
+        "Выводит RPS, p50/p95/p99 задержки и число ошибок. С --slow-clients "
+        "параллельно работают медленные клиенты, передающие каждый запрос "
+        "--slow-seconds секунд: замер показывает, сколько обычных запросов "
+        "сервер успевает обслужить, пока соединения заняты медленными."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000")
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="Путь запроса (можно несколько раз); по умолчанию списки API и статика",
+        )
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument("--duration", type=float, default=10)
+        parser.add_argument("--slow-clients", type=int, default=0)
+        parser.add_argument("--slow-seconds", type=float, default=2)
+        parser.add_argument("--username", help="Пользователь для получения JWT")
+        parser.add_argument("--password")
+
+    def handle(self, *args, **options):
+        url = urlsplit(options["url"])
+        if url.scheme != "http":
+            raise CommandError("Поддерживается только http://")
+        self.host, self.port = url.hostname, url.port or 80
+        paths = options["paths"] or DEFAULT_PATHS
+
+        headers = {}
+        if options["username"]:
+            headers["Authorization"] = f"Bearer {self._token(options)}"
+
+        deadline = time.perf_counter() + options["duration"]
+        lock = threading.Lock()
+        timings, errors = [], []
+
+        def client(number):
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+            local_timings, local_errors = [], []
+            request_number = number
+            while time.perf_counter() < deadline:
+                path = paths[request_number % len(paths)]
+                request_number += 1
+                started = time.perf_counter()
+                try:
+                    connection.request("GET", path, headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                except (OSError, http.client.HTTPException) as error:
+                    local_errors.append(type(error).__name__)
+                    connection.close()
+                    continue
+                local_timings.append((time.perf_counter() - started) * 1000)
+                if response.status >= 400:
+                    local_errors.append(str(response.status))
+            connection.close()
+            with lock:
+                timings.extend(local_timings)
+                errors.extend(local_errors)
+
+        def slow_client(number):
+            path = paths[number % len(paths)]
+            while time.perf_counter() < deadline:
+                self._slow_request(path, headers, options["slow_seconds"])
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(
+            options["concurrency"] + options["slow_clients"]
+        ) as pool:
+            slow = [
+                pool.submit(slow_client, number)
+                for number in range(options["slow_clients"])
+            ]
+            list(pool.map(client, range(options["concurrency"])))
+            for future in slow:
+                future.result()
+        elapsed = time.perf_counter() - started
+
+        if not timings:
+            raise CommandError(f"Ни один запрос не выполнен: {errors[:5]}")
+        timings.sort()
+        self.stdout.write(
+            f"Запросов: {len(timings)}, ошибок: {len(errors)}, "
+            f"RPS: {len(timings) / elapsed:.1f}"
+        )
+        self.stdout.write(
+            "Задержка, мс: "
+            + ", ".join(
+                f"p{q}={timings[min(len(timings) - 1, int(len(timings) * q / 100))]:.1f}"
+                for q in (50, 95, 99)
+            )
+        )
+        if errors:
+            self.stdout.write(self.style.WARNING(f"Первые ошибки: {errors[:5]}"))
+
+    def _slow_request(self, path, headers, seconds):
+        """Запрос, заголовки которого приходят по одному за seconds секунд."""
+        lines = [f"GET {path} HTTP/1.1", f"Host: {self.host}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        lines += [f"X-Slow-{number}: 1" for number in range(10)]
+        try:
+            with socket.create_connection((self.host, self.port), timeout=30) as sock:
+                for line in lines:
+                    sock.sendall(f"{line}\r\n".encode())
+                    time.sleep(seconds / len(lines))
+                sock.sendall(b"Connection: close\r\n\r\n")
+                while sock.recv(65536):
+                    pass
+        except OSError:
+            time.sleep(seconds)
+
+    def _token(self, options):
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        try:
+            connection.request(
+                "POST",
+                "/api/token/",
+                body=json.dumps(
+                    {"username": options["username"], "password": options["password"]}
+                ),
+                headers={"Content-Type": "application/json"},
+            )
+            response = connection.getresponse()
+            body = response.read()
+        except OSError as error:
+            raise CommandError(f"Сервер недоступен: {error}")
+        finally:
+            connection.close()
+        if response.status != 200:
+            raise CommandError(f"Не удалось получить токен: {response.status} {body!r}")
+        return json.loads(body)["access"]
@@ -0,0 +1,79 @@
+import os
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import REGISTRY, GaugeMetricFamily
+
+from network.models import NetworkElement
+
+# Гистограммы пишутся в память процесса; при заданной переменной
+# PROMETHEUS_MULTIPROC_DIR prometheus_client кладёт значения в mmap-файлы
+# каталога, и /metrics любого воркера gunicorn отдаёт сумму по всем воркерам.
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Время обработки запроса",
+    ["view", "action", "method", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Число SQL-запросов на один HTTP-запрос",
+    ["view", "action"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100, 200),
+)
+RESPONSE_CACHE = Counter(
+    "api_response_cache_requests",
+    "Обращения к кэшу ответов API (hit/miss)",
+    ["basename", "result"],
+)
+JWT_AUTH_LATENCY = Histogram(
+    "jwt_authentication_duration_seconds",
+    "Время JWT-аутентификации запроса",
+    ["result"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+
+
+class NetworkLevelCollector:
+    """Число элементов сети по уровням — один GROUP BY на каждый сбор метрик."""
+
+    def collect(self):
+        metric = GaugeMetricFamily(
+            "network_elements", "Число элементов сети по уровням", labels=["level"]
+        )
+        counts = {
+            row["level"]: row["elements"]
+            for row in NetworkElement.objects.debt_totals("level")
+        }
+        for level, _ in NetworkElement.LEVELS:
+            metric.add_metric([str(level)], counts.get(level, 0))
+        yield metric
+
+
+def view_labels(request):
+    """Имя viewset/представления и действие DRF для подписи метрик."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched", ""
+    view_class = getattr(match.func, "cls", None)
+    if view_class is None:
+        return match.view_name or match.func.__name__, ""
+    actions = getattr(match.func, "actions", None) or {}
+    method = request.method.lower()
+    return view_class.__name__, actions.get(method, method)
+
+
+def render_latest():
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    levels = CollectorRegistry()
+    levels.register(NetworkLevelCollector())
+    return generate_latest(registry) + generate_latest(levels)
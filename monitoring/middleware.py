@@ -0,0 +1,138 @@
+import logging
+import re
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from .metrics import REQUEST_LATENCY, REQUEST_QUERIES, view_labels
+
+logger = logging.getLogger("monitoring.slow_requests")
+
+# Списки параметров IN (%s, %s, ...) разной длины — один и тот же запрос
+IN_PLACEHOLDERS = re.compile(r"IN \((?:%s, )*%s\)")
+
+
+def fingerprint(sql):
+    return IN_PLACEHOLDERS.sub("IN (...)", sql)
+
+
+class QueryRecorder:
+    """execute_wrapper: время и отпечаток каждого SQL-запроса."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.by_fingerprint = defaultdict(lambda: [0, 0.0])
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            stats = self.by_fingerprint[fingerprint(sql)]
+            stats[0] += 1
+            stats[1] += elapsed
+
+    def duplicates(self):
+        return Counter(
+            {sql: count for sql, (count, _) in self.by_fingerprint.items() if count > 1}
+        )
+
+    def top(self, limit):
+        return sorted(
+            self.by_fingerprint.items(), key=lambda item: item[1][1], reverse=True
+        )[:limit]
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Меряет на каждый запрос общее время, время в БД, число запросов и
+    повторяющиеся запросы (N+1). Отдаёт их в заголовке Server-Timing и
+    метриках /metrics и пишет в лог запросы, превысившие SLOW_REQUEST_MS
+    или SLOW_REQUEST_QUERIES, вместе с самыми дорогими SQL.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with self.recording(recorder):
+            response = self.get_response(request)
+        return self.process(request, response, recorder, started)
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        # Соединения с БД локальны для потока, а async ORM выполняет запросы
+        # в потоке sync_to_async запроса: обёртку ставим и снимаем там же.
+        recording = await sync_to_async(self.recording)(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(recording.close)()
+        return self.process(request, response, recorder, started)
+
+    @staticmethod
+    def recording(recorder):
+        # Обёртка ставится и на ещё не открытые соединения потока: первый
+        # запрос нового потока тоже должен попасть в замер.
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        return stack
+
+    def process(self, request, response, recorder, started):
+        total_ms = (time.perf_counter() - started) * 1000
+        db_ms = recorder.duration * 1000
+        duplicates = recorder.duplicates()
+
+        view, action = view_labels(request)
+        REQUEST_LATENCY.labels(
+            view, action, request.method, f"{response.status_code // 100}xx"
+        ).observe(total_ms / 1000)
+        REQUEST_QUERIES.labels(view, action).observe(recorder.count)
+
+        if settings.SERVER_TIMING_HEADER:
+            response["Server-Timing"] = (
+                f"total;dur={total_ms:.1f}, "
+                f'db;dur={db_ms:.1f};desc="{recorder.count} queries", '
+                f'dup;desc="{sum(duplicates.values())} duplicated"'
+            )
+
+        if (
+            total_ms >= settings.SLOW_REQUEST_MS
+            or recorder.count >= settings.SLOW_REQUEST_QUERIES
+        ):
+            top = "\n".join(
+                f"  {duration * 1000:8.1f} мс  x{count:<4} {sql}"
+                for sql, (count, duration) in recorder.top(5)
+            )
+            logger.warning(
+                "Медленный запрос %s %s -> %s: %.1f мс, БД %.1f мс, "
+                "SQL-запросов %s, повторов %s\n%s",
+                request.method,
+                request.get_full_path(),
+                response.status_code,
+                total_ms,
+                db_ms,
+                recorder.count,
+                sum(duplicates.values()),
+                top,
+            )
+        return response
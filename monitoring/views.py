@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from .metrics import render_latest
+
+
+def metrics(request):
+    """
+    Метрики в текстовом формате Prometheus. Доступ — по METRICS_TOKEN, а
+    если он не задан — только при DEBUG или с адресов INTERNAL_IPS.
+    """
+    token = settings.METRICS_TOKEN
+    if token:
+        if not constant_time_compare(
+            request.headers.get("Authorization", ""), f"Bearer {token}"
+        ):
+            return HttpResponse(status=401)
+    elif not (
+        settings.DEBUG or request.META.get("REMOTE_ADDR") in settings.INTERNAL_IPS
+    ):
+        return HttpResponse(status=403)
+    return HttpResponse(render_latest(), content_type=CONTENT_TYPE_LATEST)
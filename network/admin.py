@@ -1,12 +1,37 @@
+from functools import partial
+
 from django.contrib import admin
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.utils.html import format_html
 
+from .cache import invalidate_network_elements
 from .models import NetworkElement, Product
 
 
+class RankedSearchAdminMixin:
+    """
+    Поиск в списке: к совпадениям подстроки по search_fields добавляются
+    полнотекстовые и нечёткие совпадения (QuerySet.matching), так что
+    находятся и словоформы, и записи с опечаткой в запросе.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        found, may_have_duplicates = super().get_search_results(
+            request, queryset, search_term
+        )
+        search_term = search_term.strip()
+        if not search_term:
+            return found, may_have_duplicates
+        matches = self.model.objects.matching(search_term).values("pk")
+        return (
+            queryset.filter(pk__in=found.values("pk").union(matches)),
+            may_have_duplicates,
+        )
+
+
 @admin.register(NetworkElement)
-class NetworkElementAdmin(admin.ModelAdmin):
+class NetworkElementAdmin(RankedSearchAdminMixin, admin.ModelAdmin):
     list_display = ("name", "level", "city", "country", "debt", "supplier_link")
     search_fields = ("name", "city", "country", "email", "phone")
     list_filter = ("city", "country", "level")
@@ -46,7 +71,9 @@ class NetworkElementAdmin(admin.ModelAdmin):
         """
         Admin action для обнуления задолженности.
         """
-        queryset.update(debt=0.0)
+        queryset.bump_version(debt=0.0)
+        ids = list(queryset.values_list("id", flat=True))
+        transaction.on_commit(partial(invalidate_network_elements, ids))
         self.message_user(
             request, f"Задолженность успешно обнулена у {queryset.count()} объектов."
         )
@@ -76,7 +103,7 @@ class NetworkElementAdmin(admin.ModelAdmin):
 
 
 @admin.register(Product)
-class ProductAdmin(admin.ModelAdmin):
+class ProductAdmin(RankedSearchAdminMixin, admin.ModelAdmin):
     list_display = (
         "name",
         "model",
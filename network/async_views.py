@@ -0,0 +1,106 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+
+from users.authentication import JWTAuthentication
+
+from .views import NetworkElementViewSet, ProductViewSet
+
+
+class AsyncReadOnlyView(View):
+    """
+    Асинхронные list/retrieve поверх настроек viewset-а: тот же queryset,
+    фильтры, разрешения, сериализатор и курсорная пагинация, но запросы
+    выполняются через async ORM (aiterator, aget), и под ASGI воркер не
+    держит поток на каждый медленный запрос.
+
+    Кэш ответов и ETag остаются у синхронных viewset-ов.
+    """
+
+    viewset_class = None
+    http_method_names = ["get", "head", "options"]
+    authentication = JWTAuthentication()
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+
+    async def get(self, request, pk=None):
+        drf_request = Request(request, authenticators=[])
+        view = self.viewset_class(
+            request=drf_request,
+            args=(),
+            kwargs={} if pk is None else {"pk": pk},
+            action="list" if pk is None else "retrieve",
+            format_kwarg=None,
+        )
+        try:
+            user_auth = await self.authentication.aauthenticate(request)
+            drf_request.user = AnonymousUser() if user_auth is None else user_auth[0]
+            self.check_permissions(view, drf_request)
+            queryset = view.filter_queryset(view.get_queryset())
+            if pk is None:
+                data = await self.alist(view, queryset)
+            else:
+                data = await self.aretrieve(view, queryset, pk)
+        except exceptions.APIException as exc:
+            return self.error_response(exc, view, request)
+        return HttpResponse(self.renderer.render(data), content_type="application/json")
+
+    async def alist(self, view, queryset):
+        page = await view.paginator.apaginate_queryset(queryset, view.request, view)
+        data = await self.serialize(view, page, many=True)
+        return view.paginator.get_paginated_response(data).data
+
+    async def aretrieve(self, view, queryset, pk):
+        try:
+            instance = await queryset.aget(pk=pk)
+        except (ObjectDoesNotExist, ValueError):
+            raise exceptions.NotFound()
+        view.check_object_permissions(view.request, instance)
+        return await self.serialize(view, instance)
+
+    @staticmethod
+    async def serialize(view, instance, many=False):
+        # Сериализатор может догружать связанные строки (продукты элементов
+        # сети) синхронным запросом — выполняем его в потоке запроса
+        return await sync_to_async(
+            lambda: view.get_serializer(instance, many=many).data
+        )()
+
+    @staticmethod
+    def check_permissions(view, request):
+        for permission in view.get_permissions():
+            if not permission.has_permission(request, view):
+                if not request.user.is_authenticated:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(
+                    getattr(permission, "message", None),
+                    getattr(permission, "code", None),
+                )
+
+    def error_response(self, exc, view, request):
+        response = exception_handler(exc, {"view": view, "request": view.request})
+        result = HttpResponse(
+            self.renderer.render(response.data),
+            status=response.status_code,
+            content_type="application/json",
+        )
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            result["WWW-Authenticate"] = self.authentication.authenticate_header(
+                request
+            )
+        return result
+
+
+class NetworkElementAsyncView(AsyncReadOnlyView):
+    viewset_class = NetworkElementViewSet
+
+
+class ProductAsyncView(AsyncReadOnlyView):
+    viewset_class = ProductViewSet
@@ -0,0 +1,131 @@
+import hashlib
+import time
+import uuid
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from config.db_router import replica_reads
+from monitoring.metrics import RESPONSE_CACHE
+
+from .models import NetworkElement
+
+# Ключи версий: при изменении данных версия меняется, и все ответы,
+# построенные на старой версии, перестают находиться в кэше.
+NETWORK_LIST_KEY = "api:version:network:list"
+PRODUCT_LIST_KEY = "api:version:product:list"
+
+
+def network_element_key(pk):
+    return f"api:version:network:{pk}"
+
+
+def product_key(pk):
+    return f"api:version:product:{pk}"
+
+
+def _new_version():
+    # Время смены версии нужно для Last-Modified списка: удаление не
+    # оставляет строки, по updated_at которой его можно заметить
+    return f"{time.time():.6f}-{uuid.uuid4().hex}"
+
+
+def version_time(version):
+    """Момент смены версии; для версии без времени — текущий момент."""
+    try:
+        timestamp = float(version.partition("-")[0])
+    except ValueError:
+        timestamp = time.time()
+    return datetime.fromtimestamp(timestamp, timezone.utc)
+
+
+def get_versions(keys):
+    versions = cache.get_many(keys)
+    missing = {key: _new_version() for key in keys if key not in versions}
+    if missing:
+        # Потерянную версию нельзя считать нулевой: под ней мог остаться
+        # устаревший ответ, поэтому выдаём новую.
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def _bump(keys):
+    if keys:
+        cache.set_many({key: _new_version() for key in keys}, timeout=None)
+
+
+def invalidate_network_elements(ids, client_ids=None):
+    """
+    Сбрасывает кэш элементов сети и их клиентов: в ответе клиента
+    вложено представление поставщика (`поставщик`).
+    """
+    ids = set(ids)
+    if client_ids is None:
+        client_ids = NetworkElement.objects.filter(supplier_id__in=ids).values_list(
+            "id", flat=True
+        )
+    ids.update(client_ids)
+    _bump([NETWORK_LIST_KEY, *map(network_element_key, ids)])
+
+
+def invalidate_products(ids, network_element_ids):
+    """Сбрасывает кэш продуктов и элементов сети, в которые они вложены."""
+    _bump(
+        [
+            PRODUCT_LIST_KEY,
+            NETWORK_LIST_KEY,
+            *map(product_key, set(ids)),
+            *map(network_element_key, set(network_element_ids)),
+        ]
+    )
+
+
+class CachedResponseMixin:
+    """
+    Кэширует ответы list/retrieve по пути с параметрами запроса и роли
+    пользователя. Инвалидация — через версии в network.signals.
+    """
+
+    list_version_keys = ()
+    object_version_key = None
+
+    def list(self, request, *args, **kwargs):
+        return self._cached_response(
+            request,
+            self.list_version_keys,
+            lambda: super(CachedResponseMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        version_keys = [self.object_version_key(self.kwargs[self.lookup_field])]
+        return self._cached_response(
+            request,
+            version_keys,
+            lambda: super(CachedResponseMixin, self).retrieve(request, *args, **kwargs),
+        )
+
+    def _cached_response(self, request, version_keys, get_response):
+        if not settings.API_CACHE_TIMEOUT:
+            return get_response()
+
+        versions = ":".join(get_versions(list(version_keys)))
+        path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        role = getattr(request.user, "role", "")
+        key = f"api:response:{self.basename}:{self.action}:{role}:{versions}:{path}"
+
+        data = cache.get(key)
+        if data is not None:
+            RESPONSE_CACHE.labels(self.basename, "hit").inc()
+            return Response(data)
+        RESPONSE_CACHE.labels(self.basename, "miss").inc()
+        # Ответ попадёт в кэш под текущей версией — строим его по основной
+        # базе: с отстающей реплики в кэш попало бы состояние до изменения
+        with replica_reads(False):
+            response = get_response()
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.API_CACHE_TIMEOUT)
+        return response
@@ -0,0 +1,101 @@
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import get_versions, version_time
+
+
+class ConditionalGetMixin:
+    """
+    ETag и Last-Modified для list/retrieve по счётчику версий элементов.
+    Если клиент прислал совпадающий If-None-Match (или If-Modified-Since
+    не старше изменения), отвечаем 304 без запуска сериализатора.
+
+    Список дополнительно зависит от версий list_version_keys (см.
+    CachedResponseMixin): они меняются и при удалении, которое по
+    оставшимся строкам не заметно.
+    """
+
+    list_version_keys = ()
+
+    def retrieve(self, request, *args, **kwargs):
+        # Те же фильтры, что у ответа: отфильтрованный объект даёт 404, а не 304
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        try:
+            state = (
+                queryset.filter(pk=self.kwargs[self.lookup_field])
+                .values("id", "version", "updated_at")
+                .first()
+            )
+        except (TypeError, ValueError, ValidationError):
+            state = None
+        if state is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        etag = self._make_etag(request, f"{state['id']}-{state['version']}")
+        return self._conditional_response(
+            request,
+            etag,
+            state["updated_at"],
+            lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs),
+        )
+
+    def list(self, request, *args, **kwargs):
+        # Состояние текущей страницы: те же фильтры и курсор, но только
+        # id и версии — индексный запрос без продуктов и поставщиков.
+        queryset = (
+            self.filter_queryset(self.get_queryset())
+            .prefetch_related(None)
+            .values("id", "version", "updated_at", "created_at")
+        )
+        rows = self.pagination_class().paginate_queryset(queryset, request, view=self)
+        versions = get_versions(list(self.list_version_keys))
+        fingerprint = ",".join(
+            [*versions, *(f"{row['id']}-{row['version']}" for row in rows)]
+        )
+        last_modified = max(
+            [*map(version_time, versions), *(row["updated_at"] for row in rows)],
+            default=None,
+        )
+        return self._conditional_response(
+            request,
+            self._make_etag(request, fingerprint),
+            last_modified,
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
+
+    @staticmethod
+    def _make_etag(request, fingerprint):
+        content = f"{request.get_full_path()}|{request.accepted_renderer.format}|{fingerprint}"
+        return f'"{hashlib.sha1(content.encode()).hexdigest()}"'
+
+    def _conditional_response(self, request, etag, last_modified, get_response):
+        if self._not_modified(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = get_response()
+            if response.status_code != status.HTTP_200_OK:
+                return response
+        response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        return response
+
+    @staticmethod
+    def _not_modified(request, etag, last_modified):
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            # Слабое сравнение: сжатый ответ отдаёт ETag с префиксом W/
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+        if_modified_since = parse_http_date_safe(
+            request.headers.get("If-Modified-Since", "")
+        )
+        return bool(
+            last_modified
+            and if_modified_since
+            and int(last_modified.timestamp()) <= if_modified_since
+        )
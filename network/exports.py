@@ -0,0 +1,109 @@
+import csv
+import datetime
+import decimal
+import json
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+# Колонки выгрузки: (ключ в выгрузке, поле модели)
+NETWORK_ELEMENT_EXPORT_FIELDS = (
+    ("id", "id"),
+    ("уровень_сети", "level"),
+    ("название", "name"),
+    ("электронная_почта", "email"),
+    ("телефон", "phone"),
+    ("страна", "country"),
+    ("регион", "region"),
+    ("город", "city"),
+    ("улица", "street"),
+    ("номер_дома", "house_number"),
+    ("почтовый_индекс", "postal_code"),
+    ("задолженность", "debt"),
+    ("создано", "created_at"),
+    ("поставщик", "supplier_id"),
+)
+
+PRODUCT_EXPORT_FIELDS = (
+    ("id", "id"),
+    ("название", "name"),
+    ("модель", "model"),
+    ("дата_выхода", "release_date"),
+    ("цена", "price"),
+    ("страна_производителя", "manufacturer_country"),
+    ("звено_сети", "network_element_id"),
+)
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def to_primitive(value):
+    """
+    Приводит значение из БД к виду, в котором его отдаёт API.
+    """
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, datetime.datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        value = value.isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return value
+
+
+class _Echo:
+    """Псевдо-файл для csv.writer: возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def _iter_rows(queryset, fields):
+    columns = [column for _, column in fields]
+    return queryset.order_by().values_list(*columns).iterator(
+        chunk_size=settings.EXPORT_CHUNK_SIZE
+    )
+
+
+def iter_ndjson(queryset, fields):
+    keys = [key for key, _ in fields]
+    for row in _iter_rows(queryset, fields):
+        record = dict(zip(keys, map(to_primitive, row)))
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def iter_csv(queryset, fields):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([key for key, _ in fields])
+    for row in _iter_rows(queryset, fields):
+        yield writer.writerow([to_primitive(value) for value in row])
+
+
+def export_response(request, queryset, fields, filename):
+    """
+    Потоковая выгрузка queryset в NDJSON или CSV через серверный курсор:
+    память не зависит от числа строк, первые байты уходят сразу.
+    """
+    export_format = request.query_params.get("export_format", "ndjson")
+    if export_format not in EXPORT_FORMATS:
+        return Response(
+            {"export_format": f"Допустимые форматы: {', '.join(EXPORT_FORMATS)}."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    rows = iter_csv if export_format == "csv" else iter_ndjson
+    response = StreamingHttpResponse(
+        rows(queryset, fields), content_type=EXPORT_FORMATS[export_format]
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{filename}.{export_format}"'
+    )
+    return response
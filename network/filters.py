@@ -0,0 +1,52 @@
+from django.db.models import Exists, OuterRef
+from django_filters import rest_framework as filters
+
+from .models import NetworkElement, Product
+
+
+class NetworkElementFilter(filters.FilterSet):
+    """
+    Фильтры списка элементов сети. У каждого фильтра есть индекс (см.
+    NetworkElement.Meta.indexes), планы проверяются в тестах.
+
+    Поставщик фильтруется по id без ModelChoiceFilter: проверка параметра
+    не обращается к БД, поэтому набор фильтров работает и в асинхронных
+    представлениях.
+    """
+
+    supplier = filters.NumberFilter(field_name="supplier_id", label="id поставщика")
+    has_products = filters.BooleanFilter(
+        method="filter_has_products", label="Есть продукты"
+    )
+
+    class Meta:
+        model = NetworkElement
+        fields = {
+            "country": ["exact"],
+            "region": ["exact"],
+            "city": ["exact"],
+            "level": ["exact", "in"],
+            "debt": ["gte", "lte"],
+            "created_at": ["gte", "lt"],
+        }
+
+    def filter_has_products(self, queryset, name, value):
+        # Полусоединение по индексу внешнего ключа продуктов
+        products = Exists(Product.objects.filter(network_element_id=OuterRef("pk")))
+        return queryset.filter(products if value else ~products)
+
+
+class ProductFilter(filters.FilterSet):
+    """Фильтры списка продуктов; у каждого есть индекс (Product.Meta.indexes)."""
+
+    network_element = filters.NumberFilter(
+        field_name="network_element_id", label="id элемента сети"
+    )
+
+    class Meta:
+        model = Product
+        fields = {
+            "manufacturer_country": ["exact"],
+            "price": ["gte", "lte"],
+            "release_date": ["gte", "lte"],
+        }
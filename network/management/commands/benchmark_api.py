@@ -0,0 +1,271 @@
+import io
+import itertools
+import json
+import statistics
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from network.models import NetworkElement, Product
+
+DEFAULT_BASELINE = settings.BASE_DIR / "benchmarks" / "api_baseline.json"
+PASSWORD = "benchmark-password"
+
+# Абсолютный запас сверх относительного допуска: у быстрых эндпоинтов
+# доли миллисекунды и пара аллокаций уже дают десятки процентов шума
+LATENCY_SLACK_MS = 5
+MEMORY_SLACK_KB = 32
+MEMORY_SAMPLES = 3
+
+
+def network_payload(number, supplier_id):
+    return {
+        "название": f"Бенчмарк-сеть {number}",
+        "электронная_почта": f"benchmark{number}@example.com",
+        "телефон": f"+8{number:010d}",
+        "страна": "Россия",
+        "регион": "Москва",
+        "город": "Москва",
+        "улица": "Ленина",
+        "номер_дома": "1",
+        "почтовый_индекс": "101000",
+        "уровень_сети": 1,
+        "поставщик": supplier_id,
+    }
+
+
+def product_payload(number, network_element_id):
+    return {
+        "название": "Бенчмарк-продукт",
+        "модель": f"B-{number}",
+        "дата_выхода": "2024-01-01",
+        "цена": "1000.00",
+        "страна_производителя": "Россия",
+        "звено_сети": network_element_id,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Бенчмарк API и админки: p50/p95 задержки, число SQL-запросов и "
+        "выделенная память на вызов. Сравнивает с сохранённым эталоном и "
+        "завершается ошибкой при росте числа запросов или выходе задержки и "
+        "памяти за допуск. Все изменения откатываются."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=30)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Сохранить результаты как новый эталон вместо сравнения",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.5,
+            help=(
+                "Допустимый рост задержки и памяти относительно эталона (доля), "
+                f"плюс {LATENCY_SLACK_MS} мс и {MEMORY_SLACK_KB} КБ"
+            ),
+        )
+        parser.add_argument(
+            "--use-existing-data",
+            action="store_true",
+            help="Не генерировать данные, мерить на текущей БД",
+        )
+
+    def handle(self, *args, **options):
+        # Кэш ответов отключён: записи откатываются, а кэш — нет. Чтения с
+        # реплики тоже: данные бенчмарка не зафиксированы и реплике не видны
+        with override_settings(
+            API_CACHE_TIMEOUT=0,
+            DB_REPLICA_READS=False,
+            ALLOWED_HOSTS=["testserver"],
+        ):
+            with transaction.atomic():
+                results = self._run(options)
+                transaction.set_rollback(True)
+
+        self._print(results)
+        if options["update_baseline"]:
+            with open(options["baseline"], "w", encoding="utf-8") as baseline_file:
+                json.dump(results, baseline_file, ensure_ascii=False, indent=2)
+                baseline_file.write("\n")
+            self.stdout.write(
+                self.style.SUCCESS(f"Эталон сохранён: {options['baseline']}")
+            )
+            return
+        self._compare(results, options["baseline"], options["tolerance"])
+
+    def _run(self, options):
+        if not options["use_existing_data"]:
+            call_command(
+                "generate_network",
+                factories=2,
+                retail=10,
+                entrepreneurs=10,
+                products=2,
+                seed=42,
+                stdout=io.StringIO(),
+            )
+        User = get_user_model()
+        admin = User.objects.create_superuser(
+            "benchmark_admin", password=PASSWORD, role="admin"
+        )
+        User.objects.create_user("benchmark_manager", password=PASSWORD, role="manager")
+
+        api = APIClient()
+        token = api.post(
+            "/api/token/",
+            {"username": "benchmark_manager", "password": PASSWORD},
+            format="json",
+        ).data["access"]
+        api.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        anonymous = APIClient()
+        admin_client = Client()
+        admin_client.force_login(admin)
+
+        factory = NetworkElement.objects.filter(level=0).first()
+        element = NetworkElement.objects.filter(level=1).first()
+        product = Product.objects.first()
+        numbers = itertools.count(1)
+
+        scenarios = {
+            "network_list": lambda: api.get("/api/network/network/"),
+            "network_retrieve": lambda: api.get(f"/api/network/network/{element.id}/"),
+            "network_create": lambda: api.post(
+                "/api/network/network/",
+                network_payload(next(numbers), factory.id),
+                format="json",
+            ),
+            "network_partial_update": lambda: api.patch(
+                f"/api/network/network/{element.id}/",
+                {
+                    "название": f"Бенчмарк-переименование {next(numbers)}",
+                    "уровень_сети": 1,
+                    "поставщик": factory.id,
+                },
+                format="json",
+            ),
+            "product_list": lambda: api.get("/api/network/product/"),
+            "product_retrieve": lambda: api.get(f"/api/network/product/{product.id}/"),
+            "product_create": lambda: api.post(
+                "/api/network/product/",
+                product_payload(next(numbers), element.id),
+                format="json",
+            ),
+            "product_partial_update": lambda: api.patch(
+                f"/api/network/product/{product.id}/",
+                {"цена": f"{next(numbers)}.00"},
+                format="json",
+            ),
+            "token_obtain": lambda: anonymous.post(
+                "/api/token/",
+                {"username": "benchmark_manager", "password": PASSWORD},
+                format="json",
+            ),
+            "admin_network_changelist": lambda: admin_client.get(
+                "/admin/network/networkelement/"
+            ),
+            "admin_product_changelist": lambda: admin_client.get(
+                "/admin/network/product/"
+            ),
+        }
+        return {
+            name: self._measure(name, call, options["iterations"], options["warmup"])
+            for name, call in scenarios.items()
+        }
+
+    def _measure(self, name, call, iterations, warmup):
+        for _ in range(warmup):
+            self._check(name, call())
+
+        timings, queries = [], 0
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                self._check(name, call())
+                timings.append((time.perf_counter() - started) * 1000)
+            queries = max(queries, len(captured))
+
+        # Память меряем отдельными вызовами: tracemalloc искажает время.
+        # Берётся минимум — разовые аллокации (заполнение кэшей) не в счёт
+        peaks = []
+        for _ in range(MEMORY_SAMPLES):
+            tracemalloc.start()
+            self._check(name, call())
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        peak = min(peaks)
+
+        timings.sort()
+        return {
+            "p50_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(timings[max(0, int(len(timings) * 0.95) - 1)], 2),
+            "queries": queries,
+            "memory_kb": round(peak / 1024, 1),
+        }
+
+    @staticmethod
+    def _check(name, response):
+        if response.status_code >= 400:
+            raise CommandError(
+                f"{name}: ответ {response.status_code}: {response.content[:500]!r}"
+            )
+
+    def _print(self, results):
+        self.stdout.write(
+            f"{'Сценарий':<28}{'p50, мс':>10}{'p95, мс':>10}{'SQL':>6}{'память, КБ':>13}"
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<28}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+                f"{result['queries']:>6}{result['memory_kb']:>13.1f}"
+            )
+
+    def _compare(self, results, baseline_path, tolerance):
+        try:
+            with open(baseline_path, encoding="utf-8") as baseline_file:
+                baseline = json.load(baseline_file)
+        except FileNotFoundError:
+            raise CommandError(
+                f"Эталон {baseline_path} не найден, запустите с --update-baseline."
+            )
+
+        regressions = []
+        for name, result in results.items():
+            expected = baseline.get(name)
+            if expected is None:
+                continue
+            # Число запросов детерминировано и сравнивается точно
+            if result["queries"] > expected["queries"]:
+                regressions.append(
+                    f"{name}: SQL-запросов {result['queries']} > {expected['queries']}"
+                )
+            # Задержка сравнивается по медиане: p95 из нескольких десятков
+            # прогонов — это одно-два измерения, и его сдвигает любой всплеск
+            for metric, slack in (
+                ("p50_ms", LATENCY_SLACK_MS),
+                ("memory_kb", MEMORY_SLACK_KB),
+            ):
+                limit = expected[metric] * (1 + tolerance) + slack
+                if result[metric] > limit:
+                    regressions.append(
+                        f"{name}: {metric} {result[metric]} > {limit:.2f}"
+                    )
+        if regressions:
+            raise CommandError(
+                "Регрессия производительности:\n" + "\n".join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS("Регрессий относительно эталона нет."))
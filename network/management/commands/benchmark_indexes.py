@@ -0,0 +1,227 @@
+import re
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from network.models import NetworkElement, Product
+
+# Схема, в которой создаются копии таблиц на время замера
+SCRATCH_SCHEMA = "benchmark_indexes"
+
+# Базы, на которых команду можно запускать без --yes
+SAFE_DATABASE_RE = re.compile(r"test|bench", re.IGNORECASE)
+
+COUNTRIES = [
+    "Россия",
+    "Беларусь",
+    "Казахстан",
+    "Армения",
+    "Киргизия",
+    "Узбекистан",
+    "Китай",
+    "Вьетнам",
+    "Турция",
+    "Сербия",
+]
+
+SEED_ELEMENTS_SQL = """
+INSERT INTO {elements} (
+    level, name, email, phone, country, region, city, street, house_number,
+    postal_code, debt, created_at, updated_at, version, path
+)
+SELECT
+    i %% 3,
+    'Бенчмарк ' || i,
+    'bench' || i || '@example.com',
+    'b' || i,
+    (%(countries)s::text[])[1 + i %% 10],
+    'Регион ' || i %% 85,
+    'Город ' || i %% 1000,
+    'Улица ' || i %% 500,
+    (i %% 200)::text,
+    lpad((i %% 999999)::text, 6, '0'),
+    (i %% 100000) / 100.0,
+    now() - (i || ' seconds')::interval,
+    now(),
+    1,
+    ''
+FROM generate_series(1, %(count)s) AS i
+"""
+
+SEED_PRODUCTS_SQL = """
+INSERT INTO {products} (
+    name, model, release_date, price, manufacturer_country, network_element_id
+)
+SELECT
+    'Товар ' || e.id,
+    'X-' || e.id,
+    date '2015-01-01' + (e.id %% 3650)::integer,
+    (e.id %% 100000) / 10.0,
+    (%(countries)s::text[])[1 + e.id %% 10],
+    e.id
+FROM {elements} AS e
+WHERE e.name LIKE 'Бенчмарк %%'
+"""
+
+
+def filter_queries():
+    """Пути фильтрации, которые реально выполняют API и админка."""
+    element_id = NetworkElement.objects.values_list("id", flat=True).last()
+    return [
+        (
+            "API: страна, курсор",
+            NetworkElement.objects.filter(country="Казахстан").order_by(
+                "created_at", "id"
+            )[:50],
+        ),
+        (
+            "API: город, курсор",
+            NetworkElement.objects.filter(city="Город 42").order_by("created_at", "id")[
+                :50
+            ],
+        ),
+        (
+            "API: задолженность",
+            NetworkElement.objects.filter(debt__gte=999, debt__lte=999.5)[:50],
+        ),
+        (
+            "Админка: страна + уровень",
+            NetworkElement.objects.filter(country="Армения", level=1)[:100],
+        ),
+        ("Админка: город", NetworkElement.objects.filter(city="Город 42")[:100]),
+        (
+            "Админка: поиск по названию",
+            NetworkElement.objects.filter(name__icontains="марк 4242")[:100],
+        ),
+        (
+            "Админка: поиск по email",
+            NetworkElement.objects.filter(email__icontains="bench4242@")[:100],
+        ),
+        (
+            "Админка: поиск по телефону",
+            NetworkElement.objects.filter(phone__icontains="54242")[:100],
+        ),
+        (
+            "Продукты: дата выхода",
+            Product.objects.filter(
+                release_date__gte="2020-01-01", release_date__lt="2020-01-08"
+            )[:100],
+        ),
+        (
+            "Продукты: цена",
+            Product.objects.filter(price__gte=9999, price__lte=9999.5)[:100],
+        ),
+        (
+            "Продукты: страна производителя",
+            Product.objects.filter(manufacturer_country="Сербия")[:100],
+        ),
+        (
+            "Продукты: элемент сети",
+            Product.objects.filter(network_element_id=element_id)[:100],
+        ),
+        (
+            "Продукты: поиск по модели",
+            Product.objects.filter(model__icontains="X-4242")[:100],
+        ),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN-планы и время типовых фильтров с индексами и без них. "
+        "Таблицы создаются заново во временной схеме и заполняются "
+        "синтетическими данными; всё откатывается, рабочие таблицы "
+        "не изменяются и не блокируются."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=1_000_000,
+            help="Сколько синтетических элементов сети создать для замера",
+        )
+        parser.add_argument(
+            "--runs", type=int, default=5, help="Число прогонов каждого запроса"
+        )
+        parser.add_argument(
+            "--plans", action="store_true", help="Печатать планы EXPLAIN ANALYZE"
+        )
+        parser.add_argument(
+            "--yes",
+            action="store_true",
+            help="Запустить на базе, имя которой не похоже на тестовую",
+        )
+
+    def handle(self, *args, **options):
+        database = connection.settings_dict["NAME"]
+        if not options["yes"] and not SAFE_DATABASE_RE.search(database):
+            raise CommandError(
+                f"База {database!r} не похожа на тестовую: замер создаёт "
+                f"{options['seed']} строк в одной транзакции. "
+                "Запустите на копии базы или подтвердите флагом --yes."
+            )
+
+        with transaction.atomic():
+            self._create_scratch_tables()
+            self._seed(options["seed"])
+            after = self._measure(options["runs"])
+            self._drop_indexes()
+            before = self._measure(options["runs"])
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{'Запрос':<34}{'без индексов':>14}{'с индексами':>14}")
+        for label, (before_ms, before_plan) in before.items():
+            after_ms, after_plan = after[label]
+            self.stdout.write(f"{label:<34}{before_ms:>11.2f} мс{after_ms:>11.2f} мс")
+            if options["plans"]:
+                self.stdout.write(f"--- без индексов:\n{before_plan}")
+                self.stdout.write(f"--- с индексами:\n{after_plan}\n")
+
+    def _create_scratch_tables(self):
+        # Пустые таблицы с теми же колонками, ограничениями и индексами, что
+        # и после миграций. search_path (до конца транзакции) направляет в
+        # них все неквалифицированные запросы ORM и сырого SQL.
+        schema = connection.ops.quote_name(SCRATCH_SCHEMA)
+        with connection.cursor() as cursor:
+            cursor.execute(f"CREATE SCHEMA {schema}")
+            cursor.execute(f"SET LOCAL search_path TO {schema}, public")
+        with connection.schema_editor() as schema_editor:
+            schema_editor.create_model(NetworkElement)
+            schema_editor.create_model(Product)
+
+    def _seed(self, count):
+        tables = {
+            "elements": connection.ops.quote_name(NetworkElement._meta.db_table),
+            "products": connection.ops.quote_name(Product._meta.db_table),
+        }
+        params = {"count": count, "countries": COUNTRIES}
+        with connection.cursor() as cursor:
+            cursor.execute(SEED_ELEMENTS_SQL.format(**tables), params)
+            cursor.execute(SEED_PRODUCTS_SQL.format(**tables), params)
+            cursor.execute(f"ANALYZE {tables['elements']}, {tables['products']}")
+        self.stdout.write(f"Создано {count} элементов сети и продукты к ним.")
+
+    def _drop_indexes(self):
+        # Имя схемы указано явно: индекс с тем же именем в рабочей схеме
+        # не будет затронут, даже если во временной его нет
+        schema = connection.ops.quote_name(SCRATCH_SCHEMA)
+        with connection.cursor() as cursor:
+            for model in (NetworkElement, Product):
+                for index in model._meta.indexes:
+                    name = connection.ops.quote_name(index.name)
+                    cursor.execute(f"DROP INDEX {schema}.{name}")
+
+    def _measure(self, runs):
+        results = {}
+        for label, queryset in filter_queries():
+            timings = []
+            for _ in range(runs):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - started) * 1000)
+            plan = queryset.explain(analyze=True)
+            results[label] = (statistics.median(timings), plan)
+        return results
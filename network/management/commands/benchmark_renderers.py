@@ -0,0 +1,70 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from config.renderers import ORJSONRenderer
+from network.models import NetworkElement, Product
+from network.serializers import NetworkElementReadSerializer, ProductSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает стандартный JSONRenderer и ORJSONRenderer на списках "
+        "элементов сети и продуктов из текущей БД: медиана времени рендеринга "
+        "и размер ответа. Завершается ошибкой, если вывод различается."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[20, 100, 1000],
+            help="Размеры страниц в элементах",
+        )
+
+    def handle(self, *args, **options):
+        renderers = {"json": JSONRenderer(), "orjson": ORJSONRenderer()}
+        self.stdout.write(
+            f"{'Список':<22}{'json, мс':>10}{'orjson, мс':>12}{'ускорение':>11}"
+            f"{'размер, КБ':>12}"
+        )
+        for size in options["sizes"]:
+            pages = {
+                f"network x{size}": NetworkElementReadSerializer(
+                    NetworkElement.objects.order_by("id")[
+                        :size
+                    ].representation_values(),
+                    many=True,
+                ).data,
+                f"product x{size}": ProductSerializer(
+                    Product.objects.order_by("id")[:size], many=True
+                ).data,
+            }
+            for name, data in pages.items():
+                if not data:
+                    raise CommandError("Нет данных: запустите generate_network.")
+                rendered = {key: r.render(data) for key, r in renderers.items()}
+                if rendered["json"] != rendered["orjson"]:
+                    raise CommandError(f"{name}: вывод рендереров различается")
+                timings = {
+                    key: self._measure(renderer, data, options["iterations"])
+                    for key, renderer in renderers.items()
+                }
+                self.stdout.write(
+                    f"{name:<22}{timings['json']:>10.2f}{timings['orjson']:>12.2f}"
+                    f"{timings['json'] / timings['orjson']:>10.1f}x"
+                    f"{len(rendered['json']) / 1024:>12.1f}"
+                )
+
+    @staticmethod
+    def _measure(renderer, data, iterations):
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            renderer.render(data)
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,163 @@
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from network.cache import invalidate_network_elements, invalidate_products
+from network.models import Change, NetworkElement, Product
+
+COUNTRIES = ["Россия", "Беларусь", "Казахстан", "Армения", "Киргизия", "Узбекистан"]
+CITIES = [
+    "Москва",
+    "Санкт-Петербург",
+    "Новосибирск",
+    "Екатеринбург",
+    "Казань",
+    "Минск",
+    "Алматы",
+    "Ереван",
+    "Бишкек",
+    "Ташкент",
+]
+STREETS = ["Ленина", "Мира", "Советская", "Садовая", "Лесная", "Центральная"]
+PRODUCT_NAMES = ["Смартфон", "Ноутбук", "Телевизор", "Планшет", "Наушники", "Монитор"]
+MANUFACTURERS = ["Китай", "Корея", "Япония", "Тайвань", "Вьетнам", "Россия"]
+LEVEL_NAMES = dict(NetworkElement.LEVELS)
+
+
+class Command(BaseCommand):
+    help = (
+        "Генерация синтетической сети поставок (завод → розничная сеть → ИП) "
+        "с продуктами для нагрузочного тестирования. При одинаковом --seed "
+        "данные повторяются."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--factories", type=int, default=10, help="Число заводов")
+        parser.add_argument(
+            "--retail", type=int, default=20, help="Розничных сетей на завод"
+        )
+        parser.add_argument(
+            "--entrepreneurs", type=int, default=50, help="ИП на розничную сеть"
+        )
+        parser.add_argument(
+            "--products", type=int, default=2, help="Продуктов на элемент сети"
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--batch-size", type=int, default=5000, help="Размер пакета bulk_create"
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.products_per_element = options["products"]
+        self.batch_size = options["batch_size"]
+        started = time.perf_counter()
+        elements = products = 0
+
+        for number in range(1, options["factories"] + 1):
+            # Одна транзакция на поддерево завода: память и длина транзакции
+            # не зависят от общего объёма
+            with transaction.atomic():
+                factories = self._create_level(0, [None])
+                retail = self._create_level(
+                    1,
+                    [
+                        factory
+                        for factory in factories
+                        for _ in range(options["retail"])
+                    ],
+                )
+                entrepreneurs = self._create_level(
+                    2,
+                    [
+                        supplier
+                        for supplier in retail
+                        for _ in range(options["entrepreneurs"])
+                    ],
+                )
+            created = len(factories) + len(retail) + len(entrepreneurs)
+            elements += created
+            products += created * self.products_per_element
+            self.stdout.write(
+                f"Завод {number}/{options['factories']}: всего {elements} элементов"
+            )
+
+        # bulk_create не отправляет сигналы — сбрасываем закэшированные списки
+        invalidate_network_elements([])
+        invalidate_products([], [])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Создано {elements} элементов сети и {products} продуктов "
+                f"за {time.perf_counter() - started:.1f} с."
+            )
+        )
+
+    def _create_level(self, level, suppliers):
+        """
+        Создаёт по элементу на каждого поставщика из suppliers (пары id, path).
+        id берутся из последовательности заранее, чтобы путь был известен
+        до вставки и не требовал второго прохода.
+        """
+        ids = self._allocate_ids(len(suppliers))
+        elements = [
+            self._build_element(level, pk, supplier)
+            for pk, supplier in zip(ids, suppliers)
+        ]
+        NetworkElement.objects.bulk_create(elements, batch_size=self.batch_size)
+        products = Product.objects.bulk_create(
+            (
+                self._build_product(element.id, index)
+                for element in elements
+                for index in range(self.products_per_element)
+            ),
+            batch_size=self.batch_size,
+        )
+        # bulk_create не отправляет сигналы — записываем в журнал изменений
+        Change.objects.log(NetworkElement, ids, Change.CREATE)
+        Change.objects.log(Product, [product.id for product in products], Change.CREATE)
+        return [(element.id, element.path) for element in elements]
+
+    @staticmethod
+    def _allocate_ids(count):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, 'id')) "
+                "FROM generate_series(1, %s)",
+                [NetworkElement._meta.db_table, count],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def _build_element(self, level, pk, supplier):
+        rng = self.rng
+        supplier_id, supplier_path = supplier or (None, "/")
+        return NetworkElement(
+            id=pk,
+            level=level,
+            name=f"{LEVEL_NAMES[level]} №{pk}",
+            email=f"element{pk}@example.com",
+            phone=f"+7{pk:010d}",
+            country=rng.choice(COUNTRIES),
+            region=f"Регион {rng.randint(1, 85)}",
+            city=rng.choice(CITIES),
+            street=rng.choice(STREETS),
+            house_number=str(rng.randint(1, 200)),
+            postal_code=f"{rng.randint(0, 999999):06d}",
+            supplier_id=supplier_id,
+            path=f"{supplier_path}{pk}/",
+            debt=Decimal(rng.randint(0, 10_000_000)) / 100 if level else Decimal(0),
+        )
+
+    def _build_product(self, network_element_id, index):
+        rng = self.rng
+        return Product(
+            name=rng.choice(PRODUCT_NAMES),
+            model=f"M-{network_element_id}-{index}",
+            release_date=date(2015, 1, 1) + timedelta(days=rng.randint(0, 3650)),
+            price=Decimal(rng.randint(100_000, 50_000_000)) / 100,
+            manufacturer_country=rng.choice(MANUFACTURERS),
+            network_element_id=network_element_id,
+        )
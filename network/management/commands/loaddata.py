@@ -0,0 +1,18 @@
+from django.core.management.commands import loaddata
+
+from network.models import NetworkElement
+
+
+class Command(loaddata.Command):
+    """
+    loaddata, после которого пересчитываются пути элементов сети: фикстуры
+    сохраняются в обход NetworkElement.save(), и без пересчёта загруженные
+    элементы остались бы с пустым путём.
+    """
+
+    def loaddata(self, fixture_labels):
+        super().loaddata(fixture_labels)
+        if NetworkElement in self.models:
+            rebuilt = NetworkElement.objects.db_manager(self.using).rebuild_paths()
+            if self.verbosity >= 1:
+                self.stdout.write(f"Пересчитаны пути {rebuilt} элементов сети.")
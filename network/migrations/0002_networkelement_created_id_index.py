@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('network', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='networkelement',
+            index=models.Index(fields=['created_at', 'id'], name='network_created_id_idx'),
+        ),
+    ]
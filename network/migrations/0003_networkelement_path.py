@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:08
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Concat
+
+
+def fill_paths(apps, schema_editor):
+    """Заполняет пути уровень за уровнем, начиная с корней."""
+    NetworkElement = apps.get_model("network", "NetworkElement")
+    element_id = Cast("id", models.CharField())
+    NetworkElement.objects.filter(supplier__isnull=True).update(
+        path=Concat(Value("/"), element_id, Value("/"))
+    )
+    supplier_path = NetworkElement.objects.filter(pk=OuterRef("supplier_id")).values(
+        "path"
+    )[:1]
+    while NetworkElement.objects.filter(path="", supplier__path__gt="").update(
+        path=Concat(Subquery(supplier_path), element_id, Value("/"))
+    ):
+        pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('network', '0002_networkelement_created_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='networkelement',
+            name='path',
+            field=models.CharField(default='', editable=False, max_length=255, verbose_name='Путь в сети'),
+        ),
+        migrations.RunPython(fill_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='networkelement',
+            index=models.Index(fields=['path'], name='network_path_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
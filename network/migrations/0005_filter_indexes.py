@@ -0,0 +1,121 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:15
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("network", "0004_networkelement_version"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="networkelement",
+            index=models.Index(
+                condition=models.Q(("level", 2), _negated=True),
+                fields=["country", "created_at", "id"],
+                name="network_country_cursor_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="networkelement",
+            index=models.Index(
+                fields=["country", "level"], name="network_country_level_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="networkelement",
+            index=models.Index(fields=["city"], name="network_city_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="networkelement",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="network_name_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="networkelement",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("city"), name="gin_trgm_ops"
+                ),
+                name="network_city_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="networkelement",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("country"),
+                    name="gin_trgm_ops",
+                ),
+                name="network_country_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="networkelement",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("email"), name="gin_trgm_ops"
+                ),
+                name="network_email_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="networkelement",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("phone"), name="gin_trgm_ops"
+                ),
+                name="network_phone_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["release_date"], name="product_release_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["manufacturer_country"], name="product_manufacturer_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="product_name_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("model"), name="gin_trgm_ops"
+                ),
+                name="product_model_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("manufacturer_country"),
+                    name="gin_trgm_ops",
+                ),
+                name="product_manuf_trgm_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("network", "0006_search_vector"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="networkelement",
+            name="network_country_cursor_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="networkelement",
+            name="network_city_idx",
+        ),
+        migrations.AddIndex(
+            model_name="networkelement",
+            index=models.Index(
+                fields=["country", "created_at", "id"],
+                name="network_country_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="networkelement",
+            index=models.Index(
+                fields=["region", "created_at", "id"], name="network_region_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="networkelement",
+            index=models.Index(
+                fields=["city", "created_at", "id"], name="network_city_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="networkelement",
+            index=models.Index(
+                fields=["level", "created_at", "id"], name="network_level_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="networkelement",
+            index=models.Index(fields=["debt"], name="network_debt_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["price"], name="product_price_idx"),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:48
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("network", "0008_change_log"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="networkelement",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                db_default=django.db.models.functions.datetime.Now(),
+                verbose_name="Дата изменения",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="networkelement",
+            name="version",
+            field=models.PositiveIntegerField(
+                db_default=1, default=1, editable=False, verbose_name="Версия"
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+from django.db.models import Exists, OuterRef
+
+
+def backfill_changes(apps, schema_editor):
+    """
+    Записывает в журнал создание всех объектов, появившихся до него, чтобы
+    клиент мог синхронизироваться по ленте с нуля, без полной выгрузки.
+    """
+    Change = apps.get_model("network", "Change")
+    db = schema_editor.connection.alias
+    for model_name, value in (
+        ("NetworkElement", "network_element"),
+        ("Product", "product"),
+    ):
+        model = apps.get_model("network", model_name)
+        logged = Change.objects.using(db).filter(model=value, object_id=OuterRef("pk"))
+        ids = (
+            model.objects.using(db)
+            .filter(~Exists(logged))
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        Change.objects.using(db).bulk_create(
+            Change(model=value, object_id=pk, action="create") for pk in ids.iterator()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("network", "0009_updated_at_version_db_default"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_changes, migrations.RunPython.noop),
+    ]
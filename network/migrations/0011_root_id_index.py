@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:35
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("network", "0010_backfill_changes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="networkelement",
+            index=models.Index(
+                django.db.models.functions.comparison.Cast(
+                    django.db.models.functions.comparison.NullIf(
+                        models.Func(
+                            models.F("path"),
+                            models.Value("/"),
+                            models.Value(2),
+                            function="split_part",
+                            output_field=models.CharField(),
+                        ),
+                        models.Value(""),
+                    ),
+                    models.BigIntegerField(),
+                ),
+                include=("path", "debt"),
+                name="network_root_id_idx",
+            ),
+        ),
+    ]
@@ -1,5 +1,141 @@
-from django.core.exceptions import ValidationError
-from django.db import models
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    SearchVectorField,
+    TrigramSimilarity,
+)
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.db import connections, models, router, transaction
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import (
+    Cast,
+    Coalesce,
+    Concat,
+    Greatest,
+    Length,
+    Now,
+    NullIf,
+    Substr,
+    Upper,
+)
+from django.utils import timezone
+
+# Конфигурация полнотекстового поиска PostgreSQL (русская морфология)
+SEARCH_CONFIG = "russian"
+# Поля полнотекстового поиска (первое — с наибольшим весом) и нечёткого
+# поиска по триграммам (опечатки)
+NETWORK_SEARCH_FIELDS = ("name", "city", "country")
+NETWORK_FUZZY_FIELDS = ("name", "city")
+PRODUCT_SEARCH_FIELDS = ("name", "model", "manufacturer_country")
+PRODUCT_FUZZY_FIELDS = ("name", "model")
+
+
+def trigram_index(field, name):
+    """
+    Триграммный GIN-индекс по UPPER(field): именно так PostgreSQL-бэкенд
+    Django строит icontains (поиск в админке), поэтому ILIKE '%q%' не
+    сканирует всю таблицу.
+    """
+    return GinIndex(OpClass(Upper(field), name="gin_trgm_ops"), name=name)
+
+
+def root_id():
+    """
+    id корня поддерева — первый элемент материализованного пути. По этому
+    выражению построен индекс network_root_id_idx, поэтому группировка по
+    нему в запросах должна использовать именно эту функцию.
+    """
+    root = models.Func(
+        models.F("path"),
+        models.Value("/"),
+        models.Value(2),
+        function="split_part",
+        output_field=models.CharField(),
+    )
+    return Cast(NullIf(root, models.Value("")), models.BigIntegerField())
+
+
+def search_vector_field(fields):
+    """
+    Хранимый tsvector полей (первое — с весом A, остальные — B). PostgreSQL
+    пересчитывает его при записи, поэтому поиск и ранжирование не разбирают
+    текст каждой найденной строки заново.
+    """
+    primary, *secondary = fields
+    return models.GeneratedField(
+        expression=SearchVector(primary, weight="A", config=SEARCH_CONFIG)
+        + SearchVector(*secondary, weight="B", config=SEARCH_CONFIG),
+        output_field=SearchVectorField(),
+        db_persist=True,
+        editable=False,
+        verbose_name="Поисковый вектор",
+    )
+
+
+def search_matches(queryset, query, fuzzy_fields):
+    """
+    Записи, совпавшие с query полнотекстово (websearch-синтаксис: слова,
+    "фраза", -исключение) или похожие по триграммам в fuzzy_fields, —
+    по GIN-индексам search_vector и trigram_index (BitmapOr).
+    """
+    search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type="websearch")
+    similar = query.upper()
+    upper = {f"upper_{field}": Upper(field) for field in fuzzy_fields}
+    match = models.Q(search_vector=search_query)
+    for alias in upper:
+        match |= models.Q(**{f"{alias}__trigram_similar": similar})
+    return queryset.annotate(**upper).filter(match)
+
+
+def ranked_search(queryset, query, fuzzy_fields):
+    """
+    Совпадения search_matches() по убыванию релевантности `rank`: ts_rank
+    плюс наибольшее триграммное сходство. Ранжируются не больше
+    SEARCH_MAX_CANDIDATES совпадений: для частого слова время не растёт
+    вместе с таблицей, но лучшие выбираются из первых найденных индексом.
+    """
+    candidates = (
+        search_matches(queryset, query, fuzzy_fields)
+        .order_by()
+        .values("pk")[: settings.SEARCH_MAX_CANDIDATES]
+    )
+    search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type="websearch")
+    similarity = [
+        TrigramSimilarity(Upper(field), query.upper()) for field in fuzzy_fields
+    ]
+    return (
+        queryset.filter(pk__in=candidates)
+        .annotate(
+            rank=SearchRank(models.F("search_vector"), search_query)
+            + (Greatest(*similarity) if len(similarity) > 1 else similarity[0])
+        )
+        .order_by("-rank", "id")
+    )
+
+
+def subtree_prefix(element):
+    """
+    Префикс пути поддерева element. Пустой путь совпал бы со всей таблицей,
+    поэтому запрос с ним не выполняется.
+    """
+    if not element.path:
+        raise ValueError(
+            f"У элемента сети {element.pk} не вычислен путь: выполните "
+            "NetworkElement.objects.rebuild_paths()."
+        )
+    return element.path
+
+
+class ProductQuerySet(models.QuerySet):
+    def matching(self, query):
+        return search_matches(self, query, PRODUCT_FUZZY_FIELDS)
+
+    def search(self, query):
+        """Полнотекстовый и нечёткий поиск продуктов, лучшие совпадения первыми."""
+        return ranked_search(self, query, PRODUCT_FUZZY_FIELDS)
 
 
 class Product(models.Model):
@@ -18,9 +154,27 @@ class Product(models.Model):
         related_name="product_list",
         verbose_name="Связанное звено сети",
     )
+    # Полнотекстовый поиск по названию, модели и стране производителя
+    search_vector = search_vector_field(PRODUCT_SEARCH_FIELDS)
+
+    objects = ProductQuerySet.as_manager()
 
     class Meta:
         unique_together = ("name", "model")  # Уникальная пара (название + модель)
+        indexes = [
+            # Фильтры API (network.filters) и админки
+            models.Index(fields=["release_date"], name="product_release_date_idx"),
+            models.Index(fields=["price"], name="product_price_idx"),
+            models.Index(
+                fields=["manufacturer_country"], name="product_manufacturer_idx"
+            ),
+            # Поиск в админке
+            trigram_index("name", "product_name_trgm_idx"),
+            trigram_index("model", "product_model_trgm_idx"),
+            trigram_index("manufacturer_country", "product_manuf_trgm_idx"),
+            # Полнотекстовый поиск (/api/network/product/search/)
+            GinIndex(fields=["search_vector"], name="product_search_idx"),
+        ]
         verbose_name = "Продукт"
         verbose_name_plural = "Продукты"
 
@@ -28,6 +182,188 @@ class Product(models.Model):
         return f"{self.name} ({self.model})"
 
 
+class NetworkElementQuerySet(models.QuerySet):
+    def for_representation(self):
+        """
+        План запроса для чтения через API: поставщик подтягивается JOIN-ом,
+        продукты — одним дополнительным запросом только с нужными колонками.
+        """
+        return self.select_related("supplier").prefetch_related(
+            models.Prefetch(
+                "product_list",
+                queryset=Product.objects.only(
+                    "id",
+                    "name",
+                    "model",
+                    "release_date",
+                    "price",
+                    "manufacturer_country",
+                    "network_element",
+                ).order_by("id"),
+            )
+        )
+
+    REPRESENTATION_COLUMNS = (
+        "id",
+        "level",
+        "name",
+        "email",
+        "phone",
+        "country",
+        "region",
+        "city",
+        "street",
+        "house_number",
+        "postal_code",
+        "debt",
+        "created_at",
+        "supplier_id",
+        "supplier__name",
+        "supplier__level",
+    )
+
+    def representation_values(self, columns=None):
+        """
+        Строки для быстрого чтения через API (NetworkElementReadSerializer):
+        поля элемента и поставщика одним JOIN-ом, без создания моделей.
+        columns — часть колонок, если клиент запросил не все поля; без
+        колонок поставщика JOIN не выполняется.
+        """
+        return self.values(*(columns or self.REPRESENTATION_COLUMNS))
+
+    def descendants_of(self, element):
+        """Все звенья ниже element по цепочке поставок (индекс по path)."""
+        return self.filter(path__startswith=subtree_prefix(element)).exclude(
+            pk=element.pk
+        )
+
+    def ancestors_of(self, element):
+        """Цепочка поставщиков element от завода к непосредственному поставщику."""
+        return self.filter(pk__in=element.ancestor_ids).order_by(Length("path"))
+
+    def with_factory_id(self):
+        """
+        Аннотирует id корня поддерева — первый элемент материализованного
+        пути. Обычно это завод, но звено, чей поставщик удалён, само
+        становится корнем: отчёт по заводам такие корни отделяет.
+        """
+        return self.annotate(factory_id=root_id())
+
+    def debt_totals(self, group_by):
+        """
+        Суммарная задолженность и число звеньев одним GROUP BY
+        по заводу (поддереву), стране или уровню сети.
+        """
+        queryset = self.with_factory_id() if group_by == "factory_id" else self
+        return (
+            queryset.order_by()
+            .values(group_by)
+            .annotate(
+                total=Coalesce(
+                    models.Sum("debt"),
+                    models.Value(0),
+                    output_field=models.DecimalField(),
+                ),
+                elements=models.Count("*"),
+            )
+            .order_by(group_by)
+        )
+
+    def subtree_debt(self, element):
+        """Задолженность element и всех звеньев ниже него одним агрегатом."""
+        return self.filter(path__startswith=subtree_prefix(element)).aggregate(
+            total=Coalesce(
+                models.Sum("debt"), models.Value(0), output_field=models.DecimalField()
+            ),
+            elements=models.Count("id"),
+        )
+
+    def bump_version(self, *, log=(), **changes):
+        """
+        Обновляет элементы с отметкой об изменении представления:
+        версия и updated_at используются для ETag и Last-Modified.
+        changes — новые значения полей (без выражений).
+
+        Обновление и запись в журнал изменений (Change) — один запрос:
+        UPDATE ... RETURNING id в CTE и INSERT в журнал из него. Какие
+        строки обновлять, задаёт подзапрос id из этого QuerySet-а. log —
+        записи журнала о других объектах (модель, id, действие), которые
+        добавляются тем же запросом: так сохранение продукта пишет и сам
+        продукт, и его элемент сети.
+        """
+        try:
+            ids_sql, ids_params = self.order_by().values("pk").query.sql_with_params()
+        except EmptyResultSet:
+            Change.objects.log_entries(log)
+            return 0
+        connection = connections[router.db_for_write(self.model)]
+        quote = connection.ops.quote_name
+        opts = self.model._meta
+        version = quote(opts.get_field("version").column)
+        assignments, params = [f"{version} = {version} + 1"], []
+        for name, value in {"updated_at": timezone.now(), **changes}.items():
+            field = opts.get_field(name)
+            assignments.append(f"{quote(field.column)} = %s")
+            params.append(field.get_db_prep_save(value, connection))
+        pk = quote(opts.pk.column)
+        extra = "".join(" UNION ALL SELECT %s, %s, %s" for _ in log)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"WITH bumped AS ("
+                f"UPDATE {quote(opts.db_table)} SET {', '.join(assignments)} "
+                f"WHERE {pk} IN ({ids_sql}) RETURNING {pk} AS id) "
+                f"INSERT INTO {quote(Change._meta.db_table)} "
+                f"(model, object_id, action) "
+                f"SELECT %s, bumped.id, %s FROM bumped{extra}",
+                [
+                    *params,
+                    *ids_params,
+                    Change.MODELS[self.model],
+                    Change.UPDATE,
+                    *(
+                        value
+                        for model, pk, action in log
+                        for value in (Change.MODELS[model], pk, action)
+                    ),
+                ],
+            )
+            return cursor.rowcount - len(log)
+
+    def matching(self, query):
+        return search_matches(self, query, NETWORK_FUZZY_FIELDS)
+
+    def search(self, query):
+        """Полнотекстовый и нечёткий поиск элементов сети, лучшие первыми."""
+        return ranked_search(self, query, NETWORK_FUZZY_FIELDS)
+
+    def rebuild_paths(self):
+        """
+        Пересчитывает материализованные пути всей таблицы от заводов вниз
+        одним UPDATE с рекурсивным CTE. Нужен после записи в обход save():
+        loaddata сохраняет «сырые» строки, и пути остаются пустыми.
+        """
+        table = connections[self.db].ops.quote_name(self.model._meta.db_table)
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(f"""
+                WITH RECURSIVE tree (id, path) AS (
+                    SELECT id, '/' || id || '/' FROM {table}
+                    WHERE supplier_id IS NULL
+                    UNION ALL
+                    SELECT e.id, tree.path || e.id || '/'
+                    FROM {table} AS e JOIN tree ON e.supplier_id = tree.id
+                )
+                UPDATE {table} AS e SET path = tree.path FROM tree
+                WHERE e.id = tree.id AND e.path IS DISTINCT FROM tree.path
+                """)
+            return cursor.rowcount
+
+    def move_subtree(self, old_path, new_path):
+        """Переносит поддерево с путём old_path под new_path одним UPDATE."""
+        return self.filter(path__startswith=old_path).update(
+            path=Concat(models.Value(new_path), Substr("path", len(old_path) + 1))
+        )
+
+
 class NetworkElement(models.Model):
     LEVELS = (
         (0, "Завод"),
@@ -59,6 +395,23 @@ class NetworkElement(models.Model):
         max_digits=10, decimal_places=2, default=0.0, verbose_name="Задолженность (₽)"
     )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")
+    # Значения по умолчанию в БД — для записей без них (loaddata сохраняет
+    # «сырые» строки без auto_now, фикстуры этих колонок не содержат)
+    updated_at = models.DateTimeField(
+        auto_now=True, db_default=Now(), verbose_name="Дата изменения"
+    )
+    # Растёт при изменении элемента, его продуктов или поставщика
+    version = models.PositiveIntegerField(
+        default=1, db_default=1, editable=False, verbose_name="Версия"
+    )
+    # Материализованный путь от завода: "/<id завода>/<id сети>/<id>/"
+    path = models.CharField(
+        max_length=255, default="", editable=False, verbose_name="Путь в сети"
+    )
+    # Полнотекстовый поиск по названию, городу и стране
+    search_vector = search_vector_field(NETWORK_SEARCH_FIELDS)
+
+    objects = NetworkElementQuerySet.as_manager()
 
     def clean(self):
         """
@@ -77,12 +430,198 @@ class NetworkElement(models.Model):
 
     def save(self, *args, **kwargs):
         self.clean()  # Вызываем валидацию перед сохранением
+        # Чтение путей, сохранение и перенос поддерева — одна транзакция:
+        # иначе сбой или параллельный перенос между ними оставит поддерево
+        # с несогласованными путями
+        with transaction.atomic(savepoint=False):
+            self._save_with_path(*args, **kwargs)
+
+    def _save_with_path(self, *args, **kwargs):
+        # Актуальные пути и версию берём из БД (экземпляр мог устареть) и
+        # блокируем строки элемента и поставщика до конца транзакции
+        stored = {
+            row["id"]: row
+            for row in NetworkElement.objects.select_for_update()
+            .filter(pk__in=[pk for pk in (self.pk, self.supplier_id) if pk])
+            .values("id", "path", "version", "name", "level")
+        }
+        current = stored.get(self.pk, {"path": "", "version": 0})
+        old_path = current["path"]
+        self.path = old_path
+        self.version = current["version"] + 1
         super().save(*args, **kwargs)
 
+        supplier = stored.get(self.supplier_id)
+        new_path = f"{supplier['path'] if supplier else '/'}{self.pk}/"
+        if new_path != old_path:
+            if old_path:
+                NetworkElement.objects.move_subtree(old_path, new_path)
+            else:
+                NetworkElement.objects.filter(pk=self.pk).update(path=new_path)
+            self.path = new_path
+
+        if (current.get("name"), current.get("level")) not in (
+            (None, None),
+            (self.name, self.level),
+        ):
+            # Клиенты показывают название и уровень своего поставщика
+            NetworkElement.objects.filter(supplier_id=self.pk).bump_version()
+
+    @property
+    def ancestor_ids(self):
+        return [int(pk) for pk in self.path.strip("/").split("/")[:-1]]
+
     class Meta:
         unique_together = ("name", "level")  # Уникальная пара (название + уровень)
+        indexes = [
+            # Ключ курсорной пагинации
+            models.Index(fields=["created_at", "id"], name="network_created_id_idx"),
+            # Поиск поддерева по префиксу пути (LIKE 'prefix%')
+            models.Index(
+                fields=["path"],
+                name="network_path_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+            # Фильтры API на равенство (network.filters): страница по курсору
+            # читается из индекса уже упорядоченной
+            models.Index(
+                fields=["country", "created_at", "id"],
+                name="network_country_created_idx",
+            ),
+            models.Index(
+                fields=["region", "created_at", "id"], name="network_region_created_idx"
+            ),
+            models.Index(
+                fields=["city", "created_at", "id"], name="network_city_created_idx"
+            ),
+            models.Index(
+                fields=["level", "created_at", "id"], name="network_level_created_idx"
+            ),
+            # Диапазоны задолженности
+            models.Index(fields=["debt"], name="network_debt_idx"),
+            # Отчёт по заводам (debt_totals("factory_id")): группы читаются
+            # из индекса по порядку, задолженность — из него же
+            models.Index(
+                root_id(), name="network_root_id_idx", include=["path", "debt"]
+            ),
+            # Фильтр админки
+            models.Index(fields=["country", "level"], name="network_country_level_idx"),
+            # Поиск в админке
+            trigram_index("name", "network_name_trgm_idx"),
+            trigram_index("city", "network_city_trgm_idx"),
+            trigram_index("country", "network_country_trgm_idx"),
+            trigram_index("email", "network_email_trgm_idx"),
+            trigram_index("phone", "network_phone_trgm_idx"),
+            # Полнотекстовый поиск (/api/network/network/search/)
+            GinIndex(fields=["search_vector"], name="network_search_idx"),
+        ]
         verbose_name = "Элемент сети"
         verbose_name_plural = "Элементы сети"
 
     def __str__(self):
         return self.name
+
+
+class ChangeQuerySet(models.QuerySet):
+    def log(self, model, ids, action):
+        """Записывает действие action над объектами model с id из ids."""
+        return self.log_entries((model, pk, action) for pk in ids)
+
+    def log_entries(self, entries):
+        """Записывает изменения (модель, id, действие) одним INSERT."""
+        return self.bulk_create(
+            [
+                Change(model=Change.MODELS[model], object_id=pk, action=action)
+                for model, pk, action in entries
+            ],
+            batch_size=5000,
+        )
+
+    def after(self, cursor=None):
+        """
+        Изменения после cursor (пара transaction_id, id) в порядке курсора.
+
+        Номер записи выдаётся при вставке, а видна она становится при
+        фиксации транзакции, поэтому запись с меньшим id может появиться
+        позже записи с большим. Отдаются только изменения транзакций,
+        завершившихся раньше самой старой из ещё идущих (xmin снимка):
+        всё, что станет видно позже, получит курсор больше уже отданных.
+        """
+        queryset = self.filter(
+            transaction_id__lt=RawSQL(
+                "txid_snapshot_xmin(txid_current_snapshot())",
+                [],
+                output_field=models.BigIntegerField(),
+            )
+        )
+        if cursor is not None:
+            # Сравнение строк — условие индекса change_cursor_idx целиком,
+            # даже когда у тысяч записей одна транзакция
+            queryset = queryset.filter(
+                RawSQL(
+                    "(transaction_id, id) > (%s, %s)",
+                    cursor,
+                    output_field=models.BooleanField(),
+                )
+            )
+        return queryset.order_by("transaction_id", "id")
+
+
+class Change(models.Model):
+    """
+    Журнал изменений элементов сети и продуктов (только добавление записей).
+    Пишется сигналами (network.signals), bump_version() и явно — при
+    пакетной записи, которая сигналов не отправляет. По нему внешние
+    системы синхронизируются инкрементально (/api/network/changes/).
+    """
+
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+    ACTIONS = (
+        (CREATE, "Создание"),
+        (UPDATE, "Изменение"),
+        (DELETE, "Удаление"),
+    )
+    MODEL_CHOICES = (
+        ("network_element", "Элемент сети"),
+        ("product", "Продукт"),
+    )
+    # Модель -> значение поля model
+    MODELS = {NetworkElement: "network_element", Product: "product"}
+
+    # Транзакция, в которой произошло изменение: первая часть курсора
+    transaction_id = models.BigIntegerField(
+        db_default=models.Func(
+            function="txid_current", output_field=models.BigIntegerField()
+        ),
+        editable=False,
+        verbose_name="Транзакция",
+    )
+    model = models.CharField(
+        max_length=20,
+        choices=MODEL_CHOICES,
+        verbose_name="Модель",
+    )
+    object_id = models.BigIntegerField(verbose_name="ID объекта")
+    action = models.CharField(max_length=6, choices=ACTIONS, verbose_name="Действие")
+    changed_at = models.DateTimeField(
+        db_default=Now(), editable=False, verbose_name="Время изменения"
+    )
+
+    objects = ChangeQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Ключ курсора ленты изменений
+            models.Index(fields=["transaction_id", "id"], name="change_cursor_idx"),
+        ]
+        verbose_name = "Изменение"
+        verbose_name_plural = "Изменения"
+
+    @property
+    def cursor(self):
+        return f"{self.transaction_id}-{self.id}"
+
+    def __str__(self):
+        return f"{self.get_action_display()} {self.model} {self.object_id}"
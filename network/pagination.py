@@ -0,0 +1,160 @@
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.models.lookups import GreaterThan, LessThan
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+
+class Row(models.Func):
+    """Конструктор строки PostgreSQL: (a, b, ...)."""
+
+    template = "(%(expressions)s)"
+    output_field = models.Field()
+
+
+class NetworkCursorPagination(CursorPagination):
+    """
+    Курсорная (keyset) пагинация: стоимость страницы не зависит от её номера.
+    Размер страницы задаётся параметром `page_size`, но не больше
+    `API_MAX_PAGE_SIZE`.
+
+    В отличие от CursorPagination из DRF позиция курсора — значения всех
+    полей сортировки, а не только первого, и следующая страница выбирается
+    сравнением строк `(created_at, id) > (...)`. Одинаковые created_at не
+    требуют смещения (OFFSET) внутри группы, а условие целиком ложится на
+    составной индекс. Все поля сортировки должны идти в одном направлении.
+
+    paginate_queryset из DRF разделён на построение запроса страницы и разбор
+    результата, чтобы асинхронные представления выполняли запрос через
+    aiterator() с той же логикой курсоров.
+    """
+
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        return self.set_page(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        return self.set_page(
+            [
+                obj
+                async for obj in page_queryset.aiterator(chunk_size=self.page_size + 1)
+            ]
+        )
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """Запрос страницы и ещё одной записи — признака следующей страницы."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            offset, self.reverse, self.current_position = 0, False, None
+        else:
+            offset, self.reverse, self.current_position = self.cursor
+        self.offset = offset
+
+        if self.reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if self.current_position is not None:
+            queryset = queryset.filter(self._after_position(queryset.model))
+
+        limit = offset + self.page_size + 1
+        return queryset[offset:limit]
+
+    def _after_position(self, model):
+        """Условие «строго после позиции курсора» в порядке обхода страницы."""
+        directions = {order.startswith("-") for order in self.ordering}
+        assert (
+            len(directions) == 1
+        ), "Сравнение строк требует одного направления у всех полей сортировки."
+        names = [order.lstrip("-") for order in self.ordering]
+        try:
+            position = json.loads(self.current_position)
+            if not isinstance(position, list) or len(position) != len(names):
+                raise ValueError(position)
+            values = [
+                models.Value(field.to_python(value), output_field=field)
+                for field, value in zip(
+                    (model._meta.get_field(name) for name in names), position
+                )
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        lookup = LessThan if self.cursor.reverse != directions.pop() else GreaterThan
+        return lookup(Row(*names), Row(*values))
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for order in ordering:
+            name = order.lstrip("-")
+            attr = (
+                instance[name]
+                if isinstance(instance, dict)
+                else getattr(instance, name)
+            )
+            values.append(str(attr))
+        return json.dumps(values)
+
+    def set_page(self, results):
+        """Страница и позиции соседних страниц по результатам get_page_queryset."""
+        self.page = results[: self.page_size]
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        else:
+            has_following_position = False
+            following_position = None
+
+        has_current_position = self.current_position is not None or self.offset > 0
+        if self.reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = has_current_position
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = self.current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = has_current_position
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = self.current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+
+class NetworkElementPagination(NetworkCursorPagination):
+    ordering = ("created_at", "id")
+
+
+class ProductPagination(NetworkCursorPagination):
+    ordering = "id"
@@ -0,0 +1,28 @@
+from contextlib import ExitStack
+
+from rest_framework.permissions import SAFE_METHODS
+
+from config.db_router import replica_reads
+
+
+class ReplicaReadMixin:
+    """
+    Безопасные запросы (GET/HEAD/OPTIONS) viewset-а читают с реплики —
+    только обработчик действия, после initial(). Аутентификация и проверка
+    прав читают основную базу: на отстающей реплике пользователь может
+    быть ещё не создан или не заблокирован. Ответы, которые попадают в
+    кэш, тоже строятся по основной базе (CachedResponseMixin).
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._replica_reads = ExitStack()
+        if request.method in SAFE_METHODS:
+            self._replica_reads.enter_context(replica_reads())
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # Вызывается и после исключения в обработчике
+        replica = getattr(self, "_replica_reads", None)
+        if replica is not None:
+            replica.close()
+        return super().finalize_response(request, response, *args, **kwargs)
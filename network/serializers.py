@@ -1,6 +1,35 @@
+from collections import defaultdict
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
 from rest_framework import serializers
 
-from network.models import NetworkElement, Product
+from network.cache import invalidate_network_elements
+from network.exports import (
+    NETWORK_ELEMENT_EXPORT_FIELDS,
+    PRODUCT_EXPORT_FIELDS,
+    to_primitive,
+)
+from network.models import Change, NetworkElement, Product
+
+# Колонки выгрузки — это поля API плюс id связанной записи, которую API
+# отдаёт вложенным объектом (`поставщик`) или не отдаёт вовсе (`звено_сети`)
+NETWORK_ELEMENT_READ_FIELDS = NETWORK_ELEMENT_EXPORT_FIELDS[:-1]
+PRODUCT_READ_FIELDS = PRODUCT_EXPORT_FIELDS[:-1]
+# Колонки, значения которых нужно приводить к виду API (Decimal, даты)
+NETWORK_ELEMENT_CONVERTED = {"debt", "created_at"}
+PRODUCT_CONVERTED = {"release_date", "price"}
+# Вложенные объекты элемента сети, которые клиент может не разворачивать
+NETWORK_ELEMENT_EXPANDABLE = ("поставщик", "продукты")
+
+
+def _read_row(row, fields, converted):
+    return {
+        key: to_primitive(row[column]) if column in converted else row[column]
+        for key, column in fields
+    }
 
 
 class ProductSerializer(serializers.ModelSerializer):
@@ -15,6 +44,13 @@ class ProductSerializer(serializers.ModelSerializer):
     страна_производителя = serializers.CharField(
         source="manufacturer_country", label="Страна производителя"
     )
+    # Только для записи: без него продукт нельзя создать через API
+    звено_сети = serializers.PrimaryKeyRelatedField(
+        source="network_element",
+        queryset=NetworkElement.objects.all(),
+        write_only=True,
+        label="ID элемента сети",
+    )
 
     class Meta:
         model = Product
@@ -25,6 +61,7 @@ class ProductSerializer(serializers.ModelSerializer):
             "дата_выхода",
             "цена",
             "страна_производителя",
+            "звено_сети",
         ]
 
 
@@ -184,3 +221,412 @@ class NetworkElementSerializer(serializers.ModelSerializer):
         data["supplier"] = supplier
 
         return data
+
+
+class NetworkElementBulkListSerializer(serializers.ListSerializer):
+    """
+    Пакетная загрузка элементов сети (upsert по паре название + уровень).
+    Уникальность и уровни поставщиков проверяются по данным, полученным
+    из БД одним запросом на весь пакет, запись — одним bulk_create.
+    """
+
+    update_fields = [
+        "email",
+        "phone",
+        "country",
+        "region",
+        "city",
+        "street",
+        "house_number",
+        "postal_code",
+        "supplier",
+    ]
+
+    def validate(self, attrs):
+        names = {item["name"] for item in attrs}
+        emails = {item["email"] for item in attrs}
+        phones = {item["phone"] for item in attrs}
+        supplier_ids = {item["supplier"] for item in attrs if item["supplier"]}
+
+        existing = list(
+            NetworkElement.objects.filter(
+                Q(name__in=names) | Q(email__in=emails) | Q(phone__in=phones)
+            ).values("id", "name", "level", "email", "phone", "path", "version")
+        )
+        by_key = {(row["name"], row["level"]): row for row in existing}
+        by_email = {row["email"]: row for row in existing}
+        by_phone = {row["phone"]: row for row in existing}
+        suppliers = NetworkElement.objects.filter(id__in=supplier_ids).values_list(
+            "id", "level", "path"
+        )
+        supplier_levels = {pk: level for pk, level, _ in suppliers}
+        self._supplier_paths = {pk: path for pk, _, path in suppliers}
+        self._old_paths = {}
+
+        errors = {}
+        seen_keys, seen_emails, seen_phones = set(), set(), set()
+        for index, item in enumerate(attrs):
+            item_errors = {}
+            key = (item["name"], item["level"])
+            current = by_key.get(key)
+
+            if key in seen_keys:
+                item_errors["название"] = [
+                    "Элемент сети с таким названием и уровнем повторяется в пакете."
+                ]
+            owner = by_email.get(item["email"])
+            if item["email"] in seen_emails or (owner and owner is not current):
+                item_errors["email"] = ["Элемент сети с таким email уже существует."]
+            owner = by_phone.get(item["phone"])
+            if item["phone"] in seen_phones or (owner and owner is not current):
+                item_errors["phone"] = [
+                    "Элемент сети с таким телефоном уже существует."
+                ]
+            seen_keys.add(key)
+            seen_emails.add(item["email"])
+            seen_phones.add(item["phone"])
+
+            supplier_error = self._check_supplier(
+                item["level"], item["supplier"], supplier_levels
+            )
+            if supplier_error:
+                item_errors["поставщик"] = [supplier_error]
+
+            if item_errors:
+                errors[index] = item_errors
+            elif current:
+                item["id"] = current["id"]
+                item["version"] = current["version"] + 1
+                self._old_paths[current["id"]] = current["path"]
+
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    @staticmethod
+    def _check_supplier(level, supplier_id, supplier_levels):
+        if supplier_id and supplier_id not in supplier_levels:
+            return f"Поставщик с ID {supplier_id} не найден."
+        supplier_level = supplier_levels.get(supplier_id)
+        if level == 0 and supplier_id:
+            return "Завод (уровень 0) не может иметь поставщика."
+        if level == 1 and supplier_level != 0:
+            return (
+                "Розничная сеть (уровень 1) должна иметь поставщика уровня 0 (Завод)."
+            )
+        if level == 2 and supplier_level != 1:
+            return "Индивидуальный предприниматель (уровень 2) должен иметь поставщика уровня 1 (Розничная сеть)."
+        return None
+
+    def create(self, validated_data):
+        elements = [
+            NetworkElement(
+                name=item["name"],
+                level=item["level"],
+                supplier_id=item["supplier"],
+                version=item.get("version", 1),
+                **{
+                    field: item[field]
+                    for field in self.update_fields
+                    if field != "supplier"
+                },
+            )
+            for item in validated_data
+        ]
+        with transaction.atomic():
+            NetworkElement.objects.bulk_create(
+                elements,
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=["name", "level"],
+                update_fields=[*self.update_fields, "version", "updated_at"],
+            )
+            self._update_paths(elements)
+            self.summary = {
+                "создано": [
+                    element.id
+                    for element, item in zip(elements, validated_data)
+                    if "id" not in item
+                ],
+                "обновлено": [item["id"] for item in validated_data if "id" in item],
+            }
+            # bulk_create не отправляет сигналы — журнал и кэш обновляем явно
+            Change.objects.log(NetworkElement, self.summary["создано"], Change.CREATE)
+            Change.objects.log(NetworkElement, self.summary["обновлено"], Change.UPDATE)
+            transaction.on_commit(
+                partial(
+                    invalidate_network_elements, [element.id for element in elements]
+                )
+            )
+        return elements
+
+    def _update_paths(self, elements):
+        """
+        Пересчитывает материализованные пути: новым звеньям — одним
+        bulk_update, перенесённым к другому поставщику — вместе с поддеревом.
+        """
+        new_paths, created = {}, []
+        for element in sorted(elements, key=lambda element: element.level):
+            supplier_path = new_paths.get(element.supplier_id) or (
+                self._supplier_paths.get(element.supplier_id, "/")
+            )
+            element.path = f"{supplier_path}{element.id}/"
+            new_paths[element.id] = element.path
+            old_path = self._old_paths.get(element.id)
+            if old_path is None:
+                created.append(element)
+            elif old_path != element.path:
+                NetworkElement.objects.move_subtree(old_path, element.path)
+                self._old_paths = {
+                    pk: (
+                        element.path + path[len(old_path) :]
+                        if path.startswith(old_path)
+                        else path
+                    )
+                    for pk, path in self._old_paths.items()
+                }
+        NetworkElement.objects.bulk_update(created, ["path"], batch_size=1000)
+
+
+class NetworkElementBulkItemSerializer(NetworkElementSerializer):
+    """
+    Элемент пакетной загрузки: проверки, требующие обращения к БД,
+    выполняются сразу для всего пакета в NetworkElementBulkListSerializer.
+    """
+
+    поставщик = serializers.IntegerField(
+        source="supplier", required=False, allow_null=True, label="ID поставщика"
+    )
+
+    class Meta(NetworkElementSerializer.Meta):
+        list_serializer_class = NetworkElementBulkListSerializer
+        validators = []
+
+    def to_internal_value(self, data):
+        if "debt" in data or "задолженность" in data:
+            raise serializers.ValidationError(
+                {"detail": "Поле 'debt' нельзя изменять через API."}
+            )
+        data = super().to_internal_value(data)
+        data.setdefault("supplier", None)
+        return data
+
+    def validate(self, data):
+        if data["level"] not in dict(NetworkElement.LEVELS):
+            raise serializers.ValidationError(
+                {"уровень_сети": "Недопустимый уровень сети."}
+            )
+        return data
+
+
+def product_representations(network_element_ids):
+    """Продукты элементов сети одним запросом: {id элемента: [продукт, ...]}."""
+    products = defaultdict(list)
+    rows = (
+        Product.objects.filter(network_element_id__in=network_element_ids)
+        .order_by("id")
+        .values("network_element_id", *(column for _, column in PRODUCT_READ_FIELDS))
+    )
+    for row in rows:
+        products[row["network_element_id"]].append(
+            _read_row(row, PRODUCT_READ_FIELDS, PRODUCT_CONVERTED)
+        )
+    return products
+
+
+def network_element_representations(
+    rows, fields=None, expand=NETWORK_ELEMENT_EXPANDABLE
+):
+    """
+    Тот же JSON, что у NetworkElementSerializer, из строк
+    NetworkElementQuerySet.representation_values() без полей DRF.
+    fields — ключи ответа (None — все), expand — разворачиваемые вложенные
+    объекты: неразвёрнутый поставщик отдаётся своим id, продукты — опускаются.
+    """
+    levels = dict(NetworkElement.LEVELS)
+    columns = [
+        (key, column)
+        for key, column in NETWORK_ELEMENT_READ_FIELDS
+        if fields is None or key in fields
+    ]
+    with_supplier = fields is None or "поставщик" in fields
+    expand_supplier = "поставщик" in expand
+    with_products = "продукты" in expand and (fields is None or "продукты" in fields)
+    products = (
+        product_representations([row["id"] for row in rows]) if with_products else {}
+    )
+    result = []
+    for row in rows:
+        representation = _read_row(row, columns, NETWORK_ELEMENT_CONVERTED)
+        if with_supplier:
+            representation["поставщик"] = (
+                {
+                    "id": row["supplier_id"],
+                    "название": row["supplier__name"],
+                    "уровень_сети": levels[row["supplier__level"]],
+                }
+                if expand_supplier and row["supplier_id"] is not None
+                else row["supplier_id"]
+            )
+        if with_products:
+            representation["продукты"] = products.get(row["id"], [])
+        result.append(representation)
+    return result
+
+
+class NetworkElementReadListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        return network_element_representations(
+            list(data), **NetworkElementReadSerializer.representation(self.context)
+        )
+
+
+class NetworkElementReadSerializer(NetworkElementSerializer):
+    """
+    Только чтение: принимает строки representation_values() вместо моделей.
+    Поля объявлены родителем и используются только схемой OpenAPI. Выбор
+    полей (fields, expand) передаётся в контексте, см. NetworkElementFieldsQuerySerializer.
+    """
+
+    class Meta(NetworkElementSerializer.Meta):
+        list_serializer_class = NetworkElementReadListSerializer
+
+    def to_representation(self, instance):
+        return network_element_representations(
+            [instance], **self.representation(self.context)
+        )[0]
+
+    @staticmethod
+    def representation(context):
+        return {
+            "fields": context.get("fields"),
+            "expand": context.get("expand", NETWORK_ELEMENT_EXPANDABLE),
+        }
+
+    @staticmethod
+    def columns(fields=None, expand=NETWORK_ELEMENT_EXPANDABLE):
+        """
+        Колонки representation_values() для выбранных полей. id и created_at
+        нужны всегда: по ним догружаются продукты и строится курсор страницы.
+        """
+        if fields is None and "поставщик" in expand:
+            return None
+        columns = ["id", "created_at"]
+        columns += [
+            column
+            for key, column in NETWORK_ELEMENT_READ_FIELDS
+            if (fields is None or key in fields) and column not in columns
+        ]
+        if fields is None or "поставщик" in fields:
+            columns.append("supplier_id")
+            if "поставщик" in expand:
+                columns += ["supplier__name", "supplier__level"]
+        return columns
+
+
+class NetworkElementFieldsQuerySerializer(serializers.Serializer):
+    """Выбор полей ответа элементов сети: ?fields=id,название&expand=поставщик."""
+
+    fields = serializers.CharField(
+        required=False,
+        label="Поля ответа через запятую (по умолчанию все)",
+    )
+    expand = serializers.CharField(
+        required=False,
+        allow_blank=True,
+        label=(
+            "Разворачиваемые вложенные объекты через запятую: поставщик, "
+            "продукты (по умолчанию оба, пусто — ни одного)"
+        ),
+    )
+
+    @staticmethod
+    def _split(value, allowed, name):
+        keys = {key.strip() for key in value.split(",") if key.strip()}
+        unknown = keys - set(allowed)
+        if unknown:
+            raise serializers.ValidationError(
+                f"Неизвестные {name}: {', '.join(sorted(unknown))}. "
+                f"Допустимые: {', '.join(allowed)}."
+            )
+        return frozenset(keys)
+
+    def validate_fields(self, value):
+        return self._split(value, NetworkElementSerializer.Meta.fields, "поля")
+
+    def validate_expand(self, value):
+        return self._split(value, NETWORK_ELEMENT_EXPANDABLE, "объекты")
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    """Параметры поиска."""
+
+    q = serializers.CharField(
+        min_length=2,
+        max_length=200,
+        label='Запрос: слова, "фраза", -исключение; опечатки допускаются',
+    )
+    limit = serializers.IntegerField(
+        default=20,
+        min_value=1,
+        max_value=settings.SEARCH_MAX_RESULTS,
+        label="Число результатов",
+    )
+
+
+class SupplyTreeQuerySerializer(serializers.Serializer):
+    """Параметры запроса дерева поставок."""
+
+    root = serializers.IntegerField(
+        required=False, label="ID корневого элемента (по умолчанию все заводы)"
+    )
+    depth = serializers.IntegerField(
+        required=False, min_value=0, label="Максимальная глубина"
+    )
+
+
+class DebtReportQuerySerializer(serializers.Serializer):
+    """Параметры отчёта по задолженности."""
+
+    # группировка -> (поле агрегата, ключ в ответе)
+    GROUPINGS = {
+        "factory": ("factory_id", "завод"),
+        "country": ("country", "страна"),
+        "level": ("level", "уровень_сети"),
+    }
+
+    group_by = serializers.ChoiceField(
+        choices=list(GROUPINGS), default="factory", label="Группировка"
+    )
+
+
+class ChangeSerializer(serializers.ModelSerializer):
+    курсор = serializers.CharField(source="cursor", label="Курсор записи")
+    модель = serializers.CharField(source="model", label="Модель")
+    id = serializers.IntegerField(source="object_id", label="ID объекта")
+    действие = serializers.CharField(source="action", label="Действие")
+    дата = serializers.DateTimeField(source="changed_at", label="Время изменения")
+
+    class Meta:
+        model = Change
+        fields = ["курсор", "модель", "id", "действие", "дата"]
+
+
+class ChangesQuerySerializer(serializers.Serializer):
+    """Параметры ленты изменений."""
+
+    since = serializers.RegexField(
+        r"^\d+-\d+$",
+        required=False,
+        label="Курсор последнего полученного изменения; без него — с начала",
+    )
+    limit = serializers.IntegerField(
+        default=settings.API_PAGE_SIZE,
+        min_value=1,
+        max_value=settings.API_MAX_PAGE_SIZE,
+        label="Число изменений",
+    )
+
+    def validate_since(self, value):
+        transaction_id, pk = value.split("-")
+        return int(transaction_id), int(pk)
@@ -0,0 +1,103 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .cache import invalidate_network_elements, invalidate_products
+from .models import Change, NetworkElement, Product
+
+
+@receiver(pre_delete, sender=NetworkElement)
+def remember_clients(sender, instance, **kwargs):
+    """Запоминаем клиентов до того, как их поставщик будет обнулён."""
+    instance._client_ids = list(instance.clients.values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=NetworkElement)
+def detach_clients_subtree(sender, instance, **kwargs):
+    """
+    Клиенты удалённого звена становятся корнями: у всего их поддерева
+    отрезается префикс пути до удалённого звена.
+    """
+    client = (
+        NetworkElement.objects.filter(id__in=getattr(instance, "_client_ids", []))
+        .values("id", "path")
+        .first()
+    )
+    if client:
+        prefix = client["path"][: -len(f"{client['id']}/")]
+        NetworkElement.objects.move_subtree(prefix, "/")
+
+
+# Кэш сбрасывается после фиксации транзакции: иначе параллельный запрос
+# успеет закэшировать ещё не зафиксированные (или откаченные) данные под
+# новой версией ключа. Аргументы вычисляются сразу — после удаления pk
+# экземпляра обнуляется.
+
+
+@receiver(post_save, sender=NetworkElement)
+def invalidate_saved_network_element(sender, instance, **kwargs):
+    transaction.on_commit(partial(invalidate_network_elements, [instance.pk]))
+
+
+@receiver(post_delete, sender=NetworkElement)
+def invalidate_deleted_network_element(sender, instance, **kwargs):
+    client_ids = getattr(instance, "_client_ids", [])
+    # У клиентов обнулён поставщик — их представление изменилось
+    NetworkElement.objects.filter(pk__in=client_ids).bump_version()
+    transaction.on_commit(
+        partial(invalidate_network_elements, [instance.pk], client_ids=client_ids)
+    )
+
+
+@receiver(pre_save, sender=Product)
+def remember_product_network_element(sender, instance, **kwargs):
+    """Запоминаем прежний элемент сети: продукт могли перенести к другому."""
+    instance._previous_network_element_id = (
+        Product.objects.filter(pk=instance.pk)
+        .values_list("network_element_id", flat=True)
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+def _product_changed(instance, action):
+    """
+    Продукты вложены в элемент сети: версия элемента растёт, кэш
+    сбрасывается. Продукт и его элемент сети попадают в журнал изменений
+    тем же запросом, что и обновление версии.
+    """
+    network_element_ids = [instance.network_element_id]
+    previous_id = getattr(instance, "_previous_network_element_id", None)
+    if previous_id:
+        network_element_ids.append(previous_id)
+    NetworkElement.objects.filter(pk__in=network_element_ids).bump_version(
+        log=[(Product, instance.pk, action)]
+    )
+    transaction.on_commit(
+        partial(invalidate_products, [instance.pk], network_element_ids)
+    )
+
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, created, **kwargs):
+    _product_changed(instance, Change.CREATE if created else Change.UPDATE)
+
+
+@receiver(post_delete, sender=Product)
+def product_deleted(sender, instance, **kwargs):
+    _product_changed(instance, Change.DELETE)
+
+
+@receiver(post_save, sender=NetworkElement)
+def log_saved_network_element(sender, instance, created, **kwargs):
+    Change.objects.log(
+        sender, [instance.pk], Change.CREATE if created else Change.UPDATE
+    )
+
+
+@receiver(post_delete, sender=NetworkElement)
+def log_deleted_network_element(sender, instance, **kwargs):
+    Change.objects.log(sender, [instance.pk], Change.DELETE)
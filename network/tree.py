@@ -0,0 +1,51 @@
+from django.db import connection
+
+from .models import NetworkElement
+
+TREE_SQL = """
+WITH RECURSIVE tree AS (
+    SELECT id, supplier_id, name, level, 0 AS depth
+    FROM {table}
+    WHERE {root_condition}
+  UNION ALL
+    SELECT child.id, child.supplier_id, child.name, child.level, tree.depth + 1
+    FROM {table} AS child
+    JOIN tree ON child.supplier_id = tree.id
+    WHERE %(max_depth)s::integer IS NULL OR tree.depth < %(max_depth)s::integer
+)
+SELECT id, supplier_id, name, level, depth FROM tree ORDER BY depth, id
+"""
+
+
+def build_supply_tree(root_id=None, max_depth=None):
+    """
+    Дерево поставок одним рекурсивным запросом (WITH RECURSIVE).
+    Без root_id строится лес от всех заводов-корней; max_depth ограничивает
+    глубину (0 — только корни). Вложенный JSON собирается за O(n).
+    """
+    if root_id is None:
+        root_condition = "supplier_id IS NULL"
+    else:
+        root_condition = "id = %(root_id)s"
+    sql = TREE_SQL.format(
+        table=connection.ops.quote_name(NetworkElement._meta.db_table),
+        root_condition=root_condition,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {"root_id": root_id, "max_depth": max_depth})
+        rows = cursor.fetchall()
+
+    nodes, roots = {}, []
+    for element_id, supplier_id, name, level, depth in rows:
+        node = {
+            "id": element_id,
+            "название": name,
+            "уровень_сети": level,
+            "клиенты": [],
+        }
+        nodes[element_id] = node
+        if depth == 0:
+            roots.append(node)
+        else:
+            nodes[supplier_id]["клиенты"].append(node)
+    return roots
@@ -1,13 +1,20 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import NetworkElementViewSet, ProductViewSet
+from .async_views import NetworkElementAsyncView, ProductAsyncView
+from .views import ChangeViewSet, NetworkElementViewSet, ProductViewSet
 
 router = DefaultRouter()
 router.register("network", NetworkElementViewSet)
 router.register("product", ProductViewSet)
+router.register("changes", ChangeViewSet)
 
 # Добавляем маршруты роутера
 urlpatterns = [
     path("", include(router.urls)),  # Включаем маршруты DefaultRouter
+    # Асинхронные list/retrieve для ASGI-воркеров
+    path("async/network/", NetworkElementAsyncView.as_view()),
+    path("async/network/<int:pk>/", NetworkElementAsyncView.as_view()),
+    path("async/product/", ProductAsyncView.as_view()),
+    path("async/product/<int:pk>/", ProductAsyncView.as_view()),
 ]
@@ -1,32 +1,78 @@
+from django.conf import settings
+from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from drf_spectacular.utils import OpenApiParameter, extend_schema
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 from rest_framework import status
+from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.viewsets import ModelViewSet
-from .models import NetworkElement, Product
-from .permissions import (IsAdminOnlyForDelete, IsAdminOrReadOnly,
-                          IsManagerOrAdmin)
-from .serializers import NetworkElementSerializer, ProductSerializer
+from rest_framework.viewsets import GenericViewSet, ModelViewSet
 
+from users.permissions import RolePermission
 
-class NetworkElementViewSet(ModelViewSet):
+from .cache import (
+    NETWORK_LIST_KEY,
+    PRODUCT_LIST_KEY,
+    CachedResponseMixin,
+    network_element_key,
+    product_key,
+)
+from .conditional import ConditionalGetMixin
+from .exports import (
+    NETWORK_ELEMENT_EXPORT_FIELDS,
+    PRODUCT_EXPORT_FIELDS,
+    export_response,
+)
+from .filters import NetworkElementFilter, ProductFilter
+from .models import Change, NetworkElement, Product
+from .pagination import NetworkElementPagination, ProductPagination
+from .replicas import ReplicaReadMixin
+from .serializers import (
+    ChangeSerializer,
+    ChangesQuerySerializer,
+    DebtReportQuerySerializer,
+    NetworkElementBulkItemSerializer,
+    NetworkElementFieldsQuerySerializer,
+    NetworkElementReadSerializer,
+    NetworkElementSerializer,
+    ProductSerializer,
+    SearchQuerySerializer,
+    SupplyTreeQuerySerializer,
+)
+from .tree import build_supply_tree
+
+EXPORT_FORMAT_PARAMETER = OpenApiParameter(
+    name="export_format",
+    description="Формат выгрузки: ndjson (по умолчанию) или csv",
+    required=False,
+    type=str,
+)
+
+
+def _debt_total(totals, representation):
+    representation["задолженность"] = f"{totals['total']:.2f}"
+    representation["элементов"] = totals["elements"]
+    return representation
+
+
+@extend_schema_view(
+    list=extend_schema(parameters=[NetworkElementFieldsQuerySerializer]),
+    retrieve=extend_schema(parameters=[NetworkElementFieldsQuerySerializer]),
+)
+class NetworkElementViewSet(
+    ReplicaReadMixin, ConditionalGetMixin, CachedResponseMixin, ModelViewSet
+):
     queryset = NetworkElement.objects.all()
     serializer_class = NetworkElementSerializer
+    pagination_class = NetworkElementPagination
+    # Список элементов вкладывает продукты, поэтому зависит от обеих версий
+    list_version_keys = (NETWORK_LIST_KEY, PRODUCT_LIST_KEY)
+    object_version_key = staticmethod(network_element_key)
+    read_actions = ("list", "retrieve", "descendants", "ancestors", "search")
+    # Администратор — всё, менеджер — чтение и изменение, сотрудник — чтение
+    permission_classes = [RolePermission]
 
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ["country"]  # Фильтрация по стране
-
-    def create(self, request, *args, **kwargs):
-        """Создание элемента сети с отладочными выводами."""
-        print(f"DEBUG: Raw Request data: {request.data}")  # Отладка
-        return super().create(request, *args, **kwargs)
-
-    def get_permissions(self):
-        if self.action in ["destroy"]:
-            return [IsAdminOnlyForDelete()]  # Только администраторы могут удалять
-        if self.action in ["create", "update", "partial_update"]:
-            return [IsManagerOrAdmin()]  # Менеджеры и администраторы могут изменять
-        return [IsAdminOrReadOnly()]  # Только чтение для сотрудников
+    filterset_class = NetworkElementFilter
 
     @extend_schema(
         description="Обновление элемента сети. Поле 'debt' недоступно для изменения.",
@@ -48,13 +94,41 @@ class NetworkElementViewSet(ModelViewSet):
             )
         return super().update(request, *args, **kwargs)
 
+    def get_serializer_class(self):
+        if self.action in self.read_actions:
+            return NetworkElementReadSerializer
+        return super().get_serializer_class()
+
+    def get_representation(self):
+        """Выбранные клиентом поля и вложенные объекты (?fields=, ?expand=)."""
+        if not hasattr(self, "_representation"):
+            params = NetworkElementFieldsQuerySerializer(data=self.request.query_params)
+            params.is_valid(raise_exception=True)
+            self._representation = params.validated_data
+        return self._representation
+
+    def read_values(self, queryset):
+        # Только колонки выбранных полей: без поставщика нет JOIN-а,
+        # без продуктов — запроса продуктов в сериализаторе
+        return queryset.representation_values(
+            NetworkElementReadSerializer.columns(**self.get_representation())
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action in self.read_actions and self.request is not None:
+            context.update(self.get_representation())
+        return context
+
     def get_queryset(self):
         queryset = super().get_queryset()
-        country = self.request.query_params.get("country")
-        if country:
-            queryset = queryset.filter(country=country).exclude(
-                level=2
-            )  # Исключаем сотрудников
+        if self.action in ["list", "retrieve"]:
+            # Чтение строками .values(): поставщик JOIN-ом, продукты одним
+            # запросом на страницу в NetworkElementReadSerializer
+            queryset = self.read_values(queryset)
+        elif self.action in ["update", "partial_update"]:
+            # Поставщик и продукты загружаются пакетно, без N+1 запросов
+            queryset = queryset.for_representation()
         return queryset
 
     def partial_update(self, request, *args, **kwargs):
@@ -65,14 +139,213 @@ class NetworkElementViewSet(ModelViewSet):
         self.perform_update(serializer)
         return Response(serializer.data)
 
+    @extend_schema(
+        description="Потоковая выгрузка элементов сети в NDJSON или CSV.",
+        parameters=[EXPORT_FORMAT_PARAMETER],
+    )
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        return export_response(
+            request, queryset, NETWORK_ELEMENT_EXPORT_FIELDS, "network"
+        )
+
+    @extend_schema(
+        description=(
+            "Пакетное создание/обновление элементов сети (upsert по паре "
+            "название + уровень). Весь пакет проверяется и записывается "
+            "в одной транзакции."
+        ),
+        request=NetworkElementBulkItemSerializer(many=True),
+    )
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        serializer = NetworkElementBulkItemSerializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=settings.BULK_UPSERT_MAX_ITEMS,
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.summary, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        description="Все звенья ниже по цепочке поставок (клиенты, их клиенты и т. д.).",
+        parameters=[NetworkElementFieldsQuerySerializer],
+    )
+    @action(detail=True, methods=["get"])
+    def descendants(self, request, pk=None):
+        element = self.get_object()
+        queryset = self.read_values(NetworkElement.objects.descendants_of(element))
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @extend_schema(
+        description="Цепочка поставщиков элемента: от завода до непосредственного поставщика.",
+        parameters=[NetworkElementFieldsQuerySerializer],
+    )
+    @action(detail=True, methods=["get"])
+    def ancestors(self, request, pk=None):
+        element = self.get_object()
+        queryset = self.read_values(NetworkElement.objects.ancestors_of(element))
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    @extend_schema(
+        description=(
+            "Полнотекстовый (русская морфология) и нечёткий поиск по названию, "
+            "городу и стране: лучшие совпадения первыми."
+        ),
+        parameters=[SearchQuerySerializer, NetworkElementFieldsQuerySerializer],
+    )
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        params = SearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        queryset = self.filter_queryset(self.get_queryset()).search(
+            params.validated_data["q"]
+        )
+        rows = self.read_values(queryset)[: params.validated_data["limit"]]
+        return Response(self.get_serializer(rows, many=True).data)
 
-class ProductViewSet(ModelViewSet):
+    @extend_schema(
+        description=(
+            "Иерархия поставок (завод → розничная сеть → ИП) одним запросом. "
+            "Можно задать корневой элемент и ограничить глубину."
+        ),
+        parameters=[SupplyTreeQuerySerializer],
+    )
+    @action(detail=False, methods=["get"])
+    def tree(self, request):
+        params = SupplyTreeQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        root_id = params.validated_data.get("root")
+        if root_id is not None:
+            get_object_or_404(NetworkElement, pk=root_id)
+        return Response(build_supply_tree(root_id, params.validated_data.get("depth")))
+
+    @extend_schema(
+        description=(
+            "Суммарная задолженность по заводам (всему поддереву завода), "
+            "странам или уровням сети — одним сгруппированным запросом. "
+            "Звенья без завода в цепочке (их поставщик удалён) собраны в "
+            "строку с заводом null."
+        ),
+        parameters=[DebtReportQuerySerializer],
+    )
+    @action(detail=False, methods=["get"], url_path="debt")
+    def debt_report(self, request):
+        params = DebtReportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        field, key = DebtReportQuerySerializer.GROUPINGS[
+            params.validated_data["group_by"]
+        ]
+        rows = list(self.filter_queryset(self.get_queryset()).debt_totals(field))
+
+        if field == "factory_id":
+            # Корень поддерева уровня 1 или 2 — звено, чей поставщик удалён:
+            # это не завод, такие поддеревья отчёт сводит в одну строку
+            factories = dict(
+                NetworkElement.objects.filter(
+                    pk__in=[row[field] for row in rows], level=0
+                ).values_list("id", "name")
+            )
+            report, orphaned = [], {field: None, "total": 0, "elements": 0}
+            for row in rows:
+                if row[field] in factories:
+                    row[field] = {"id": row[field], "название": factories[row[field]]}
+                    report.append(row)
+                else:
+                    orphaned["total"] += row["total"]
+                    orphaned["elements"] += row["elements"]
+            rows = report + [orphaned] if orphaned["elements"] else report
+        return Response([_debt_total(row, {key: row[field]}) for row in rows])
+
+    @extend_schema(
+        description="Задолженность элемента вместе со всеми звеньями ниже него."
+    )
+    @action(detail=True, methods=["get"], url_path="debt")
+    def subtree_debt(self, request, pk=None):
+        element = self.get_object()
+        totals = NetworkElement.objects.subtree_debt(element)
+        return Response(_debt_total(totals, {"id": element.id}))
+
+
+class ProductViewSet(ReplicaReadMixin, CachedResponseMixin, ModelViewSet):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
+    pagination_class = ProductPagination
+    list_version_keys = (PRODUCT_LIST_KEY,)
+    object_version_key = staticmethod(product_key)
+    permission_classes = [RolePermission]
+
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = ProductFilter
+
+    @extend_schema(
+        description="Потоковая выгрузка продуктов в NDJSON или CSV.",
+        parameters=[EXPORT_FORMAT_PARAMETER],
+    )
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        return export_response(request, queryset, PRODUCT_EXPORT_FIELDS, "products")
 
-    def get_permissions(self):
-        if self.action in ["destroy"]:
-            return [IsAdminOnlyForDelete()]  # Только администраторы могут удалять
-        if self.action in ["create", "update", "partial_update"]:
-            return [IsManagerOrAdmin()]  # Менеджеры и администраторы могут изменять
-        return [IsAdminOrReadOnly()]  # Только чтение для сотрудников
+    @extend_schema(
+        description=(
+            "Полнотекстовый (русская морфология) и нечёткий поиск по названию, "
+            "модели и стране производителя: лучшие совпадения первыми."
+        ),
+        parameters=[SearchQuerySerializer],
+    )
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        params = SearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        queryset = self.filter_queryset(self.get_queryset()).search(
+            params.validated_data["q"]
+        )
+        serializer = self.get_serializer(
+            queryset[: params.validated_data["limit"]], many=True
+        )
+        return Response(serializer.data)
+
+
+class ChangeViewSet(ReplicaReadMixin, GenericViewSet):
+    """
+    Лента изменений для инкрементальной синхронизации: клиент передаёт
+    курсор последнего полученного изменения и получает только новые —
+    объём ответа зависит от числа изменений, а не от размера данных.
+    """
+
+    queryset = Change.objects.all()
+    serializer_class = ChangeSerializer
+    permission_classes = [RolePermission]
+    pagination_class = None
+
+    @extend_schema(
+        description=(
+            "Изменения элементов сети и продуктов после курсора `since` "
+            "в порядке курсора. Курсор следующего запроса — в поле `курсор`."
+        ),
+        parameters=[ChangesQuerySerializer],
+    )
+    def list(self, request):
+        params = ChangesQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        since, limit = (
+            params.validated_data.get("since"),
+            params.validated_data["limit"],
+        )
+        changes = list(self.get_queryset().after(since)[: limit + 1])
+        page = changes[:limit]
+        cursor = page[-1].cursor if page else request.query_params.get("since")
+        return Response(
+            {
+                "изменения": self.get_serializer(page, many=True).data,
+                "курсор": cursor,
+                "есть_ещё": len(changes) > limit,
+            }
+        )
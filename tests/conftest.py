@@ -1,8 +1,31 @@
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 
 from network.models import NetworkElement, Product
+from users.cache import clear_local
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Кэш ответов API и пользователей не должен переживать тест."""
+    cache.clear()
+    clear_local()
+    yield
+    cache.clear()
+    clear_local()
+
+
+@pytest.fixture(autouse=True)
+def primary_reads(settings):
+    """
+    Данные теста не закоммичены и видны только основному соединению,
+    поэтому реплика включается лишь в тестах, которые её проверяют.
+    """
+    settings.DB_REPLICA_READS = False
 
 
 @pytest.fixture
@@ -80,3 +103,36 @@ def get_token(api_client, create_user):
     )
     assert response.status_code == 200, f"Ошибка получения токена: {response.data}"
     return response.data["access"]
+
+
+@pytest.fixture
+def assert_constant_queries(django_capture_on_commit_callbacks):
+    """
+    Фикстура-помощник: проверяет, что число SQL-запросов запроса к API
+    не растёт вместе с объёмом данных.
+    """
+
+    def check(make_request, grow_data):
+        with CaptureQueriesContext(connection) as before:
+            make_request()
+        # Кэш сбрасывается после фиксации — выполняем отложенные сбросы
+        with django_capture_on_commit_callbacks(execute=True):
+            grow_data()
+        with CaptureQueriesContext(connection) as after:
+            make_request()
+        assert len(after) == len(before), (
+            f"Число запросов выросло с {len(before)} до {len(after)}:\n"
+            + "\n".join(query["sql"] for query in after.captured_queries)
+        )
+        return len(after)
+
+    return check
+
+
+@pytest.fixture
+def response_cache(settings):
+    """
+    Включает кэш ответов API. Без Redis он по умолчанию выключен, а в
+    тестах память процесса одна на всех — как общий кэш.
+    """
+    settings.API_CACHE_TIMEOUT = 300
@@ -0,0 +1,108 @@
+import gzip
+import json
+
+import brotli
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from config.middleware import choose_encoding
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0, gzip;q=0.5", "gzip"),
+        ("*", "br"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header) == expected
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "encoding, decompress", [("br", brotli.decompress), ("gzip", gzip.decompress)]
+)
+def test_api_response_compressed(
+    api_client, manager_user, setup_data, settings, encoding, decompress
+):
+    settings.COMPRESSION_MIN_SIZE = 200
+    api_client.force_authenticate(user=manager_user)
+    plain = api_client.get("/api/network/network/")
+    assert "Content-Encoding" not in plain
+    assert "Accept-Encoding" in plain["Vary"]
+
+    response = api_client.get("/api/network/network/", HTTP_ACCEPT_ENCODING=encoding)
+    assert response["Content-Encoding"] == encoding
+    assert decompress(response.content) == plain.content
+    assert int(response["Content-Length"]) == len(response.content)
+    assert response["ETag"] == f"W/{plain['ETag']}"
+    # Клиент возвращает слабый ETag — ответ не изменился
+    response = api_client.get(
+        "/api/network/network/",
+        HTTP_ACCEPT_ENCODING=encoding,
+        HTTP_IF_NONE_MATCH=response["ETag"],
+    )
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db
+def test_small_response_not_compressed(api_client, manager_user, setup_data, settings):
+    settings.COMPRESSION_MIN_SIZE = 100_000
+    api_client.force_authenticate(user=manager_user)
+    response = api_client.get("/api/network/network/", HTTP_ACCEPT_ENCODING="br")
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response
+
+
+@pytest.mark.django_db
+def test_html_not_compressed(admin_client, settings):
+    """HTML с CSRF-токеном не сжимается (BREACH)."""
+    settings.COMPRESSION_MIN_SIZE = 0
+    response = admin_client.get("/admin/", HTTP_ACCEPT_ENCODING="gzip")
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/html")
+    assert "Content-Encoding" not in response
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("export_format", ["ndjson", "csv"])
+def test_streaming_export_compressed_formats(
+    api_client, manager_user, setup_data, export_format
+):
+    api_client.force_authenticate(user=manager_user)
+    response = api_client.get(
+        "/api/network/network/export/",
+        {"export_format": export_format},
+        HTTP_ACCEPT_ENCODING="br",
+    )
+    assert response["Content-Encoding"] == "br"
+
+
+@pytest.mark.django_db
+def test_streaming_export_compressed(api_client, manager_user, setup_data):
+    api_client.force_authenticate(user=manager_user)
+    response = api_client.get(
+        "/api/network/product/export/", HTTP_ACCEPT_ENCODING="gzip"
+    )
+    assert response["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response
+    rows = gzip.decompress(b"".join(response.streaming_content)).splitlines()
+    assert json.loads(rows[0])["название"] == setup_data["product"].name
+
+
+@pytest.mark.django_db
+def test_async_view_compressed(get_token, setup_data, settings):
+    settings.COMPRESSION_MIN_SIZE = 200
+    response = async_to_sync(AsyncClient().get)(
+        "/api/network/async/network/",
+        headers={"Authorization": f"Bearer {get_token}", "Accept-Encoding": "br"},
+    )
+    assert response.status_code == 200
+    assert response["Content-Encoding"] == "br"
+    assert json.loads(brotli.decompress(response.content))["results"]
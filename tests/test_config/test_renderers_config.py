@@ -0,0 +1,85 @@
+import datetime
+import decimal
+import io
+import uuid
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from config.parsers import ORJSONParser
+from config.renderers import ORJSONRenderer
+
+# Значения, которые встречаются в ответах API или проходят через кодировщик DRF
+PAYLOADS = [
+    {"название": "Завод «Электрон»", "задолженность": "10000.50", "уровень": 0},
+    {"цена": decimal.Decimal("50000.10"), "продукты": [], "поставщик": None},
+    {
+        "создано": datetime.datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.UTC),
+        "местное": timezone.localtime(
+            datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.UTC)
+        ),
+        "дата_выхода": datetime.date(2024, 1, 1),
+        "время": datetime.time(12, 30, 15, 500000),
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    },
+    {"detail": _("Not found."), 1: "ключ-число", "строка": "a\u2028b\u2029c"},
+    {"большое": 2**70, "дробь": 0.1},
+    [1, "два", True, None],
+]
+
+
+@pytest.mark.parametrize("data", PAYLOADS)
+def test_orjson_renderer_matches_json_renderer(data):
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_orjson_renderer_indent_and_empty():
+    data = {"название": "Сеть"}
+    assert ORJSONRenderer().render(
+        data, "application/json; indent=4"
+    ) == JSONRenderer().render(data, "application/json; indent=4")
+    assert ORJSONRenderer().render(None) == b""
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        '{"название": "Сеть", "цена": 10.5, "теги": [1, 2]}',
+        '{"большое": 1180591620717411303424}',
+    ],
+)
+def test_orjson_parser_matches_json_parser(body):
+    assert ORJSONParser().parse(io.BytesIO(body.encode())) == JSONParser().parse(
+        io.BytesIO(body.encode())
+    )
+
+
+@pytest.mark.parametrize("body", [b'{"name": ', b'{"value": NaN}'])
+def test_orjson_parser_errors_match_json_parser(body):
+    with pytest.raises(ParseError) as expected:
+        JSONParser().parse(io.BytesIO(body))
+    with pytest.raises(ParseError) as actual:
+        ORJSONParser().parse(io.BytesIO(body))
+    assert str(actual.value) == str(expected.value)
+
+
+@pytest.mark.django_db
+def test_api_uses_orjson(api_client, get_token, setup_data):
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_token}")
+    response = api_client.get("/api/network/network/")
+    assert isinstance(response.accepted_renderer, ORJSONRenderer)
+    assert response.content == JSONRenderer().render(response.data)
+
+    response = api_client.post(
+        "/api/network/product/",
+        data='{"название": "Продукт", "модель": "X-1", "дата_выхода": "2024-01-01", '
+        '"цена": "10.00", "страна_производителя": "Китай", '
+        f'"звено_сети": {setup_data["factory"].id}}}',
+        content_type="application/json",
+    )
+    assert response.status_code == 201, response.content
+    assert response.json()["название"] == "Продукт"
@@ -0,0 +1,54 @@
+import io
+
+import pytest
+from django.core.management import CommandError, call_command
+
+
+@pytest.mark.django_db(transaction=True)
+def test_load_test_reports_throughput(live_server, create_user, setup_data):
+    create_user(username="load", password="load-password", role="employee")
+    out = io.StringIO()
+    call_command(
+        "load_test",
+        url=live_server.url,
+        paths=["/api/network/network/"],
+        username="load",
+        password="load-password",
+        concurrency=2,
+        duration=0.5,
+        stdout=out,
+    )
+    output = out.getvalue()
+    assert "ошибок: 0" in output
+    assert "RPS:" in output and "p99=" in output
+
+
+@pytest.mark.django_db(transaction=True)
+def test_load_test_slow_clients(live_server, create_user, setup_data):
+    create_user(username="load", password="load-password", role="employee")
+    out = io.StringIO()
+    call_command(
+        "load_test",
+        url=live_server.url,
+        paths=["/api/network/async/network/"],
+        username="load",
+        password="load-password",
+        concurrency=1,
+        slow_clients=1,
+        slow_seconds=0.2,
+        duration=0.5,
+        stdout=out,
+    )
+    assert "ошибок: 0" in out.getvalue()
+
+
+def test_load_test_unreachable_server():
+    with pytest.raises(CommandError):
+        call_command(
+            "load_test",
+            url="http://127.0.0.1:9",
+            username="load",
+            password="load-password",
+            duration=0.1,
+            stdout=io.StringIO(),
+        )
@@ -0,0 +1,84 @@
+import pytest
+
+
+def _sample(body, name, **labels):
+    """Значение метрики с заданными подписями из текстового вывода /metrics."""
+    for line in body.splitlines():
+        if line.startswith(f"{name}{{") and all(
+            f'{key}="{value}"' in line for key, value in labels.items()
+        ):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+@pytest.fixture(autouse=True)
+def internal_ip(settings):
+    """Тестовый клиент обращается с 127.0.0.1 — считаем его внутренним."""
+    settings.INTERNAL_IPS = ["127.0.0.1"]
+
+
+@pytest.mark.django_db
+def test_metrics_request_latency_and_queries(
+    api_client, get_token, setup_data, response_cache
+):
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_token}")
+    before = api_client.get("/metrics").content.decode()
+    api_client.get("/api/network/network/")
+    api_client.get("/api/network/network/")
+    body = api_client.get("/metrics").content.decode()
+
+    labels = {"view": "NetworkElementViewSet", "action": "list"}
+    for name, extra in (
+        ("http_request_duration_seconds_count", {"method": "GET", "status": "2xx"}),
+        ("http_request_db_queries_count", {}),
+    ):
+        assert (
+            _sample(body, name, **labels, **extra)
+            - _sample(before, name, **labels, **extra)
+            == 2
+        )
+    hits = {"basename": "networkelement", "result": "hit"}
+    misses = {"basename": "networkelement", "result": "miss"}
+    assert (
+        _sample(body, "api_response_cache_requests_total", **hits)
+        - _sample(before, "api_response_cache_requests_total", **hits)
+        == 1
+    )
+    assert (
+        _sample(body, "api_response_cache_requests_total", **misses)
+        - _sample(before, "api_response_cache_requests_total", **misses)
+        == 1
+    )
+    assert _sample(
+        body, "jwt_authentication_duration_seconds_count", result="success"
+    ) > _sample(before, "jwt_authentication_duration_seconds_count", result="success")
+
+
+@pytest.mark.django_db
+def test_metrics_network_levels(api_client, setup_data):
+    body = api_client.get("/metrics").content.decode()
+    assert _sample(body, "network_elements", level="0") == 1
+    assert _sample(body, "network_elements", level="1") == 1
+    assert _sample(body, "network_elements", level="2") == 0
+
+
+@pytest.mark.django_db
+def test_metrics_token(api_client, settings):
+    settings.METRICS_TOKEN = "secret"
+    assert api_client.get("/metrics").status_code == 401
+    response = api_client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain")
+
+
+@pytest.mark.django_db
+def test_metrics_denied_by_default(api_client, settings):
+    """Без токена метрики закрыты для внешних адресов, кроме режима DEBUG."""
+    settings.INTERNAL_IPS = []
+    assert api_client.get("/metrics").status_code == 403
+    assert api_client.get("/metrics", REMOTE_ADDR="10.0.0.5").status_code == 403
+    settings.INTERNAL_IPS = ["10.0.0.5"]
+    assert api_client.get("/metrics", REMOTE_ADDR="10.0.0.5").status_code == 200
+    settings.INTERNAL_IPS = []
+    settings.DEBUG = True
+    assert api_client.get("/metrics").status_code == 200
@@ -0,0 +1,56 @@
+import logging
+
+import pytest
+
+from monitoring.middleware import fingerprint
+
+
+def test_fingerprint_collapses_in_lists():
+    """Запросы с IN-списками разной длины дают один отпечаток."""
+    assert fingerprint('SELECT 1 WHERE "id" IN (%s, %s, %s)') == fingerprint(
+        'SELECT 1 WHERE "id" IN (%s)'
+    )
+
+
+@pytest.mark.django_db
+def test_server_timing_header(api_client, get_token, setup_data, settings):
+    """Ответ содержит время обработки, время БД и число SQL-запросов."""
+    settings.SERVER_TIMING_HEADER = True
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_token}")
+    response = api_client.get("/api/network/")
+    assert response.status_code == 200
+    timing = response["Server-Timing"]
+    assert timing.startswith("total;dur=")
+    assert "db;dur=" in timing
+    assert 'queries"' in timing
+    assert 'dup;desc="0 duplicated"' in timing
+
+
+@pytest.mark.django_db
+def test_server_timing_header_disabled(api_client, settings):
+    settings.SERVER_TIMING_HEADER = False
+    response = api_client.get("/api/network/")
+    assert "Server-Timing" not in response
+
+
+@pytest.mark.django_db
+def test_slow_request_logged(api_client, get_token, setup_data, settings, caplog):
+    """Запрос выше порога пишется в лог вместе с самыми дорогими SQL."""
+    settings.SLOW_REQUEST_QUERIES = 1
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_token}")
+    with caplog.at_level(logging.WARNING, logger="monitoring.slow_requests"):
+        api_client.get("/api/network/")
+    records = [r for r in caplog.records if r.name == "monitoring.slow_requests"]
+    assert len(records) == 1
+    message = records[0].getMessage()
+    assert "GET /api/network/ -> 200" in message
+    assert "SELECT" in message
+
+
+@pytest.mark.django_db
+def test_fast_request_not_logged(api_client, settings, caplog):
+    settings.SLOW_REQUEST_MS = 60_000
+    settings.SLOW_REQUEST_QUERIES = 1000
+    with caplog.at_level(logging.WARNING, logger="monitoring.slow_requests"):
+        api_client.get("/api/network/")
+    assert not [r for r in caplog.records if r.name == "monitoring.slow_requests"]
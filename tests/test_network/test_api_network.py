@@ -1,6 +1,16 @@
+import base64
+import csv
+import io
+import json
+import time
+from unittest import mock
+
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
-from network.models import NetworkElement
+from network.models import NetworkElement, Product
+from network.pagination import ProductPagination
 
 
 @pytest.mark.django_db
@@ -35,3 +45,660 @@ def test_create_network_element(api_client, manager_user, setup_data):
 
     response = api_client.post("/api/network/network/", data, format="json")
     assert response.status_code == 201, f"Ошибка: {response.data}"
+
+
+def _add_retail_with_products(factory, index):
+    retail = NetworkElement.objects.create(
+        level=1,
+        name=f"Сеть {index}",
+        email=f"retail{index}@example.com",
+        phone=f"555000{index:04d}",
+        region="Москва",
+        city="Москва",
+        street="Ленина",
+        house_number="1",
+        postal_code="101000",
+        supplier=factory,
+    )
+    for product_index in range(3):
+        Product.objects.create(
+            name=f"Продукт {index}-{product_index}",
+            model=f"M-{index}-{product_index}",
+            release_date="2024-01-01",
+            price=1000,
+            manufacturer_country="Китай",
+            network_element=retail,
+        )
+    return retail
+
+
+@pytest.mark.django_db
+def test_list_network_elements_constant_queries(
+    api_client, manager_user, setup_data, assert_constant_queries
+):
+    """Число запросов списка не зависит от количества элементов и продуктов."""
+    api_client.force_authenticate(user=manager_user)
+    factory = setup_data["factory"]
+
+    def make_request():
+        response = api_client.get("/api/network/network/")
+        assert response.status_code == 200
+
+    def grow_data():
+        for index in range(10):
+            _add_retail_with_products(factory, index)
+
+    assert_constant_queries(make_request, grow_data)
+
+
+@pytest.mark.django_db
+def test_retrieve_network_element_constant_queries(
+    api_client, manager_user, setup_data, assert_constant_queries
+):
+    """Детальный просмотр не догружает продукты и поставщика по одному."""
+    api_client.force_authenticate(user=manager_user)
+    retail = _add_retail_with_products(setup_data["factory"], 0)
+
+    def make_request():
+        response = api_client.get(f"/api/network/network/{retail.id}/")
+        assert response.status_code == 200
+        assert response.data["поставщик"]["id"] == setup_data["factory"].id
+
+    def grow_data():
+        for product_index in range(3, 10):
+            Product.objects.create(
+                name=f"Доп. продукт {product_index}",
+                model=f"D-{product_index}",
+                release_date="2024-01-01",
+                price=1000,
+                manufacturer_country="Китай",
+                network_element=retail,
+            )
+
+    assert_constant_queries(make_request, grow_data)
+
+
+@pytest.mark.django_db
+def test_network_elements_cursor_pagination(api_client, manager_user, setup_data):
+    """Список отдаётся страницами, обход по курсору возвращает все элементы."""
+    api_client.force_authenticate(user=manager_user)
+    for index in range(3):
+        _add_retail_with_products(setup_data["factory"], index)
+
+    seen = []
+    url = "/api/network/network/?page_size=2"
+    while url:
+        response = api_client.get(url)
+        assert response.status_code == 200
+        assert len(response.data["results"]) <= 2
+        seen.extend(item["id"] for item in response.data["results"])
+        url = response.data["next"]
+
+    assert seen == list(
+        NetworkElement.objects.order_by("created_at", "id").values_list("id", flat=True)
+    )
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_with_equal_created_at(api_client, manager_user, setup_data):
+    """
+    При одинаковом created_at курсор продолжает обход по id сравнением
+    строк, без OFFSET; ссылки назад возвращают те же страницы.
+    """
+    api_client.force_authenticate(user=manager_user)
+    for index in range(4):
+        _add_retail_with_products(setup_data["factory"], index)
+    NetworkElement.objects.update(created_at=setup_data["factory"].created_at)
+    expected = list(NetworkElement.objects.order_by("id").values_list("id", flat=True))
+
+    pages = []
+    url = "/api/network/network/?page_size=2"
+    while url:
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url)
+        assert response.status_code == 200
+        pages.append([item["id"] for item in response.data["results"]])
+        if pages[1:]:
+            page_sql = next(
+                query["sql"]
+                for query in queries.captured_queries
+                if "LIMIT" in query["sql"]
+            )
+            assert '"created_at", "network_networkelement"."id") >' in page_sql
+            assert "OFFSET" not in page_sql
+        previous, url = response.data["previous"], response.data["next"]
+    assert sum(pages, []) == expected
+
+    backwards = []
+    while previous:
+        response = api_client.get(previous)
+        assert response.status_code == 200
+        backwards.append([item["id"] for item in response.data["results"]])
+        previous = response.data["previous"]
+    assert backwards == pages[-2::-1]
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_position_is_not_found(api_client, manager_user):
+    """Подделанная позиция курсора — 404, а не ошибка сервера."""
+    api_client.force_authenticate(user=manager_user)
+    cursor = base64.b64encode(b"p=%5B%22not-a-date%22%2C+%221%22%5D").decode()
+    response = api_client.get(f"/api/network/network/?cursor={cursor}")
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_page_size_is_capped(api_client, manager_user, setup_data, monkeypatch):
+    """Параметр page_size не может превышать максимальный размер страницы."""
+    api_client.force_authenticate(user=manager_user)
+    for index in range(2):
+        _add_retail_with_products(setup_data["factory"], index)
+
+    monkeypatch.setattr(ProductPagination, "max_page_size", 4)
+    response = api_client.get("/api/network/product/?page_size=1000")
+    assert response.status_code == 200
+    assert len(response.data["results"]) == 4
+    assert response.data["next"] is not None
+
+
+@pytest.mark.django_db
+def test_export_network_elements_ndjson(api_client, manager_user, setup_data):
+    """Выгрузка элементов сети в NDJSON: по одной JSON-записи на строку."""
+    api_client.force_authenticate(user=manager_user)
+    response = api_client.get("/api/network/network/export/")
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("application/x-ndjson")
+
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    records = [json.loads(line) for line in lines]
+    by_id = {record["id"]: record for record in records}
+    retail = setup_data["retail_network"]
+    assert len(records) == NetworkElement.objects.count()
+    assert by_id[retail.id]["поставщик"] == setup_data["factory"].id
+    assert by_id[retail.id]["задолженность"] == "10000.00"
+
+
+@pytest.mark.django_db
+def test_export_products_csv(api_client, manager_user, setup_data):
+    """Выгрузка продуктов в CSV с заголовком."""
+    api_client.force_authenticate(user=manager_user)
+    response = api_client.get("/api/network/product/export/?export_format=csv")
+    assert response.status_code == 200
+
+    content = b"".join(response.streaming_content).decode()
+    rows = list(csv.reader(io.StringIO(content)))
+    assert rows[0][:3] == ["id", "название", "модель"]
+    assert rows[1][1:4] == ["Тестовый продукт", "TP-2024", "2024-01-01"]
+
+
+@pytest.mark.django_db
+def test_export_unknown_format(api_client, manager_user, setup_data):
+    api_client.force_authenticate(user=manager_user)
+    response = api_client.get("/api/network/network/export/?export_format=xml")
+    assert response.status_code == 400
+
+
+def _bulk_item(index, supplier_id, level=1, **overrides):
+    item = {
+        "название": f"Дистрибьютор {index}",
+        "электронная_почта": f"bulk{index}@example.com",
+        "телефон": f"777000{index:04d}",
+        "страна": "Россия",
+        "регион": "Москва",
+        "город": "Москва",
+        "улица": "Ленина",
+        "номер_дома": "1",
+        "почтовый_индекс": "101000",
+        "уровень_сети": level,
+        "поставщик": supplier_id,
+    }
+    item.update(overrides)
+    return item
+
+
+@pytest.mark.django_db
+def test_bulk_upsert_network_elements(api_client, manager_user, setup_data):
+    """Пакет создаёт новые элементы и обновляет существующие по названию и уровню."""
+    api_client.force_authenticate(user=manager_user)
+    factory = setup_data["factory"]
+    retail = setup_data["retail_network"]
+    items = [_bulk_item(index, factory.id) for index in range(20)]
+    items.append(
+        _bulk_item(
+            99,
+            factory.id,
+            **{
+                "название": retail.name,
+                "электронная_почта": retail.email,
+                "телефон": retail.phone,
+                "город": "Казань",
+            },
+        )
+    )
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.post("/api/network/network/bulk/", items, format="json")
+
+    assert response.status_code == 201, response.data
+    assert len(response.data["создано"]) == 20
+    assert response.data["обновлено"] == [retail.id]
+    # Выборка существующих, поставщики, INSERT ... ON CONFLICT, пути,
+    # журнал изменений (созданные, обновлённые), клиенты для сброса кэша
+    # + SAVEPOINT
+    assert len(queries) <= 9, [query["sql"] for query in queries]
+    retail.refresh_from_db()
+    assert retail.city == "Казань"
+    assert NetworkElement.objects.filter(supplier=factory).count() == 21
+    created = NetworkElement.objects.get(pk=response.data["создано"][0])
+    assert created.path == f"{factory.path}{created.id}/"
+
+
+@pytest.mark.django_db
+def test_bulk_upsert_rejects_invalid_items(api_client, manager_user, setup_data):
+    """Ошибки возвращаются по индексам элементов, ничего не записывается."""
+    api_client.force_authenticate(user=manager_user)
+    factory = setup_data["factory"]
+    retail = setup_data["retail_network"]
+    items = [
+        _bulk_item(0, factory.id),
+        _bulk_item(1, factory.id, level=2),  # поставщик не того уровня
+        _bulk_item(2, retail.id, **{"электронная_почта": factory.email}),
+        _bulk_item(3, factory.id, **{"телефон": _bulk_item(0, None)["телефон"]}),
+    ]
+
+    response = api_client.post("/api/network/network/bulk/", items, format="json")
+
+    assert response.status_code == 400
+    assert set(response.data) == {1, 2, 3}
+    assert "поставщик" in response.data[1]
+    assert "email" in response.data[2]
+    assert "phone" in response.data[3]
+    assert not NetworkElement.objects.filter(name="Дистрибьютор 0").exists()
+
+
+@pytest.mark.django_db
+def test_descendants_and_ancestors(api_client, manager_user, setup_data):
+    """Звенья ниже завода и цепочка поставщиков отдаются одним запросом по пути."""
+    api_client.force_authenticate(user=manager_user)
+    factory = setup_data["factory"]
+    retail = setup_data["retail_network"]
+    entrepreneur = NetworkElement.objects.create(
+        level=2,
+        name="ИП Иванов",
+        email="ip@example.com",
+        phone="1112223344",
+        region="Москва",
+        city="Москва",
+        street="Ленина",
+        house_number="3",
+        postal_code="101000",
+        supplier=retail,
+    )
+
+    response = api_client.get(f"/api/network/network/{factory.id}/descendants/")
+    assert response.status_code == 200
+    assert {item["id"] for item in response.data["results"]} == {
+        retail.id,
+        entrepreneur.id,
+    }
+
+    response = api_client.get(f"/api/network/network/{entrepreneur.id}/ancestors/")
+    assert response.status_code == 200
+    assert [item["id"] for item in response.data] == [factory.id, retail.id]
+
+
+@pytest.mark.django_db
+def test_supply_tree(api_client, manager_user, setup_data):
+    """Дерево поставок строится от заводов, глубина ограничивается параметром."""
+    api_client.force_authenticate(user=manager_user)
+    factory = setup_data["factory"]
+    retail = setup_data["retail_network"]
+
+    response = api_client.get("/api/network/network/tree/")
+    assert response.status_code == 200
+    assert response.data == [
+        {
+            "id": factory.id,
+            "название": factory.name,
+            "уровень_сети": 0,
+            "клиенты": [
+                {
+                    "id": retail.id,
+                    "название": retail.name,
+                    "уровень_сети": 1,
+                    "клиенты": [],
+                }
+            ],
+        }
+    ]
+
+    response = api_client.get(f"/api/network/network/tree/?root={retail.id}&depth=0")
+    assert response.status_code == 200
+    assert [node["id"] for node in response.data] == [retail.id]
+
+    response = api_client.get("/api/network/network/tree/?depth=-1")
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_debt_report(api_client, manager_user, setup_data):
+    """Задолженность суммируется по поддереву завода, стране и уровню."""
+    api_client.force_authenticate(user=manager_user)
+    factory = setup_data["factory"]
+    retail = setup_data["retail_network"]
+    NetworkElement.objects.create(
+        level=2,
+        name="ИП Петров",
+        email="petrov@example.com",
+        phone="2223334455",
+        country="Беларусь",
+        region="Минск",
+        city="Минск",
+        street="Ленина",
+        house_number="5",
+        postal_code="220000",
+        supplier=retail,
+        debt=500,
+    )
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get("/api/network/network/debt/")
+    assert response.status_code == 200
+    assert len(queries) == 2  # агрегат и названия заводов
+    assert response.data == [
+        {
+            "завод": {"id": factory.id, "название": factory.name},
+            "задолженность": "10500.00",
+            "элементов": 3,
+        }
+    ]
+
+    # Завод удалён — его розничная сеть стала корнем, но заводом не стала
+    address = {
+        "country": "Россия",
+        "region": "Тверь",
+        "city": "Тверь",
+        "street": "Мира",
+        "house_number": "1",
+        "postal_code": "170000",
+    }
+    closed = NetworkElement.objects.create(
+        level=0,
+        name="Закрытый завод",
+        email="closed@example.com",
+        phone="3334445566",
+        **address,
+    )
+    NetworkElement.objects.create(
+        level=1,
+        name="Сеть закрытого завода",
+        email="orphan@example.com",
+        phone="3334445567",
+        supplier=closed,
+        debt=70,
+        **address,
+    )
+    closed.delete()
+    response = api_client.get("/api/network/network/debt/")
+    assert [row["завод"] for row in response.data] == [
+        {"id": factory.id, "название": factory.name},
+        None,
+    ]
+    assert response.data[1]["задолженность"] == "70.00"
+
+    response = api_client.get("/api/network/network/debt/?group_by=country")
+    assert [(row["страна"], row["задолженность"]) for row in response.data] == [
+        ("Беларусь", "500.00"),
+        ("Россия", "10070.00"),
+    ]
+
+    response = api_client.get("/api/network/network/debt/?group_by=level")
+    assert [row["уровень_сети"] for row in response.data] == [0, 1, 2]
+
+    response = api_client.get(f"/api/network/network/{retail.id}/debt/")
+    assert response.data == {
+        "id": retail.id,
+        "задолженность": "10500.00",
+        "элементов": 2,
+    }
+
+
+@pytest.mark.django_db
+def test_responses_are_cached_and_invalidated(
+    api_client,
+    manager_user,
+    setup_data,
+    django_capture_on_commit_callbacks,
+    response_cache,
+):
+    """
+    Повторный GET отдаётся из кэша, изменение продукта сбрасывает кэш
+    элемента — после фиксации транзакции, а не до неё.
+    """
+    api_client.force_authenticate(user=manager_user)
+    factory = setup_data["factory"]
+    product = setup_data["product"]
+    url = f"/api/network/network/{factory.id}/"
+
+    first = api_client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        second = api_client.get(url)
+    assert second.data == first.data
+    assert len(queries) == 1  # только версия элемента для ETag
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        product.name = "Переименованный продукт"
+        product.save()
+    assert callbacks
+    # Транзакция не зафиксирована — кэш ещё не сброшен
+    assert api_client.get(url).data == first.data
+
+    for callback in callbacks:
+        callback()
+    response = api_client.get(url)
+    assert response.data["продукты"][0]["название"] == "Переименованный продукт"
+
+
+@pytest.mark.django_db
+def test_supplier_change_invalidates_client_cache(
+    api_client,
+    manager_user,
+    setup_data,
+    django_capture_on_commit_callbacks,
+    response_cache,
+):
+    """Переименование поставщика сбрасывает кэш его клиентов."""
+    api_client.force_authenticate(user=manager_user)
+    factory = setup_data["factory"]
+    retail = setup_data["retail_network"]
+    url = f"/api/network/network/{retail.id}/"
+
+    assert api_client.get(url).data["поставщик"]["название"] == factory.name
+    with django_capture_on_commit_callbacks(execute=True):
+        factory.name = "Новый завод"
+        factory.save()
+    assert api_client.get(url).data["поставщик"]["название"] == "Новый завод"
+
+
+@pytest.mark.django_db
+def test_retrieve_conditional_get(api_client, manager_user, setup_data):
+    """If-None-Match с актуальным ETag даёт 304, изменение продукта меняет ETag."""
+    api_client.force_authenticate(user=manager_user)
+    factory = setup_data["factory"]
+    url = f"/api/network/network/{factory.id}/"
+
+    response = api_client.get(url)
+    etag = response["ETag"]
+    assert response.status_code == 200
+    assert response["Last-Modified"]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert len(queries) == 1
+
+    product = setup_data["product"]
+    product.price = 1
+    product.save()
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_list_conditional_get(api_client, manager_user, setup_data):
+    """ETag списка меняется при изменении элемента на странице."""
+    api_client.force_authenticate(user=manager_user)
+    url = "/api/network/network/"
+
+    etag = api_client.get(url)["ETag"]
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    factory = setup_data["factory"]
+    factory.name = "Переименованный завод"
+    factory.save()
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_list_conditional_get_after_delete(
+    api_client, manager_user, setup_data, django_capture_on_commit_callbacks
+):
+    """
+    Удаление меняет ETag и Last-Modified списка, даже если оставшиеся на
+    странице строки не изменились.
+    """
+    api_client.force_authenticate(user=manager_user)
+    url = "/api/network/network/?level=0"
+    response = api_client.get(url)
+    etag, last_modified = response["ETag"], response["Last-Modified"]
+    assert api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code == 304
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        setup_data["retail_network"].delete()
+    # Last-Modified с точностью до секунды: удаление — «позже»
+    later = time.time() + 10
+    with mock.patch("network.cache.time.time", return_value=later):
+        for callback in callbacks:
+            callback()
+
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert [item["id"] for item in response.data["results"]] == [
+        setup_data["factory"].id
+    ]
+    assert api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code == 200
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code == 304
+
+
+@pytest.mark.django_db
+def test_retrieve_conditional_get_respects_filters(
+    api_client, manager_user, setup_data
+):
+    """Объект, не прошедший фильтры, даёт 404, а не 304."""
+    api_client.force_authenticate(user=manager_user)
+    url = f"/api/network/network/{setup_data['retail_network'].id}/"
+    assert api_client.get(url, HTTP_IF_NONE_MATCH="*").status_code == 304
+    response = api_client.get(url, {"level": 0}, HTTP_IF_NONE_MATCH="*")
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_create_product(api_client, manager_user, setup_data):
+    """Продукт создаётся с привязкой к элементу сети."""
+    api_client.force_authenticate(user=manager_user)
+    data = {
+        "название": "Новый продукт",
+        "модель": "NP-1",
+        "дата_выхода": "2024-05-01",
+        "цена": "999.90",
+        "страна_производителя": "Китай",
+        "звено_сети": setup_data["retail_network"].id,
+    }
+    response = api_client.post("/api/network/product/", data, format="json")
+    assert response.status_code == 201, response.data
+    assert "звено_сети" not in response.data
+    assert (
+        Product.objects.get(model="NP-1").network_element
+        == setup_data["retail_network"]
+    )
+
+
+@pytest.mark.django_db
+def test_fields_and_expand(api_client, manager_user, setup_data):
+    """?fields= и ?expand= сокращают ответ и запросы к БД."""
+    api_client.force_authenticate(user=manager_user)
+    retail = setup_data["retail_network"]
+    url = f"/api/network/network/{retail.id}/"
+
+    with CaptureQueriesContext(connection) as full:
+        full_data = api_client.get(url).json()
+    assert full_data["поставщик"]["id"] == setup_data["factory"].id
+
+    with CaptureQueriesContext(connection) as slim:
+        response = api_client.get(
+            url, {"fields": "id,название,поставщик", "expand": ""}
+        )
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": retail.id,
+        "название": retail.name,
+        "поставщик": setup_data["factory"].id,
+    }
+    assert len(slim) == len(full) - 1  # без запроса продуктов
+    assert "JOIN" not in slim.captured_queries[-1]["sql"]  # без поставщика
+
+    response = api_client.get(
+        "/api/network/network/", {"expand": "поставщик", "fields": "id,продукты"}
+    )
+    assert all(item.keys() == {"id"} for item in response.json()["results"])
+
+    response = api_client.get(url, {"fields": "id,пароль", "expand": "склад"})
+    assert response.status_code == 400
+    assert set(response.json()) == {"fields", "expand"}
+
+
+@pytest.mark.django_db
+def test_search(api_client, manager_user, setup_data):
+    """Поиск элементов сети и продуктов: top-k, поля и проверка параметров."""
+    api_client.force_authenticate(user=manager_user)
+
+    response = api_client.get(
+        "/api/network/network/search/",
+        {"q": "Санкт-Петербург", "fields": "id,название"},
+    )
+    assert response.status_code == 200, response.data
+    assert [item["id"] for item in response.json()] == [setup_data["retail_network"].id]
+    assert response.json()[0]["название"] == "Тестовая сеть"
+    assert "поставщик" not in response.json()[0]
+
+    response = api_client.get(
+        "/api/network/network/search/", {"q": "тестовые", "limit": 1}
+    )
+    assert len(response.json()) == 1
+
+    response = api_client.get(
+        "/api/network/product/search/", {"q": "Тестовые продукты"}
+    )
+    assert [item["id"] for item in response.json()] == [setup_data["product"].id]
+
+    for params in (
+        {},
+        {"q": "т"},
+        {"q": "тест", "limit": 0},
+        {"q": "тест", "limit": 10**6},
+    ):
+        response = api_client.get("/api/network/network/search/", params)
+        assert response.status_code == 400, params
+
+
+@pytest.mark.django_db
+def test_admin_search_includes_ranked_matches(admin_client, setup_data):
+    """Поиск в админке находит и подстроку, и запрос с опечаткой."""
+    factory = setup_data["factory"]
+    for term in ("Тестовый завод", "Масква"):
+        response = admin_client.get("/admin/network/networkelement/", {"q": term})
+        assert response.status_code == 200
+        assert list(response.context["cl"].result_list) == [factory], term
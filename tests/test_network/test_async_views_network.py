@@ -0,0 +1,116 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from network.models import NetworkElement, Product
+
+
+def _async_get(path, token=None):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    return async_to_sync(AsyncClient().get)(path, headers=headers)
+
+
+def _add_products(element, count):
+    Product.objects.bulk_create(
+        Product(
+            name=f"Продукт {index}",
+            model=f"A-{index}",
+            release_date="2024-01-01",
+            price=100,
+            manufacturer_country="Китай",
+            network_element=element,
+        )
+        for index in range(count)
+    )
+
+
+@pytest.mark.django_db
+def test_async_list_matches_sync(api_client, get_token, setup_data):
+    """Асинхронный список отдаёт те же данные и курсоры, что и синхронный."""
+    _add_products(setup_data["retail_network"], 3)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_token}")
+
+    for resource in ("network", "product"):
+        sync_data = api_client.get(f"/api/network/{resource}/?page_size=1").json()
+        response = _async_get(f"/api/network/async/{resource}/?page_size=1", get_token)
+        assert response.status_code == 200
+        async_data = json.loads(response.content)
+        assert async_data["results"] == sync_data["results"]
+        assert (
+            async_data["next"].split("cursor=")[1]
+            == sync_data["next"].split("cursor=")[1]
+        )
+
+        # Вторая страница по курсору из асинхронного ответа
+        cursor = async_data["next"].split("?")[1]
+        second = json.loads(
+            _async_get(f"/api/network/async/{resource}/?{cursor}", get_token).content
+        )
+        assert second["previous"] is not None
+        assert {item["id"] for item in second["results"]}.isdisjoint(
+            item["id"] for item in async_data["results"]
+        )
+
+
+@pytest.mark.django_db
+def test_async_retrieve_matches_sync(api_client, get_token, setup_data, settings):
+    settings.SERVER_TIMING_HEADER = True
+    retail = setup_data["retail_network"]
+    _add_products(retail, 2)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_token}")
+
+    response = _async_get(f"/api/network/async/network/{retail.id}/", get_token)
+    assert response.status_code == 200
+    assert (
+        json.loads(response.content)
+        == api_client.get(f"/api/network/network/{retail.id}/").json()
+    )
+    assert "Server-Timing" in response
+    assert 'desc="0 queries"' not in response["Server-Timing"]
+
+
+@pytest.mark.django_db
+def test_async_country_filter(get_token, setup_data):
+    data = json.loads(
+        _async_get(
+            "/api/network/async/network/?country=Россия&level__in=0,1", get_token
+        ).content
+    )
+    assert {item["id"] for item in data["results"]} == set(
+        NetworkElement.objects.filter(country="Россия", level__in=[0, 1]).values_list(
+            "id", flat=True
+        )
+    )
+
+
+@pytest.mark.django_db
+def test_async_fields_and_expand(get_token, setup_data):
+    data = json.loads(
+        _async_get(
+            "/api/network/async/network/?fields=id,поставщик,продукты&expand=",
+            get_token,
+        ).content
+    )
+    assert {item["поставщик"] for item in data["results"]} == {
+        None,
+        setup_data["factory"].id,
+    }
+    assert all(item.keys() == {"id", "поставщик"} for item in data["results"])
+    assert (
+        _async_get("/api/network/async/network/?expand=склад", get_token).status_code
+        == 400
+    )
+
+
+@pytest.mark.django_db
+def test_async_errors(get_token, setup_data):
+    response = _async_get("/api/network/async/network/")
+    assert response.status_code == 401
+    assert response["WWW-Authenticate"].startswith("Bearer")
+
+    assert _async_get("/api/network/async/network/", "invalid").status_code == 401
+    assert (
+        _async_get("/api/network/async/product/999999/", get_token).status_code == 404
+    )
@@ -0,0 +1,141 @@
+import pytest
+from django.db import transaction
+
+from network.models import Change, NetworkElement, Product
+
+
+def _entries(changes):
+    return [(item["модель"], item["id"], item["действие"]) for item in changes]
+
+
+def _feed(api_client, **params):
+    response = api_client.get("/api/network/changes/", params)
+    assert response.status_code == 200, response.data
+    return response.json()
+
+
+# Лента отдаёт только изменения завершённых транзакций, поэтому тесты
+# ленты фиксируют данные (transaction=True), а не откатывают транзакцию теста
+@pytest.mark.django_db(transaction=True)
+def test_changes_feed(api_client, manager_user, setup_data):
+    api_client.force_authenticate(user=manager_user)
+    factory, product = setup_data["factory"], setup_data["product"]
+    retail = setup_data["retail_network"]
+
+    initial = _feed(api_client, limit=500)
+    assert ("network_element", retail.id, "create") in _entries(initial["изменения"])
+    assert not initial["есть_ещё"]
+    cursor = initial["курсор"]
+
+    response = api_client.patch(
+        f"/api/network/network/{factory.id}/",
+        {"название": "Завод в Туле", "уровень_сети": 0, "город": "Тула"},
+        format="json",
+    )
+    assert response.status_code == 200, response.data
+    Product.objects.get(pk=product.pk).delete()
+
+    changes = _feed(api_client, since=cursor)
+    assert _entries(changes["изменения"]) == [
+        ("network_element", factory.id, "update"),
+        # Клиент показывает название поставщика: его представление изменилось
+        ("network_element", retail.id, "update"),
+        # Продукты вложены в элемент сети — он тоже изменился
+        ("network_element", factory.id, "update"),
+        ("product", product.id, "delete"),
+    ]
+
+    # Постраничное чтение по курсору даёт те же изменения
+    paged, page = [], {"курсор": cursor, "есть_ещё": True}
+    while page["есть_ещё"]:
+        page = _feed(api_client, since=page["курсор"], limit=1)
+        paged += page["изменения"]
+    assert paged == changes["изменения"]
+
+    last = _feed(api_client, since=changes["курсор"])
+    assert last == {"изменения": [], "курсор": changes["курсор"], "есть_ещё": False}
+
+    assert api_client.get("/api/network/changes/", {"since": "abc"}).status_code == 400
+
+
+@pytest.mark.django_db(transaction=True)
+def test_changes_feed_skips_running_transactions(setup_data):
+    """Изменения идущей транзакции не отдаются, пока она не завершится."""
+    cursor = tuple(Change.objects.after().values_list("transaction_id", "id").last())
+    with transaction.atomic():
+        setup_data["product"].delete()
+        assert not Change.objects.after(cursor).exists()
+    assert list(Change.objects.after(cursor).values_list("model", "action")) == [
+        ("network_element", Change.UPDATE),
+        ("product", Change.DELETE),
+    ]
+
+
+@pytest.mark.django_db
+def test_bulk_writes_are_logged(api_client, manager_user, setup_data):
+    api_client.force_authenticate(user=manager_user)
+    factory, retail = setup_data["factory"], setup_data["retail_network"]
+    Change.objects.all().delete()
+
+    NetworkElement.objects.filter(pk=retail.pk).bump_version(debt=0)
+    assert list(Change.objects.values_list("object_id", "action")) == [
+        (retail.id, Change.UPDATE)
+    ]
+
+    item = {
+        "название": "Пакетная сеть",
+        "электронная_почта": "bulk-changes@example.com",
+        "телефон": "5551112233",
+        "страна": "Россия",
+        "регион": "Москва",
+        "город": "Москва",
+        "улица": "Ленина",
+        "номер_дома": "1",
+        "почтовый_индекс": "101000",
+        "уровень_сети": 1,
+        "поставщик": factory.id,
+    }
+    response = api_client.post("/api/network/network/bulk/", [item], format="json")
+    assert response.status_code == 201, response.data
+    created = NetworkElement.objects.get(name="Пакетная сеть")
+    response = api_client.post(
+        "/api/network/network/bulk/", [{**item, "город": "Тверь"}], format="json"
+    )
+    assert response.status_code == 201, response.data
+
+    assert list(
+        Change.objects.filter(object_id=created.id).values_list("model", "action")
+    ) == [
+        ("network_element", Change.CREATE),
+        ("network_element", Change.UPDATE),
+    ]
+    assert (
+        not Change.objects.filter(model="product")
+        .exclude(object_id__in=Product.objects.values("id"))
+        .exists()
+    )
+
+
+@pytest.mark.django_db
+def test_product_change_logged_with_element_bump(django_assert_num_queries, setup_data):
+    """Версия элемента и обе записи журнала пишутся одним запросом."""
+    factory = setup_data["factory"]
+    factory.refresh_from_db()
+    version = factory.version
+    Change.objects.all().delete()
+    product = Product(
+        name="Ноутбук",
+        model="X1",
+        release_date="2026-01-01",
+        price=1000,
+        network_element=factory,
+    )
+    # Вставка продукта, затем UPDATE ... RETURNING + INSERT в журнал
+    with django_assert_num_queries(2):
+        product.save()
+    assert list(Change.objects.values_list("model", "object_id", "action")) == [
+        ("network_element", factory.id, Change.UPDATE),
+        ("product", product.id, Change.CREATE),
+    ]
+    factory.refresh_from_db()
+    assert factory.version == version + 1
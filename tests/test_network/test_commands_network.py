@@ -0,0 +1,116 @@
+import io
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+from network.models import Change, NetworkElement, Product
+
+
+def _generate(seed):
+    call_command(
+        "generate_network",
+        factories=2,
+        retail=3,
+        entrepreneurs=4,
+        products=2,
+        seed=seed,
+        stdout=io.StringIO(),
+    )
+
+
+@pytest.mark.django_db
+def test_generate_network_builds_hierarchy():
+    """Генератор строит корректную иерархию с путями и продуктами."""
+    _generate(seed=1)
+
+    assert NetworkElement.objects.filter(level=0).count() == 2
+    assert NetworkElement.objects.filter(level=1).count() == 6
+    assert NetworkElement.objects.filter(level=2).count() == 24
+    assert Product.objects.count() == 64
+    # bulk_create без сигналов: созданное записано в журнал изменений явно
+    assert (
+        Change.objects.filter(model="network_element", action=Change.CREATE).count()
+        == 32
+    )
+    assert Change.objects.filter(model="product", action=Change.CREATE).count() == 64
+
+    entrepreneur = NetworkElement.objects.filter(level=2).select_related(
+        "supplier__supplier"
+    )[0]
+    retail = entrepreneur.supplier
+    assert retail.level == 1
+    assert retail.supplier.level == 0
+    assert entrepreneur.path == (
+        f"/{retail.supplier.id}/{retail.id}/{entrepreneur.id}/"
+    )
+
+
+@pytest.mark.django_db
+def test_generate_network_is_deterministic():
+    """Один и тот же seed даёт одинаковые атрибуты."""
+
+    def snapshot():
+        return list(
+            NetworkElement.objects.order_by("id").values_list(
+                "level", "country", "city", "debt"
+            )
+        )
+
+    _generate(seed=7)
+    first = snapshot()
+    NetworkElement.objects.all().delete()
+    _generate(seed=7)
+    assert snapshot() == first
+
+
+@pytest.mark.django_db
+def test_benchmark_api_detects_query_regression(tmp_path):
+    """Бенчмарк сохраняет эталон и падает, если запросов стало больше."""
+    baseline = tmp_path / "baseline.json"
+    options = {"iterations": 2, "warmup": 0, "stdout": io.StringIO()}
+    call_command(
+        "benchmark_api", baseline=str(baseline), update_baseline=True, **options
+    )
+    results = json.loads(baseline.read_text(encoding="utf-8"))
+    assert results["network_list"]["queries"] > 0
+
+    results["network_list"]["queries"] -= 1
+    baseline.write_text(json.dumps(results), encoding="utf-8")
+    with pytest.raises(CommandError, match="network_list: SQL-запросов"):
+        call_command("benchmark_api", baseline=str(baseline), **options)
+
+
+@pytest.mark.django_db
+def test_benchmark_indexes_uses_scratch_schema():
+    """Замер идёт на копиях таблиц: рабочие данные и индексы не меняются."""
+    _generate(seed=3)
+    elements = NetworkElement.objects.count()
+    indexes = connection.introspection.get_constraints(
+        connection.cursor(), NetworkElement._meta.db_table
+    )
+
+    out = io.StringIO()
+    call_command("benchmark_indexes", seed=300, runs=1, stdout=out)
+
+    assert "Создано 300 элементов сети" in out.getvalue()
+    assert "API: страна, курсор" in out.getvalue()
+    assert NetworkElement.objects.count() == elements
+    assert (
+        connection.introspection.get_constraints(
+            connection.cursor(), NetworkElement._meta.db_table
+        )
+        == indexes
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_namespace WHERE nspname = 'benchmark_indexes'")
+        assert cursor.fetchone() is None
+
+
+@pytest.mark.django_db
+def test_benchmark_indexes_refuses_unknown_database(monkeypatch):
+    """На базе с «рабочим» именем команда требует подтверждения --yes."""
+    monkeypatch.setitem(connection.settings_dict, "NAME", "electronics")
+    with pytest.raises(CommandError, match="--yes"):
+        call_command("benchmark_indexes", seed=10, stdout=io.StringIO())
@@ -0,0 +1,150 @@
+import re
+
+import pytest
+from django.db import connection
+
+from network.filters import NetworkElementFilter, ProductFilter
+from network.models import NetworkElement, Product
+
+# Параметры каждого фильтра и колонка индекса, которым он выполняется
+FILTER_INDEXES = [
+    (NetworkElementFilter, {"country": "Россия"}, NetworkElement, "country"),
+    (NetworkElementFilter, {"region": "Москва"}, NetworkElement, "region"),
+    (NetworkElementFilter, {"city": "Москва"}, NetworkElement, "city"),
+    (NetworkElementFilter, {"level": 0}, NetworkElement, "level"),
+    (NetworkElementFilter, {"level__in": "0,1"}, NetworkElement, "level"),
+    (NetworkElementFilter, {"supplier": 1}, NetworkElement, "supplier_id"),
+    (NetworkElementFilter, {"debt__gte": 100}, NetworkElement, "debt"),
+    (NetworkElementFilter, {"debt__lte": 100}, NetworkElement, "debt"),
+    (
+        NetworkElementFilter,
+        {"created_at__gte": "2024-01-01T00:00:00Z"},
+        NetworkElement,
+        "created_at",
+    ),
+    (
+        NetworkElementFilter,
+        {"created_at__lt": "2024-01-01T00:00:00Z"},
+        NetworkElement,
+        "created_at",
+    ),
+    (NetworkElementFilter, {"has_products": True}, Product, "network_element_id"),
+    (NetworkElementFilter, {"has_products": False}, Product, "network_element_id"),
+    (ProductFilter, {"manufacturer_country": "Китай"}, Product, "manufacturer_country"),
+    (ProductFilter, {"price__gte": 1000}, Product, "price"),
+    (ProductFilter, {"price__lte": 1000}, Product, "price"),
+    (ProductFilter, {"release_date__gte": "2024-01-01"}, Product, "release_date"),
+    (ProductFilter, {"release_date__lte": "2024-01-01"}, Product, "release_date"),
+    (ProductFilter, {"network_element": 1}, Product, "network_element_id"),
+]
+
+PLAN_INDEX = re.compile(r"(?:Index Scan|Index Only Scan) (?:using|on) (\S+)")
+
+
+def plan_indexes(plan):
+    """
+    Колонки индексов из плана: {(таблица, колонка)}. Учитываются все колонки:
+    PostgreSQL 18 умеет пропускать ведущую (skip scan).
+    """
+    used = set(PLAN_INDEX.findall(plan))
+    columns = set()
+    with connection.cursor() as cursor:
+        for model in (NetworkElement, Product):
+            table = model._meta.db_table
+            constraints = connection.introspection.get_constraints(cursor, table)
+            columns |= {
+                (table, column)
+                for name, constraint in constraints.items()
+                if name in used
+                for column in constraint["columns"]
+            }
+    return columns
+
+
+def test_every_filter_has_plan_test():
+    for filterset_class in (NetworkElementFilter, ProductFilter):
+        tested = {
+            name
+            for cls, params, *_ in FILTER_INDEXES
+            if cls is filterset_class
+            for name in params
+        }
+        assert tested == set(filterset_class.base_filters)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("filterset_class,params,model,column", FILTER_INDEXES)
+def test_filter_uses_index(filterset_class, params, model, column):
+    """
+    На маленькой тестовой таблице планировщик выбирает полный просмотр,
+    поэтому он отключается: план показывает, что индекс для фильтра есть.
+    """
+    filterset = filterset_class(params, queryset=filterset_class._meta.model.objects)
+    assert filterset.is_valid(), filterset.errors
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+    plan = filterset.qs.explain()
+    assert "Seq Scan" not in plan, plan
+    assert (model._meta.db_table, column) in plan_indexes(plan), plan
+
+
+@pytest.mark.django_db
+def test_network_element_filters(api_client, manager_user, setup_data):
+    api_client.force_authenticate(user=manager_user)
+    factory, retail = setup_data["factory"], setup_data["retail_network"]
+    entrepreneur = NetworkElement.objects.create(
+        level=2,
+        name="ИП Тестов",
+        email="ip@example.com",
+        phone="5550000001",
+        country="Россия",
+        region="Санкт-Петербург",
+        city="Санкт-Петербург",
+        street="Невский",
+        house_number="3",
+        postal_code="190000",
+        supplier=retail,
+        debt=500,
+    )
+
+    def ids(**params):
+        response = api_client.get("/api/network/network/", params)
+        assert response.status_code == 200, response.data
+        return {item["id"] for item in response.json()["results"]}
+
+    # Страна больше не исключает ИП неявно: уровень задаётся отдельно
+    assert ids(country="Россия") == {factory.id, retail.id, entrepreneur.id}
+    assert ids(country="Россия", level__in="0,1") == {factory.id, retail.id}
+    assert ids(city="Санкт-Петербург", level=2) == {entrepreneur.id}
+    assert ids(supplier=retail.id) == {entrepreneur.id}
+    assert ids(debt__gte=100, debt__lte=1000) == {entrepreneur.id}
+    assert ids(has_products="true") == {factory.id}
+    assert ids(has_products="false") == {retail.id, entrepreneur.id}
+
+    response = api_client.get("/api/network/network/", {"debt__gte": "много"})
+    assert response.status_code == 400
+    assert "debt__gte" in response.data
+
+
+@pytest.mark.django_db
+def test_product_filters(api_client, manager_user, setup_data):
+    api_client.force_authenticate(user=manager_user)
+    product = setup_data["product"]
+    cheap = Product.objects.create(
+        name="Дешёвый продукт",
+        model="CH-1",
+        release_date="2020-06-01",
+        price=100,
+        manufacturer_country="Китай",
+        network_element=setup_data["retail_network"],
+    )
+
+    def ids(**params):
+        response = api_client.get("/api/network/product/", params)
+        assert response.status_code == 200, response.data
+        return {item["id"] for item in response.json()["results"]}
+
+    assert ids(price__lte=1000) == {cheap.id}
+    assert ids(release_date__gte="2024-01-01") == {product.id}
+    assert ids(manufacturer_country="Китай") == {cheap.id}
+    assert ids(network_element=setup_data["factory"].id) == {product.id}
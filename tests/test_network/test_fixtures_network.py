@@ -0,0 +1,60 @@
+import io
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from network.models import NetworkElement, Product
+
+
+@pytest.mark.django_db
+def test_load_initial_data():
+    """Фикстура из README загружается: новые колонки получают значения БД."""
+    call_command(
+        "loaddata",
+        settings.BASE_DIR / "fixtures" / "initial_data.json",
+        stdout=io.StringIO(),
+    )
+
+    assert NetworkElement.objects.count() == 3
+    assert Product.objects.count() == 4
+    assert not NetworkElement.objects.filter(updated_at__isnull=True).exists()
+    assert not NetworkElement.objects.filter(version__lt=1).exists()
+
+
+@pytest.mark.django_db
+def test_loaddata_rebuilds_paths():
+    """Загруженные в обход save() элементы получают пути, поддеревья верны."""
+    call_command(
+        "loaddata",
+        settings.BASE_DIR / "fixtures" / "initial_data.json",
+        stdout=io.StringIO(),
+    )
+    elements = {element.level: element for element in NetworkElement.objects.all()}
+    factory, retail, entrepreneur = elements[0], elements[1], elements[2]
+
+    assert entrepreneur.path == f"/{factory.id}/{retail.id}/{entrepreneur.id}/"
+    assert not NetworkElement.objects.descendants_of(entrepreneur).exists()
+    assert list(NetworkElement.objects.descendants_of(retail)) == [entrepreneur]
+    assert NetworkElement.objects.subtree_debt(entrepreneur) == {
+        "total": entrepreneur.debt,
+        "elements": 1,
+    }
+    assert [
+        row["factory_id"] for row in NetworkElement.objects.debt_totals("factory_id")
+    ] == [factory.id]
+
+
+@pytest.mark.django_db
+def test_subtree_queries_refuse_empty_path(setup_data):
+    factory = setup_data["factory"]
+    NetworkElement.objects.filter(pk=factory.pk).update(path="")
+    factory.refresh_from_db()
+    with pytest.raises(ValueError):
+        NetworkElement.objects.descendants_of(factory)
+    with pytest.raises(ValueError):
+        NetworkElement.objects.subtree_debt(factory)
+
+    assert NetworkElement.objects.rebuild_paths() == 1
+    factory.refresh_from_db()
+    assert factory.path == f"/{factory.id}/"
@@ -1,4 +1,5 @@
 import pytest
+from django.db import connection
 
 from network.models import NetworkElement, Product
 
@@ -47,3 +48,114 @@ def test_product_creation():
     )
     assert product.name == "Смартфон X1"
     assert product.network_element == factory
+
+
+def _element(level, name, supplier=None):
+    return NetworkElement.objects.create(
+        level=level,
+        name=name,
+        email=f"{name}@example.com",
+        phone=name,
+        region="Москва",
+        city="Москва",
+        street="Ленина",
+        house_number="1",
+        postal_code="101000",
+        supplier=supplier,
+    )
+
+
+@pytest.mark.django_db
+def test_network_element_path_follows_supplier():
+    """Материализованный путь поддерживается при создании и смене поставщика."""
+    factory = _element(0, "f1")
+    other_factory = _element(0, "f2")
+    retail = _element(1, "r1", supplier=factory)
+    entrepreneur = _element(2, "ip1", supplier=retail)
+    assert entrepreneur.path == f"/{factory.id}/{retail.id}/{entrepreneur.id}/"
+
+    retail.supplier = other_factory
+    retail.save()
+    entrepreneur.refresh_from_db()
+    assert entrepreneur.path == f"/{other_factory.id}/{retail.id}/{entrepreneur.id}/"
+    assert set(NetworkElement.objects.descendants_of(other_factory)) == {
+        retail,
+        entrepreneur,
+    }
+    assert list(NetworkElement.objects.ancestors_of(entrepreneur)) == [
+        other_factory,
+        retail,
+    ]
+
+
+@pytest.mark.django_db
+def test_network_element_path_after_supplier_delete():
+    """Клиенты удалённого поставщика становятся корнями вместе с поддеревом."""
+    factory = _element(0, "f1")
+    retail = _element(1, "r1", supplier=factory)
+    other_retail = _element(1, "r2", supplier=factory)
+    entrepreneur = _element(2, "ip1", supplier=retail)
+    other_entrepreneur = _element(2, "ip2", supplier=other_retail)
+
+    NetworkElement.objects.filter(pk__in=[factory.pk, other_retail.pk]).delete()
+
+    retail.refresh_from_db()
+    entrepreneur.refresh_from_db()
+    other_entrepreneur.refresh_from_db()
+    assert retail.path == f"/{retail.id}/"
+    assert entrepreneur.path == f"/{retail.id}/{entrepreneur.id}/"
+    assert other_entrepreneur.path == f"/{other_entrepreneur.id}/"
+
+
+@pytest.mark.django_db
+def test_network_element_version_bumps():
+    """Версия растёт при изменении элемента, его продуктов и имени поставщика."""
+    factory = _element(0, "f1")
+    retail = _element(1, "r1", supplier=factory)
+    assert retail.version == 1
+
+    Product.objects.create(
+        name="Телевизор",
+        model="TV-1",
+        release_date="2024-01-01",
+        price=100,
+        manufacturer_country="Китай",
+        network_element=retail,
+    )
+    retail.refresh_from_db()
+    assert retail.version == 2
+
+    factory.name = "f1-new"
+    factory.save()
+    retail.refresh_from_db()
+    assert retail.version == 3
+
+
+@pytest.mark.django_db
+def test_search_morphology_and_typos(setup_data):
+    """Поиск находит словоформы и запросы с опечаткой, лучшие — первыми."""
+    factory = setup_data["factory"]
+    retail = setup_data["retail_network"]
+
+    assert list(NetworkElement.objects.search("Тестовые заводы")) == [factory]
+    assert list(NetworkElement.objects.search("Петербурге")) == [retail]
+    # Опечатка: находится триграммным сходством
+    assert list(NetworkElement.objects.search("Масква")) == [factory]
+    assert NetworkElement.objects.search("тестовый")[0] == factory
+    assert not NetworkElement.objects.search("Владивосток").exists()
+
+    assert list(Product.objects.search("продукты")) == [setup_data["product"]]
+    assert list(Product.objects.search("TP-2024")) == [setup_data["product"]]
+
+
+@pytest.mark.django_db
+def test_factory_debt_totals_read_from_index(setup_data):
+    """
+    Отчёт по заводам читает группы и задолженность из индекса по корню
+    пути, не обращаясь к таблице (маленькую таблицу планировщик читает
+    целиком, поэтому полный просмотр отключён).
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+    plan = NetworkElement.objects.debt_totals("factory_id").explain()
+    assert "Index Only Scan using network_root_id_idx" in plan, plan
@@ -0,0 +1,113 @@
+import io
+import os
+
+import pytest
+from django.core.management import call_command
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from config.db_router import ReplicaRouter, replica_reads
+from network.models import NetworkElement, Product
+
+replica_configured = pytest.mark.skipif(
+    "replica" not in connections, reason="DB_REPLICA_HOST не задан"
+)
+
+
+@replica_configured
+def test_router_reads_from_replica_only_inside_context(settings):
+    settings.DB_REPLICA_READS = True
+    router = ReplicaRouter()
+    assert router.db_for_read(NetworkElement) is None
+    with replica_reads():
+        assert router.db_for_read(NetworkElement) == "replica"
+    assert router.db_for_read(NetworkElement) is None
+    assert router.db_for_write(NetworkElement) is None
+    assert router.allow_migrate("replica", "network") is False
+
+
+def test_router_replica_reads_disabled():
+    """DB_REPLICA_READS=False (как в остальных тестах) — всё на основной базе."""
+    with replica_reads():
+        assert ReplicaRouter().db_for_read(NetworkElement) is None
+
+
+def _tables(queries):
+    return {
+        table
+        for query in queries.captured_queries
+        for table in ("users_customuser", "network_networkelement", "network_product")
+        if f'"{table}"' in query["sql"]
+    }
+
+
+@replica_configured
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+def test_get_requests_read_from_replica(api_client, get_token, setup_data, settings):
+    """
+    GET к viewset-ам читает данные с реплики, а пользователя — с основной
+    базы; изменения идут на основную базу.
+    """
+    settings.DB_REPLICA_READS = True
+    settings.API_CACHE_TIMEOUT = 0
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_token}")
+    factory = NetworkElement.objects.get(level=0)
+
+    with CaptureQueriesContext(connections["default"]) as primary:
+        with CaptureQueriesContext(connections["replica"]) as replica:
+            assert api_client.get("/api/network/network/").status_code == 200
+            assert api_client.get("/api/network/product/").status_code == 200
+    assert _tables(replica) == {"network_networkelement", "network_product"}
+    assert _tables(primary) == {"users_customuser"}
+
+    with CaptureQueriesContext(connections["default"]) as primary:
+        with CaptureQueriesContext(connections["replica"]) as replica:
+            response = api_client.patch(
+                f"/api/network/network/{factory.id}/",
+                {"название": "Завод в Туле", "уровень_сети": 0, "город": "Тула"},
+                format="json",
+            )
+    assert response.status_code == 200, response.data
+    assert len(replica) == 0
+    assert len(primary) > 0
+
+
+@replica_configured
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+def test_cached_responses_built_from_primary(
+    api_client, get_token, setup_data, settings
+):
+    """
+    Ответ, который попадёт в кэш, строится по основной базе: с отстающей
+    реплики в кэш попало бы состояние до изменения.
+    """
+    settings.DB_REPLICA_READS = True
+    settings.API_CACHE_TIMEOUT = 300
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_token}")
+    product = Product.objects.first()
+
+    with CaptureQueriesContext(connections["replica"]) as replica:
+        response = api_client.get(f"/api/network/product/{product.id}/")
+        assert response.status_code == 200
+        assert api_client.get("/api/network/product/").status_code == 200
+    assert len(replica) == 0
+
+
+@replica_configured
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+def test_benchmark_api_reads_primary_only(settings):
+    """
+    Бенчмарк работает в откатываемой транзакции: его данные реплике не
+    видны, поэтому чтения с реплики на время замера отключены.
+    """
+    settings.DB_REPLICA_READS = True
+    with CaptureQueriesContext(connections["replica"]) as replica:
+        call_command(
+            "benchmark_api",
+            iterations=1,
+            warmup=0,
+            update_baseline=True,
+            baseline=os.devnull,
+            stdout=io.StringIO(),
+        )
+    assert len(replica) == 0
@@ -1,8 +1,13 @@
 import pytest
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
 
 from network.models import NetworkElement, Product
-from network.serializers import NetworkElementSerializer, ProductSerializer
+from network.serializers import (
+    NetworkElementReadSerializer,
+    NetworkElementSerializer,
+    ProductSerializer,
+)
 
 
 # для сериализаторов
@@ -49,3 +54,49 @@ def test_product_serializer():
     data = serializer.data
     assert data["название"] == "Смартфон X1"
     assert data["модель"] == "X1-2024"
+
+
+@pytest.mark.django_db
+def test_network_element_read_serializer_is_byte_identical(setup_data):
+    """Быстрое чтение из .values() отдаёт ровно те же байты, что и DRF-поля."""
+    retail = setup_data["retail_network"]
+    NetworkElement.objects.create(
+        level=2,
+        name="ИП Без продуктов",
+        email="ip@example.com",
+        phone="+7 (900) 000-00-00",
+        country="Казахстан",
+        region="",
+        city="Алматы",
+        street="Абая",
+        house_number="5/1",
+        postal_code="050000",
+        debt="123456.78",
+        supplier=retail,
+    )
+    for index, price in enumerate(["0.10", "99999999.99", "1000"]):
+        Product.objects.create(
+            name=f"Товар «{index}»",
+            model=f"T-{index}",
+            release_date="2023-12-31",
+            price=price,
+            manufacturer_country="Китай",
+            network_element=retail,
+        )
+    queryset = NetworkElement.objects.order_by("id")
+    renderer = JSONRenderer()
+
+    expected = renderer.render(
+        NetworkElementSerializer(queryset.for_representation(), many=True).data
+    )
+    fast = renderer.render(
+        NetworkElementReadSerializer(queryset.representation_values(), many=True).data
+    )
+    assert fast == expected
+
+    single = queryset.for_representation().get(pk=retail.pk)
+    assert renderer.render(
+        NetworkElementReadSerializer(
+            queryset.representation_values().get(pk=retail.pk)
+        ).data
+    ) == renderer.render(NetworkElementSerializer(single).data)
@@ -0,0 +1,139 @@
+from contextlib import contextmanager
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from users.models import CustomUser
+
+
+def _user_queries(queries):
+    return [
+        q["sql"] for q in queries.captured_queries if "users_customuser" in q["sql"]
+    ]
+
+
+@pytest.fixture
+def user_cache(settings):
+    """
+    Включает кэш пользователя. Без Redis он по умолчанию выключен, а в
+    тестах память процесса одна на всех — как общий кэш.
+    """
+    settings.AUTH_USER_CACHE_TIMEOUT = 300
+
+
+@contextmanager
+def _other_process(name):
+    """Запросы как из другого воркера: своя память процесса и свой LocMem."""
+    with (
+        mock.patch("users.cache.cache", LocMemCache(name, {})),
+        mock.patch("users.cache._local", {}),
+    ):
+        yield
+
+
+def _client(username, password="secret-pass"):
+    client = APIClient()
+    token = client.post(
+        "/api/token/", {"username": username, "password": password}, format="json"
+    ).data["access"]
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client, token
+
+
+@pytest.mark.django_db
+def test_authenticated_reads_skip_user_query(create_user, setup_data, user_cache):
+    create_user(username="reader", password="secret-pass", role="employee")
+    client, token = _client("reader")
+    assert client.get("/api/network/network/").status_code == 200
+
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get("/api/network/product/").status_code == 200
+    assert _user_queries(queries) == []
+
+    with CaptureQueriesContext(connection) as queries:
+        response = async_to_sync(AsyncClient().get)(
+            "/api/network/async/product/", headers={"Authorization": f"Bearer {token}"}
+        )
+    assert response.status_code == 200
+    assert _user_queries(queries) == []
+
+
+@pytest.mark.django_db
+def test_role_and_active_changes_invalidate_cache(
+    create_user, setup_data, django_capture_on_commit_callbacks, user_cache
+):
+    user = create_user(username="worker", password="secret-pass", role="employee")
+    client, _ = _client("worker")
+    url = f"/api/network/network/{setup_data['retail_network'].id}/"
+    data = {
+        "уровень_сети": 1,
+        "название": "Новое имя",
+        "поставщик": setup_data["factory"].id,
+    }
+    assert client.patch(url, data, format="json").status_code == 403
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        user.role = "manager"
+        user.save()
+    # До фиксации в кэше остаётся прежняя роль
+    assert client.patch(url, data, format="json").status_code == 403
+    for callback in callbacks:
+        callback()
+    assert client.patch(url, data, format="json").status_code == 200
+
+    # Деактивация через API пользователей тоже сбрасывает кэш
+    admin = APIClient()
+    admin.force_authenticate(
+        user=CustomUser.objects.create_superuser("root", password="x", role="admin")
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        response = admin.patch(f"/api/users/{user.id}/", {"is_active": False})
+    assert response.status_code == 200
+    assert client.get(url).status_code == 401
+
+
+@pytest.mark.django_db
+def test_cached_user_loads_other_fields_lazily(create_user, settings, user_cache):
+    create_user(
+        username="lazy", password="secret-pass", email="lazy@example.com", role="admin"
+    )
+    client, _ = _client("lazy")
+    client.get("/api/network/network/")
+
+    request = client.get("/api/network/network/").wsgi_request
+    assert request.user.role == "admin"
+    assert request.user.email == "lazy@example.com"
+
+    settings.AUTH_USER_CACHE_TIMEOUT = 0
+    with CaptureQueriesContext(connection) as queries:
+        client.get("/api/network/network/")
+    assert _user_queries(queries)
+
+
+@pytest.mark.django_db
+def test_deactivation_seen_by_other_process_without_redis(
+    create_user, setup_data, settings, django_capture_on_commit_callbacks
+):
+    """
+    Без Redis у каждого воркера свой кэш. Пользователь, заблокированный в
+    одном воркере, сразу получает 401 и в другом: кэш пользователя выключен.
+    """
+    if settings.REDIS_URL:
+        pytest.skip("кэш общий (Redis)")
+    user = create_user(username="moved", password="secret-pass", role="employee")
+    client, _ = _client("moved")
+    url = "/api/network/network/"
+    with _other_process("worker-2"):
+        assert client.get(url).status_code == 200
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.is_active = False
+        user.save()
+    with _other_process("worker-2"):
+        assert client.get(url).status_code == 401
@@ -0,0 +1,100 @@
+import io
+
+import pytest
+from django.contrib.auth.models import Group, Permission
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from network.views import NetworkElementViewSet, ProductViewSet
+from users.models import CustomUser
+from users.roles import viewset_matrix
+
+
+def test_viewset_matrix():
+    matrix = viewset_matrix(NetworkElementViewSet)
+    read = {"list", "retrieve", "metadata", "export", "descendants", "ancestors"}
+    read |= {"search", "tree", "debt_report", "subtree_debt"}
+    assert matrix["employee"] == read
+    assert matrix["manager"] == read | {"create", "update", "partial_update", "bulk"}
+    assert matrix["admin"] == matrix["manager"] | {"destroy"}
+    assert viewset_matrix(ProductViewSet)["employee"] == {
+        "list",
+        "retrieve",
+        "metadata",
+        "export",
+        "search",
+    }
+
+
+@pytest.mark.django_db
+def test_role_permissions_without_queries():
+    user = CustomUser.objects.create_user("staff", password="x", role="manager")
+    user = CustomUser.objects.get(pk=user.pk)
+    with CaptureQueriesContext(connection) as queries:
+        assert user.has_perm("network.change_networkelement")
+        assert user.has_module_perms("network")
+    assert len(queries) == 0
+    # Права вне роли проверяются по явным выдачам: они загружаются один раз
+    assert not user.has_perm("network.delete_product")
+    with CaptureQueriesContext(connection) as queries:
+        assert not user.has_perm("users.view_customuser")
+        assert not user.has_module_perms("users")
+    assert len(queries) == 0
+
+
+@pytest.mark.django_db
+def test_explicit_permissions_still_granted():
+    """Права, выданные пользователю или группе явно, не отзываются ролью."""
+    user = CustomUser.objects.create_user("auditor", password="x", role="employee")
+    user.user_permissions.add(Permission.objects.get(codename="view_customuser"))
+    group = Group.objects.create(name="Удаление продуктов")
+    group.permissions.add(Permission.objects.get(codename="delete_product"))
+    user.groups.add(group)
+
+    user = CustomUser.objects.get(pk=user.pk)
+    assert user.has_perm("users.view_customuser")
+    assert user.has_perm("network.delete_product")
+    assert user.has_perm("network.view_networkelement")
+    assert not user.has_perm("network.change_networkelement")
+    assert user.has_module_perms("users")
+    assert {
+        "users.view_customuser",
+        "network.delete_product",
+        "network.view_networkelement",
+    } <= user.get_all_permissions()
+
+
+@pytest.mark.django_db
+def test_admin_uses_role_matrix(setup_data):
+    employee = CustomUser.objects.create_user(
+        "clerk", password="x", role="employee", is_staff=True
+    )
+    client = Client()
+    client.force_login(employee)
+    assert client.get("/admin/network/networkelement/").status_code == 200
+    assert client.get("/admin/network/networkelement/add/").status_code == 403
+
+    employee.role = "manager"
+    employee.save()
+    assert client.get("/admin/network/networkelement/add/").status_code == 200
+
+
+@pytest.mark.django_db
+def test_init_roles_mirrors_matrix():
+    call_command("init_roles", stdout=io.StringIO())
+    codenames = set(
+        Group.objects.get(name="Менеджеры").permissions.values_list(
+            "codename", flat=True
+        )
+    )
+    assert codenames == {
+        "view_networkelement",
+        "add_networkelement",
+        "change_networkelement",
+        "view_product",
+        "add_product",
+        "change_product",
+        "view_change",
+    }
@@ -0,0 +1,99 @@
+import time
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import authentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from monitoring.metrics import JWT_AUTH_LATENCY
+
+from .cache import acache_user, aget_cached_user, cache_user, get_cached_user
+
+
+class JWTAuthentication(authentication.JWTAuthentication):
+    """
+    JWT-аутентификация с замером времени для /metrics. Пользователь берётся
+    из кэша (users.cache), поэтому запрос с действующим токеном обычно не
+    обращается к БД. aauthenticate() — асинхронный вариант для
+    представлений на async ORM.
+    """
+
+    def authenticate(self, request):
+        started = time.perf_counter()
+        result = "failure"
+        try:
+            user_auth = super().authenticate(request)
+            result = "anonymous" if user_auth is None else "success"
+            return user_auth
+        finally:
+            JWT_AUTH_LATENCY.labels(result).observe(time.perf_counter() - started)
+
+    async def aauthenticate(self, request):
+        started = time.perf_counter()
+        result = "failure"
+        try:
+            header = self.get_header(request)
+            raw_token = None if header is None else self.get_raw_token(header)
+            if raw_token is None:
+                result = "anonymous"
+                return None
+            validated_token = self.get_validated_token(raw_token)
+            user = await self.aget_user(validated_token)
+            result = "success"
+            return user, validated_token
+        finally:
+            JWT_AUTH_LATENCY.labels(result).observe(time.perf_counter() - started)
+
+    def get_user(self, validated_token):
+        """Те же проверки, что в get_user simplejwt, с пользователем из кэша."""
+        user_id = self.get_user_id(validated_token)
+        user = get_cached_user(user_id)
+        if user is None:
+            try:
+                user = self.user_model.objects.get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(
+                    _("User not found"), code="user_not_found"
+                ) from e
+            cache_user(user)
+        return self.check_user(user, validated_token)
+
+    async def aget_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        user = await aget_cached_user(user_id)
+        if user is None:
+            try:
+                user = await self.user_model.objects.aget(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(
+                    _("User not found"), code="user_not_found"
+                ) from e
+            await acache_user(user)
+        return self.check_user(user, validated_token)
+
+    @staticmethod
+    def get_user_id(validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+    @staticmethod
+    def check_user(user, validated_token):
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+        return user
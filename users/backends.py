@@ -0,0 +1,34 @@
+from django.contrib.auth.backends import ModelBackend
+
+from .roles import role_permissions
+
+
+class RoleModelBackend(ModelBackend):
+    """
+    Вход как у ModelBackend, а права на модели (админка, user.has_perm) —
+    по роли пользователя из users.roles. Права из матрицы ролей
+    проверяются без запросов. Явно выданные права пользователя и его групп
+    по-прежнему действуют: их ModelBackend загружает один раз и кэширует
+    на объекте пользователя. Суперпользователю по-прежнему разрешено всё.
+    """
+
+    def _role_permissions(self, user_obj, obj):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return frozenset()
+        return role_permissions(user_obj.role)
+
+    def get_all_permissions(self, user_obj, obj=None):
+        return self._role_permissions(user_obj, obj) | super().get_all_permissions(
+            user_obj, obj
+        )
+
+    def has_perm(self, user_obj, perm, obj=None):
+        return perm in self._role_permissions(user_obj, obj) or super().has_perm(
+            user_obj, perm, obj
+        )
+
+    def has_module_perms(self, user_obj, app_label):
+        return any(
+            perm.startswith(f"{app_label}.")
+            for perm in self._role_permissions(user_obj, None)
+        ) or super().has_module_perms(user_obj, app_label)
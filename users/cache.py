@@ -0,0 +1,113 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.settings import api_settings
+
+# Поля пользователя, которые нужны аутентификации и проверкам прав.
+# Остальные поля закэшированного пользователя отложены (deferred) и при
+# обращении догружаются из БД.
+CACHED_FIELDS = ("id", "username", "role", "is_active", "is_staff", "is_superuser")
+# Записей в памяти процесса: при переполнении словарь просто очищается
+LOCAL_MAX_SIZE = 10_000
+
+# Память процесса: ключ пользователя -> (истекает, значения полей)
+_local = {}
+
+
+def user_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def _fields():
+    # Хеш пароля кэшируем, только если токены отзываются при его смене.
+    # Порядок — как у полей модели: в нём их значения ожидает from_db().
+    names = set(CACHED_FIELDS)
+    if api_settings.CHECK_REVOKE_TOKEN:
+        names.add("password")
+    return tuple(
+        field.attname
+        for field in get_user_model()._meta.concrete_fields
+        if field.attname in names
+    )
+
+
+def _build(values):
+    return get_user_model().from_db(DEFAULT_DB_ALIAS, _fields(), values)
+
+
+def _get_local(user_id):
+    entry = _local.get(user_key(user_id))
+    if entry is None or entry[0] < time.monotonic():
+        return None
+    return entry[1]
+
+
+def _set_local(user_id, values):
+    if len(_local) >= LOCAL_MAX_SIZE:
+        _local.clear()
+    _local[user_key(user_id)] = (
+        time.monotonic() + settings.AUTH_USER_LOCAL_CACHE_TIMEOUT,
+        values,
+    )
+
+
+def get_cached_user(user_id):
+    """
+    Пользователь из кэша: сначала память процесса (без сети), затем общий
+    кэш (Redis). None — пользователя нет в кэше или кэш отключён.
+    """
+    if not settings.AUTH_USER_CACHE_TIMEOUT:
+        return None
+    values = _get_local(user_id)
+    if values is None:
+        values = cache.get(user_key(user_id))
+        if values is None or len(values) != len(_fields()):
+            return None
+        _set_local(user_id, values)
+    return _build(values)
+
+
+async def aget_cached_user(user_id):
+    if not settings.AUTH_USER_CACHE_TIMEOUT:
+        return None
+    values = _get_local(user_id)
+    if values is None:
+        values = await cache.aget(user_key(user_id))
+        if values is None or len(values) != len(_fields()):
+            return None
+        _set_local(user_id, values)
+    return _build(values)
+
+
+def _values(user):
+    return tuple(getattr(user, field) for field in _fields())
+
+
+def cache_user(user):
+    if settings.AUTH_USER_CACHE_TIMEOUT:
+        values = _values(user)
+        cache.set(user_key(user.pk), values, settings.AUTH_USER_CACHE_TIMEOUT)
+        _set_local(user.pk, values)
+
+
+async def acache_user(user):
+    if settings.AUTH_USER_CACHE_TIMEOUT:
+        values = _values(user)
+        await cache.aset(user_key(user.pk), values, settings.AUTH_USER_CACHE_TIMEOUT)
+        _set_local(user.pk, values)
+
+
+def invalidate_user(user_id):
+    """
+    Сбрасывает пользователя в общем кэше и в памяти этого процесса. Другие
+    процессы видят изменение не позже AUTH_USER_LOCAL_CACHE_TIMEOUT.
+    """
+    cache.delete(user_key(user_id))
+    _local.pop(user_key(user_id), None)
+
+
+def clear_local():
+    _local.clear()
@@ -1,49 +1,30 @@
 from django.contrib.auth.models import Group, Permission
-from django.contrib.contenttypes.models import ContentType
 from django.core.management.base import BaseCommand
+from django.db.models import Q
 
-from network.models import NetworkElement, Product
+from users.roles import ROLE_PERMISSIONS
+
+ROLE_GROUPS = {
+    "admin": "Администраторы",
+    "manager": "Менеджеры",
+    "employee": "Сотрудники",
+}
 
 
 class Command(BaseCommand):
-    help = "Инициализация ролей и прав"
+    help = (
+        "Инициализация ролей и прав: группы с правами из матрицы ролей "
+        "(users.roles). Проверки прав группы не используют — группы "
+        "показывают в админке, что разрешено каждой роли."
+    )
 
     def handle(self, *args, **kwargs):
-        # Создание групп
-        admin_group, _ = Group.objects.get_or_create(name="Администраторы")
-        manager_group, _ = Group.objects.get_or_create(name="Менеджеры")
-        employee_group, _ = Group.objects.get_or_create(name="Сотрудники")
-
-        # Права для NetworkElement и Product
-        network_ct = ContentType.objects.get_for_model(NetworkElement)
-        product_ct = ContentType.objects.get_for_model(Product)
-
-        # Администратор: все права
-        admin_group.permissions.set(
-            Permission.objects.filter(content_type__in=[network_ct, product_ct])
-        )
-
-        # Менеджер: просмотр, добавление, изменение
-        manager_group.permissions.set(
-            Permission.objects.filter(
-                content_type__in=[network_ct, product_ct],
-                codename__in=[
-                    "view_networkelement",
-                    "add_networkelement",
-                    "change_networkelement",
-                    "view_product",
-                    "add_product",
-                    "change_product",
-                ],
-            )
-        )
-
-        # Сотрудник: только просмотр
-        employee_group.permissions.set(
-            Permission.objects.filter(
-                content_type__in=[network_ct, product_ct],
-                codename__in=["view_networkelement", "view_product"],
-            )
-        )
+        for role, name in ROLE_GROUPS.items():
+            group, _ = Group.objects.get_or_create(name=name)
+            query = Q(pk__in=[])
+            for permission in ROLE_PERMISSIONS[role]:
+                app_label, codename = permission.split(".")
+                query |= Q(content_type__app_label=app_label, codename=codename)
+            group.permissions.set(Permission.objects.filter(query))
 
         self.stdout.write(self.style.SUCCESS("Роли и права успешно инициализированы!"))
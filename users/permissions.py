@@ -1,16 +1,18 @@
 from rest_framework.permissions import BasePermission
 
+from .roles import viewset_matrix
 
-class IsAdmin(BasePermission):
-    def has_permission(self, request, view):
-        return request.user.role == "admin"
-
-
-class IsManager(BasePermission):
-    def has_permission(self, request, view):
-        return request.user.role == "manager"
 
+class RolePermission(BasePermission):
+    """
+    Доступ к действию viewset-а по матрице ролей (users.roles): проверка —
+    поиск действия в заранее посчитанном множестве для роли пользователя.
+    """
 
-class IsEmployee(BasePermission):
     def has_permission(self, request, view):
-        return request.user.role == "employee"
+        user = request.user
+        if not user or not user.is_authenticated:
+            return False
+        allowed = viewset_matrix(type(view)).get(user.role, frozenset())
+        # OPTIONS не сопоставлен действию viewset-а
+        return (view.action or "metadata") in allowed
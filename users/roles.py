@@ -0,0 +1,75 @@
+from rest_framework.permissions import SAFE_METHODS
+
+# Модели, доступ к которым определяется ролью пользователя (API и админка)
+ROLE_MODELS = ("network.NetworkElement", "network.Product")
+# Журналы: любой роли — только просмотр
+READ_ONLY_MODELS = ("network.Change",)
+
+# Роль -> разрешённые операции в терминах прав Django
+ROLE_OPERATIONS = {
+    "admin": ("view", "add", "change", "delete"),
+    "manager": ("view", "add", "change"),
+    "employee": ("view",),
+}
+
+# Операции стандартных действий viewset-а. Дополнительные действия (@action)
+# — просмотр, если принимают только безопасные методы, иначе изменение.
+ACTION_OPERATIONS = {
+    "list": "view",
+    "retrieve": "view",
+    "metadata": "view",
+    "create": "add",
+    "update": "change",
+    "partial_update": "change",
+    "destroy": "delete",
+}
+
+
+def _permission(label, operation):
+    app_label, model = label.split(".")
+    return f"{app_label}.{operation}_{model.lower()}"
+
+
+# Роль -> права Django ("network.view_product", ...); вычисляется при импорте
+ROLE_PERMISSIONS = {
+    role: frozenset(
+        _permission(label, operation)
+        for label in ROLE_MODELS
+        for operation in operations
+    )
+    | {_permission(label, "view") for label in READ_ONLY_MODELS}
+    for role, operations in ROLE_OPERATIONS.items()
+}
+
+_viewset_matrices = {}
+
+
+def role_permissions(role):
+    return ROLE_PERMISSIONS.get(role, frozenset())
+
+
+def viewset_matrix(viewset_class):
+    """
+    Роль -> действия viewset-а, разрешённые этой роли. Считается один раз
+    на класс из ROLE_PERMISSIONS: действие -> операция -> право на модель
+    queryset-а viewset-а.
+    """
+    matrix = _viewset_matrices.get(viewset_class)
+    if matrix is None:
+        opts = viewset_class.queryset.model._meta
+        actions = dict(ACTION_OPERATIONS)
+        for extra_action in viewset_class.get_extra_actions():
+            methods = {method.upper() for method in extra_action.mapping}
+            actions[extra_action.__name__] = (
+                "view" if methods <= set(SAFE_METHODS) else "change"
+            )
+        matrix = {
+            role: frozenset(
+                action
+                for action, operation in actions.items()
+                if f"{opts.app_label}.{operation}_{opts.model_name}" in permissions
+            )
+            for role, permissions in ROLE_PERMISSIONS.items()
+        }
+        _viewset_matrices[viewset_class] = matrix
+    return matrix
@@ -0,0 +1,18 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_user
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_cached_user(sender, instance, **kwargs):
+    """
+    Роль, активность или пароль могли измениться — сбрасываем кэш JWT
+    после фиксации, чтобы параллельный запрос не закэшировал прежнего
+    пользователя заново.
+    """
+    pk = instance.pk  # после удаления pk экземпляра обнуляется
+    transaction.on_commit(lambda: invalidate_user(pk))